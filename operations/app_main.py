@@ -1,9 +1,10 @@
 import dash
+import flask
 from dash import dcc, html, dash_table
 from dash.dependencies import Input, Output, State
-from dash.dash_table.Format import Format, Scheme, Symbol
 import plotly.express as px
 import pandas as pd
+import numpy as np
 import os 
 import weasyprint
 import io
@@ -11,35 +12,34 @@ from dash import dcc
 # Import our separate modules
 import data_processing
 import config
-from data_processing import calculate_invoiced_percentage, calculate_new_er,extract_project_number, standardize_project_no, print_green, print_cyan, print_orange, print_red, last_update, generate_monthly_report_data
+from data_processing import calculate_invoiced_percentage, compute_er_table, extract_project_number, standardize_project_no, print_green, print_cyan, print_orange, print_red, last_update, generate_monthly_report_data
 from config import TABLE_STYLE, TABLE_CELL_STYLE, TABLE_CELL_CONDITIONAL, RIGHT_TABLE_RED_STYLE
 import base64
 import plotly.io as pio
-from data_processing import get_project_log_data
+from data_processing import get_project_log_data, derive_project_no, client_project_totals, CLIENT_TOTAL_COLUMNS, build_client_cube, build_invoice_ledger, parse_money_series
+from data_access import DataSource
+from project_view import get_project_view, PROJECT_VIEWS
+from callback_cache import ResultCache, cached_callback, file_stamp
+from table_formats import money_format, number_format, percent_format, numeric_column, table_records, format_cell, format_records
+from table_paging import PagedTable
 
 
 #########################################################################################################################
 PICKLE_OUTPUT_DIR = r"C:\Users\jose.pineda\Desktop\smart_decon\operations\pickles"
 #################################################################################################################
-# Upload data to dataframes from pickle files 
-global_merged_df = pd.read_pickle(os.path.join(PICKLE_OUTPUT_DIR, "global_merged_df.pkl"))
-global_projects_df = pd.read_pickle(os.path.join(PICKLE_OUTPUT_DIR, "global_projects_df.pkl"))
-global_invoices = pd.read_pickle(os.path.join(PICKLE_OUTPUT_DIR, "global_invoices.pkl"))
-global_raw_invoices = pd.read_pickle(os.path.join(PICKLE_OUTPUT_DIR, "global_raw_invoices.pkl"))
+# Timesheet columns read by the dashboard callbacks
+MERGED_DF_DASHBOARD_COLUMNS = ['Project No', 'Employee', 'Personel', 'full_name', 'fname', 'staff_type', 'local_date',
+                               'hours', 'day_cost', 'jobcode_2', 'jobcode_3', 'Service Item']
+# Client project summary columns sent as numbers (money / hours and ER ratios)
+CLIENT_MONEY_COLUMNS = ['Contracted Amount', 'Total Invoice', 'Total Cost', 'DECON LLC Cost', 'DECON Col Cost']
+CLIENT_NUMBER_COLUMNS = ['Total Hours', 'DECON LLC Hours', 'DECON Col Hours', 'ER Contract', 'ER Invoiced', 'DECON LLC ER']
+# Rows per page of the server-side paged tables
+INVOICE_PAGE_SIZE = 15
+CLIENT_PROJECTS_PAGE_SIZE = 25
+WEEKLY_REPORT_PAGE_SIZE = 25
 #################################################################################################################
 #func for 1928 extra filter [jobcode 3 inclusion on project no]
 
-# Import last update date for display on dash
-with open(os.path.join(PICKLE_OUTPUT_DIR, "last_update.txt"), "r") as f:
-    last_update = f.read().strip()
-
-# Import last data update date for display on dash
-try:
-    with open(os.path.join(PICKLE_OUTPUT_DIR, "last_data_update.txt"), "r") as f:
-        last_data_update = f.read().strip()
-except FileNotFoundError:
-    last_data_update = "Unknown"
-
 """
 def get_week_in_month(date_obj):
 
@@ -76,654 +76,743 @@ else:
 
 
 
-def conditional_extract_project_number(row):
-    """
-    If jobcode_2 starts with '1928', use the first 7 characters of jobcode_3;
-    otherwise, use the first 7 characters of jobcode_2.
-    """
-    jc2 = str(row.get('jobcode_2', '')).strip()
-    jc3 = str(row.get('jobcode_3', '')).strip()
-    
-    if jc2.startswith("1928"):
-        # For all 1928* jobcodes in jobcode_2, use jobcode_3's first 7 characters
-        return jc3[:7].strip()
-    else:
-        # Otherwise, just use jobcode_2's first 7
-        return jc2[:7].strip()
-
 #################################################################################################################
-#create new id for all project storage
-#if 'Project No' not in global_merged_df.columns:
-#    global_merged_df['Project No'] = global_merged_df.apply(conditional_extract_project_number, axis=1)
-    
-global_merged_df['Project No'] = global_merged_df.apply(conditional_extract_project_number, axis=1)
+#'Project No' (with the 1928 -> jobcode_3 rule) is precomputed by data_processing.main;
+#only tables stored before that column existed need it derived here
+def add_project_no(df):
+    if 'Project No' not in df.columns:
+        df['Project No'] = derive_project_no(df)
+    return df
+
+# Dashboard tables, each loaded from the columnar store on first use and
+# reloaded when precompute refreshes the store (see data_access.py)
+data = DataSource(
+    PICKLE_OUTPUT_DIR,
+    columns={'global_merged_df': MERGED_DF_DASHBOARD_COLUMNS},
+    transforms={'global_merged_df': add_project_no,
+                'global_project_kpis': lambda df: df.set_index('Project No')},
+    # Stores written before these tables existed: compute them once per snapshot
+    fallbacks={'global_invoice_ledger': lambda snapshot: build_invoice_ledger(snapshot.global_raw_invoices).reset_index(),
+               'global_project_kpis': lambda snapshot: compute_er_table(
+                   snapshot.global_projects_df, snapshot.global_merged_df, snapshot.global_raw_invoices,
+                   snapshot.global_invoice_ledger).reset_index(),
+               'global_client_cube': lambda snapshot: build_client_cube(
+                   snapshot.global_merged_df, snapshot.global_projects_df)},
+    # Entries built from the previous snapshot can never be hit again; drop them
+    # so the old tables are not kept in memory until they age out
+    on_swap=[lambda: PROJECT_VIEWS.clear(), lambda: CALLBACK_RESULTS.clear()],
+)
+
+
+def current_version():
+    """Version stamp of the dataset being served (changes when precompute refreshes the store)."""
+    return data.version
+
+
+# Results of the heavier callbacks, keyed on their inputs and current_version()
+CALLBACK_RESULTS = ResultCache()
+
+
+def client_totals(selected_client, start_date, end_date):
+    """client_project_totals over the timesheet and invoice ledger rows in the date range (binary-search slices)."""
+    snapshot = data.current
+    return client_project_totals(
+        snapshot.global_projects_df,
+        snapshot.date_range('global_merged_df', 'local_date', start_date, end_date),
+        snapshot.date_range('global_invoice_ledger', 'Invoice Date', start_date, end_date),
+        selected_client)
+
+
+def project_view(project_no, selected_years=None):
+    """The shared per-selection ProjectView for the snapshot being served."""
+    return get_project_view(data.current, project_no, selected_years)
 
-#import last update date for display on dash
-with open(os.path.join(PICKLE_OUTPUT_DIR, "last_update.txt"), "r") as f:
-    last_update = f.read().strip()
 #################################################################################################################
 # Create the Dash app
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
+# WSGI application for gunicorn / waitress (app_main:server)
+server = app.server
+
+
+@server.before_request
+def start_data_loading():
+    """
+    Start the table preload and the last_update.txt watcher in this server
+    process on its first request, however the app is served (app.run, gunicorn,
+    waitress, several workers); later requests find them running.
+    """
+    data.start_background()
+
+
+@app.server.route('/ready')
+def ready():
+    """Readiness probe: 200 once all dashboard tables are loaded, 503 while loading."""
+    loaded = data.is_ready()
+    return flask.jsonify({'ready': loaded}), (200 if loaded else 503)
+
+
+@app.server.route('/cache-stats')
+def cache_stats():
+    """Hit/miss counters of the callback result cache and the project view cache."""
+    return flask.jsonify({'callbacks': CALLBACK_RESULTS.stats(), 'project_views': PROJECT_VIEWS.stats()})
+
 # Define the Layout with Tabs in the desired order:
 # Dashboard, then Client Summary, then Add New Project
-app.layout = dcc.Tabs(id='tabs-example', value='tab-dashboard', children=[
-    # Dashboard Tab
-    dcc.Tab(label='Dashboard', value='tab-dashboard', children=[
-        html.Div([
-            # Logo at the top
-            html.Div(
-                [html.Img(src='data:image/png;base64,{}'.format(config.encoded_logo), style={'height': '75px'})],
-                style={'textAlign': 'center', 'padding': '10px'}
-            ),
-            html.H1("Project Performance", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif'}),
-            # Filter section for project details
+def serve_layout():
+    """Build the layout on page load, so the tables are read on first request rather than at import."""
+    # Years available in the timesheet data, for the year selector
+    available_years = [str(y) for y in sorted(data.global_yearly_rollup['year'].dropna().unique())]
+    last_update = data.last_update
+    last_data_update = data.last_data_update
+
+    return dcc.Tabs(id='tabs-example', value='tab-dashboard', children=[
+        # Dashboard Tab
+        dcc.Tab(label='Dashboard', value='tab-dashboard', children=[
             html.Div([
-                html.H3("Filter Jobcodes by Project Details", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif'}),
-                dcc.Dropdown(
-                    id='filter-clients',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['Clients'].dropna().unique(), key=lambda x: str(x))],
-                    multi=True,
-                    placeholder="Select Clients"
-                ),
-                dcc.Dropdown(
-                    id='filter-type',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['Type'].dropna().unique(), key=lambda x: str(x))],
-                    multi=True,
-                    placeholder="Select Type"
-                ),
-                dcc.Dropdown(
-                    id='filter-status',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['Status'].dropna().unique(), key=lambda x: str(x))],
-                    multi=True,
-                    placeholder="Select Status"
-                ),
-                dcc.Dropdown(
-                    id='filter-service',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['Service Line'].dropna().unique(), key=lambda x: str(x))],
-                    multi=True,
-                    placeholder="Select Service Line"
-                ),
-                dcc.Dropdown(
-                    id='filter-market',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['Market Segment'].dropna().unique(), key=lambda x: str(x))],
-                    multi=True,
-                    placeholder="Select Market Segment"
+                # Logo at the top
+                html.Div(
+                    [html.Img(src='data:image/png;base64,{}'.format(config.encoded_logo), style={'height': '75px'})],
+                    style={'textAlign': 'center', 'padding': '10px'}
                 ),
-                dcc.Dropdown(
-                    id='filter-pm',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['PM'].dropna().unique(), key=lambda x: str(x))],
-                    multi=True,
-                    placeholder="Select PM"
-                )
-            ], style={'width': '80%', 'margin': 'auto', 'padding': '20px', 'textAlign': 'center'}),
-            # Jobcode selection dropdown
-            html.Div([
-                html.Label("Select Jobcode:"),
-                dcc.Dropdown(
-                    id='jobcode-dropdown',
-                    options=[],  # Updated via callback
-                    clearable=False
-                )
-            ], style={'width': '30%', 'margin': 'auto'}),
-            # Year selection dropdown
-            html.Div([
+                html.H1("Project Performance", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif'}),
+                # Filter section for project details
                 html.Div([
-                    html.Label("Select Year(s):"),
+                    html.H3("Filter Jobcodes by Project Details", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif'}),
                     dcc.Dropdown(
-                        id='year-dropdown',
-                        
-                        
-                        options=[{'label': str(y), 'value': str(y)} for y in range(2017, 2026)],
-                        value=[str(y) for y in range(2017, 2026)],  # Default selected years
-                        
+                        id='filter-clients',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['Clients'].dropna().unique(), key=lambda x: str(x))],
                         multi=True,
-                        clearable=False
+                        placeholder="Select Clients"
+                    ),
+                    dcc.Dropdown(
+                        id='filter-type',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['Type'].dropna().unique(), key=lambda x: str(x))],
+                        multi=True,
+                        placeholder="Select Type"
+                    ),
+                    dcc.Dropdown(
+                        id='filter-status',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['Status'].dropna().unique(), key=lambda x: str(x))],
+                        multi=True,
+                        placeholder="Select Status"
+                    ),
+                    dcc.Dropdown(
+                        id='filter-service',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['Service Line'].dropna().unique(), key=lambda x: str(x))],
+                        multi=True,
+                        placeholder="Select Service Line"
+                    ),
+                    dcc.Dropdown(
+                        id='filter-market',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['Market Segment'].dropna().unique(), key=lambda x: str(x))],
+                        multi=True,
+                        placeholder="Select Market Segment"
+                    ),
+                    dcc.Dropdown(
+                        id='filter-pm',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['PM'].dropna().unique(), key=lambda x: str(x))],
+                        multi=True,
+                        placeholder="Select PM"
                     )
-                ], style={'width': '30%', 'margin': 'auto'})
-            ], style={'textAlign': 'center', 'paddingBottom': '20px'}),
-            # Project description and award date placeholders
-            html.Div(id='project-description', style={'textAlign': 'center', 'padding': '20px', 'margin': '20px', 'fontSize': '18px'}),
-            html.Div(id='award-date', style={'textAlign': 'center', 'padding': '20px', 'margin': '20px', 'fontSize': '18px'}),
-            # Two tables for project details and cost/contract details
-            html.Div([
+                ], style={'width': '80%', 'margin': 'auto', 'padding': '20px', 'textAlign': 'center'}),
+                # Jobcode selection dropdown
                 html.Div([
-                    html.H2("Project Details", style={'textAlign': 'center'}),
-                    dash_table.DataTable(
-                        id='project-table-left',
-                        columns=[{'name': 'Field', 'id': 'Field'}, {'name': 'Value', 'id': 'Value'}],
-                        data=[],
-                        style_table=config.TABLE_STYLE,
-                        #style_cell=config.TABLE_CELL_STYLE,
-                        style_cell={'textAlign': 'left', 'padding': '5px', 'fontFamily': 'Calibri, sans-serif'},
-                        style_cell_conditional=config.TABLE_CELL_CONDITIONAL
+                    html.Label("Select Jobcode:"),
+                    dcc.Dropdown(
+                        id='jobcode-dropdown',
+                        options=[],  # Updated via callback
+                        clearable=False
                     )
-                ], style={'width': '40%', 'display': 'inline-block', 'verticalAlign': 'top', 'padding': '10px', 'margin': '10px'}),
+                ], style={'width': '30%', 'margin': 'auto'}),
+                # Year selection dropdown
                 html.Div([
-                    html.H2("Cost & Contract Details", style={'textAlign': 'center'}),
+                    html.Div([
+                        html.Label("Select Year(s):"),
+                        dcc.Dropdown(
+                            id='year-dropdown',
+                        
+                        
+                            options=[{'label': y, 'value': y} for y in available_years],
+                            value=available_years,  # Default selected years
+                        
+                            multi=True,
+                            clearable=False
+                        )
+                    ], style={'width': '30%', 'margin': 'auto'})
+                ], style={'textAlign': 'center', 'paddingBottom': '20px'}),
+                # Project description and award date placeholders
+                html.Div(id='project-description', style={'textAlign': 'center', 'padding': '20px', 'margin': '20px', 'fontSize': '18px'}),
+                html.Div(id='award-date', style={'textAlign': 'center', 'padding': '20px', 'margin': '20px', 'fontSize': '18px'}),
+                # Two tables for project details and cost/contract details
+                html.Div([
+                    html.Div([
+                        html.H2("Project Details", style={'textAlign': 'center'}),
+                        dash_table.DataTable(
+                            id='project-table-left',
+                            columns=[{'name': 'Field', 'id': 'Field'}, {'name': 'Value', 'id': 'Value'}],
+                            data=[],
+                            style_table=config.TABLE_STYLE,
+                            #style_cell=config.TABLE_CELL_STYLE,
+                            style_cell={'textAlign': 'left', 'padding': '5px', 'fontFamily': 'Calibri, sans-serif'},
+                            style_cell_conditional=config.TABLE_CELL_CONDITIONAL
+                        )
+                    ], style={'width': '40%', 'display': 'inline-block', 'verticalAlign': 'top', 'padding': '10px', 'margin': '10px'}),
+                    html.Div([
+                        html.H2("Cost & Contract Details", style={'textAlign': 'center'}),
                     
 
-                        dash_table.DataTable(
-                        id='project-table-right',
-                        #columns=[{'name': 'Field', 'id': 'Field'}, {'name': 'Value', 'id': 'Value'}],
+                            dash_table.DataTable(
+                            id='project-table-right',
+                            #columns=[{'name': 'Field', 'id': 'Field'}, {'name': 'Value', 'id': 'Value'}],
 
 
 
-                        #add hidden numeric values for color coding 
-                        columns=[{'name': 'Field', 'id': 'Field', 'type': 'text'},
-                        {'name': 'Value', 'id': 'Value', 'type': 'text'},
-                        # The hidden numeric column
-                        {'name': 'Value_num', 'id': 'Value_num', 'type': 'numeric'}],
+                            #add hidden numeric values for color coding 
+                            columns=[{'name': 'Field', 'id': 'Field', 'type': 'text'},
+                            {'name': 'Value', 'id': 'Value', 'type': 'text'},
+                            # The hidden numeric column
+                            {'name': 'Value_num', 'id': 'Value_num', 'type': 'numeric'}],
                         
                         
                         
-                        data=[],
-                        # Hide header cells for Value_num
-                        style_header_conditional=[{'if': {'column_id': 'Value_num'},'display': 'none'}],
-                        #style_data_conditional=config.RIGHT_TABLE_RED_STYLE,
-                        style_data_conditional=config.DATA_CONDITIONAL_ER + [
-                            {
-                                'if': {
-                                    'filter_query': '{Value_num} < 1 && {Field} = "ER DECON LLC"',
-                                    'column_id': 'Value'
+                            data=[],
+                            # Hide header cells for Value_num
+                            style_header_conditional=[{'if': {'column_id': 'Value_num'},'display': 'none'}],
+                            #style_data_conditional=config.RIGHT_TABLE_RED_STYLE,
+                            style_data_conditional=config.DATA_CONDITIONAL_ER + [
+                                {
+                                    'if': {
+                                        'filter_query': '{Value_num} < 1 && {Field} = "ER DECON LLC"',
+                                        'column_id': 'Value'
+                                    },
+                                    'color': 'red',
+                                    'fontWeight': 'bold'
                                 },
-                                'color': 'red',
-                                'fontWeight': 'bold'
-                            },
-                            {
-                                'if': {
-                                    'filter_query': '{Value_num} >= 1 && {Value_num} <= 2.5 && {Field} = "ER DECON LLC"',
-                                    'column_id': 'Value'
+                                {
+                                    'if': {
+                                        'filter_query': '{Value_num} >= 1 && {Value_num} <= 2.5 && {Field} = "ER DECON LLC"',
+                                        'column_id': 'Value'
+                                    },
+                                    'color': 'orange',
+                                    'fontWeight': 'bold'
                                 },
-                                'color': 'orange',
-                                'fontWeight': 'bold'
-                            },
-                            {
-                                'if': {
-                                    'filter_query': '{Value_num} > 2.5 && {Field} = "ER DECON LLC"',
-                                    'column_id': 'Value'
-                                },
-                                'color': 'green',
-                                'fontWeight': 'bold'
-                            }
-                        ],
-                        style_table=config.TABLE_STYLE,
-                        style_cell=config.TABLE_CELL_STYLE,
-                        #style_cell_conditional=config.TABLE_CELL_CONDITIONAL,
-                        style_cell_conditional=[{'if': {'column_id': 'Field'}, 'width': '40%'},{'if': {'column_id': 'Value'}, 'width': '60%'},{'if': {'column_id': 'Value_num'},'display': 'none'}],
+                                {
+                                    'if': {
+                                        'filter_query': '{Value_num} > 2.5 && {Field} = "ER DECON LLC"',
+                                        'column_id': 'Value'
+                                    },
+                                    'color': 'green',
+                                    'fontWeight': 'bold'
+                                }
+                            ],
+                            style_table=config.TABLE_STYLE,
+                            style_cell=config.TABLE_CELL_STYLE,
+                            #style_cell_conditional=config.TABLE_CELL_CONDITIONAL,
+                            style_cell_conditional=[{'if': {'column_id': 'Field'}, 'width': '40%'},{'if': {'column_id': 'Value'}, 'width': '60%'},{'if': {'column_id': 'Value_num'},'display': 'none'}],
                         
-                    )
-                ], style={'width': '40%', 'display': 'inline-block', 'verticalAlign': 'top', 'padding': '10px', 'margin': '10px'})
-            ], style={'textAlign': 'center'}),
+                        )
+                    ], style={'width': '40%', 'display': 'inline-block', 'verticalAlign': 'top', 'padding': '10px', 'margin': '10px'})
+                ], style={'textAlign': 'center'}),
             
-            html.Div([
-                html.Div([
-                    html.H2("Service Item Details", style={'textAlign': 'left'}),
-                    dash_table.DataTable(
-                        id='service-item-table',
-                        columns=[],  # set via callback
-                        data=[],     # set via callback
-                        #style_table={'width': '100%'},
-                        style_table=config.TABLE_STYLE,
-                        style_cell=config.TABLE_CELL_STYLE,
-                    )
-                ], style={
-                    'width': '30%',
-                    'marginRight': '10%',
-                    'display': 'inline-block',
-                    'verticalAlign': 'top'
-                }),
-
                 html.Div([
-                    html.H2("Project Invoices", style={'textAlign': 'left'}),
-                    dash_table.DataTable(
-                        id='invoice-table',
-                        columns=[],
-                        data=[],
-                        #style_table={'width': '50%'},
-                        style_table=config.TABLE_STYLE,
-                        style_cell=config.TABLE_CELL_STYLE,
-                    )
+                    html.Div([
+                        html.H2("Service Item Details", style={'textAlign': 'left'}),
+                        dash_table.DataTable(
+                            id='service-item-table',
+                            columns=[],  # set via callback
+                            data=[],     # set via callback
+                            #style_table={'width': '100%'},
+                            style_table=config.TABLE_STYLE,
+                            style_cell=config.TABLE_CELL_STYLE,
+                        )
+                    ], style={
+                        'width': '30%',
+                        'marginRight': '10%',
+                        'display': 'inline-block',
+                        'verticalAlign': 'top'
+                    }),
+
+                    html.Div([
+                        html.H2("Project Invoices", style={'textAlign': 'left'}),
+                        dash_table.DataTable(
+                            id='invoice-table',
+                            columns=[],
+                            data=[],
+                            # Paged, sorted and filtered on the server (only the visible page is sent)
+                            page_action='custom',
+                            page_current=0,
+                            page_size=INVOICE_PAGE_SIZE,
+                            sort_action='custom',
+                            sort_mode='multi',
+                            sort_by=[],
+                            filter_action='custom',
+                            filter_query='',
+                            #style_table={'width': '50%'},
+                            style_table=config.TABLE_STYLE,
+                            style_cell=config.TABLE_CELL_STYLE,
+                        )
+                    ], style={
+                        'width': '30%',
+                        'display': 'inline-block',
+                        'verticalAlign': 'top'
+                    }),
                 ], style={
-                    'width': '30%',
-                    'display': 'inline-block',
-                    'verticalAlign': 'top'
+                    'display': 'flex',
+                    'alignItems': 'flex-start',  # top-align the child Divs
+                    'justifyContent': 'center'
                 }),
-            ], style={
-                'display': 'flex',
-                'alignItems': 'flex-start',  # top-align the child Divs
-                'justifyContent': 'center'
-            }),
 
             
             
-            # Two small pie charts: total hours and total cost per service item
-            html.Div([
+                # Two small pie charts: total hours and total cost per service item
                 html.Div([
-                    html.H2("Total Hours per Service Item", style={'textAlign': 'center'}),
-                    dcc.Graph(id='service-hours-pie-chart', style={'height': '300px'})
-                ], style={'width': '45%', 'display': 'inline-block', 'padding': '10px'}),
+                    html.Div([
+                        html.H2("Total Hours per Service Item", style={'textAlign': 'center'}),
+                        dcc.Graph(id='service-hours-pie-chart', style={'height': '300px'})
+                    ], style={'width': '45%', 'display': 'inline-block', 'padding': '10px'}),
+                    html.Div([
+                        html.H2("Total Cost per Service Item", style={'textAlign': 'center'}),
+                        dcc.Graph(id='service-cost-pie-chart', style={'height': '300px'})
+                    ], style={'width': '45%', 'display': 'inline-block', 'padding': '10px'})
+                ], style={'textAlign': 'center', 'paddingTop': '20px'}),
+                # Pie charts for time and cost distributions by employee
+                html.H2("Time Distribution by Employee", style={'textAlign': 'center', 'paddingTop': '20px'}),
+                html.Div(dcc.Graph(id='pie-chart'), style={'width': '60%', 'margin': '0 auto'}),
                 html.Div([
-                    html.H2("Total Cost per Service Item", style={'textAlign': 'center'}),
-                    dcc.Graph(id='service-cost-pie-chart', style={'height': '300px'})
-                ], style={'width': '45%', 'display': 'inline-block', 'padding': '10px'})
-            ], style={'textAlign': 'center', 'paddingTop': '20px'}),
-            # Pie charts for time and cost distributions by employee
-            html.H2("Time Distribution by Employee", style={'textAlign': 'center', 'paddingTop': '20px'}),
-            html.Div(dcc.Graph(id='pie-chart'), style={'width': '60%', 'margin': '0 auto'}),
-            html.Div([
-                html.H2("Cost Distribution by Employee", style={'textAlign': 'center'}),
-                html.Div(dcc.Graph(id='cost-pie-chart'), style={'width': '60%', 'margin': '0 auto'})
-            ], style={'textAlign': 'center', 'paddingTop': '20px'}),
-            #show last run date
-            html.Div(
-            f"Latest Dashboard Update(Latest Run Date): {last_update}",
-            style={'color': 'gray', 'font-size': '12px', 'text-align': 'center', 'margin-top': '20px'}
-            ),
-            #show last run date
-            html.Div(
-            f"Latest Data Update: {last_data_update}",
-            style={'color': 'gray', 'font-size': '12px', 'text-align': 'center', 'margin-top': '20px'}
-            ),
-            html.Div([
-                html.Button("Export Dashboard to Excel", id="export-excel-dashboard", n_clicks=0),
-                dcc.Download(id="download-excel-dashboard")
-            ], style={'textAlign': 'center', 'marginTop': '20px'}),
+                    html.H2("Cost Distribution by Employee", style={'textAlign': 'center'}),
+                    html.Div(dcc.Graph(id='cost-pie-chart'), style={'width': '60%', 'margin': '0 auto'})
+                ], style={'textAlign': 'center', 'paddingTop': '20px'}),
+                #show last run date
+                html.Div(
+                f"Latest Dashboard Update(Latest Run Date): {last_update}",
+                style={'color': 'gray', 'font-size': '12px', 'text-align': 'center', 'margin-top': '20px'}
+                ),
+                #show last run date
+                html.Div(
+                f"Latest Data Update: {last_data_update}",
+                style={'color': 'gray', 'font-size': '12px', 'text-align': 'center', 'margin-top': '20px'}
+                ),
+                html.Div([
+                    html.Button("Export Dashboard to Excel", id="export-excel-dashboard", n_clicks=0),
+                    dcc.Download(id="download-excel-dashboard")
+                ], style={'textAlign': 'center', 'marginTop': '20px'}),
 
-            html.Div([
-                html.Button("Export Dashboard to PDF", id="export-pdf-dashboard", n_clicks=0),
-                dcc.Download(id="download-pdf-dashboard")
-            ], style={'textAlign': 'center', 'marginTop': '10px'})
-        ])
+                html.Div([
+                    html.Button("Export Dashboard to PDF", id="export-pdf-dashboard", n_clicks=0),
+                    dcc.Download(id="download-pdf-dashboard")
+                ], style={'textAlign': 'center', 'marginTop': '10px'})
+            ])
         
         
-    ]),
+        ]),
     
 
-    # ----------------------------------------------------------------
-    # TAB 2: CLIENT SUMMARY
-    # ----------------------------------------------------------------
-    dcc.Tab(label='Client Summary', value='tab-clients', children=[
-        html.Div([
-            # Two overall pie charts (aggregated over all clients)
+        # ----------------------------------------------------------------
+        # TAB 2: CLIENT SUMMARY
+        # ----------------------------------------------------------------
+        dcc.Tab(label='Client Summary', value='tab-clients', children=[
             html.Div([
+                # Two overall pie charts (aggregated over all clients)
                 html.Div([
-                    dcc.Graph(id='client-total-cost-pie', style={'height': '450px'})
-                ], style={'width': '600px', 'display': 'inline-block', 'padding': '10px'}),
-                html.Div([
-                    dcc.Graph(id='client-total-hours-pie', style={'height': '450px'})
-                ], style={'width': '600px', 'display': 'inline-block', 'padding': '10px'})
-            ], style={'textAlign': 'center'}),
+                    html.Div([
+                        dcc.Graph(id='client-total-cost-pie', style={'height': '450px'})
+                    ], style={'width': '600px', 'display': 'inline-block', 'padding': '10px'}),
+                    html.Div([
+                        dcc.Graph(id='client-total-hours-pie', style={'height': '450px'})
+                    ], style={'width': '600px', 'display': 'inline-block', 'padding': '10px'})
+                ], style={'textAlign': 'center'}),
             
             
             
-            # Dropdown to choose the client
-            html.Div([
-                html.Label("Select Client:", style={'fontFamily': 'Calibri, sans-serif'}),
-                dcc.Dropdown(
-                    id='client-dropdown',
-                    options=[{'label': c, 'value': c} 
-                             for c in sorted(global_projects_df['Clients'].dropna().unique())],
-                    placeholder="Type or select a client...",
-                    clearable=True
-                )
-            ], style={'width': '30%', 'margin': 'auto', 'padding': '10px'}),
-            html.Hr(),
+                # Dropdown to choose the client
+                html.Div([
+                    html.Label("Select Client:", style={'fontFamily': 'Calibri, sans-serif'}),
+                    dcc.Dropdown(
+                        id='client-dropdown',
+                        options=[{'label': c, 'value': c} 
+                                 for c in sorted(data.global_projects_df['Clients'].dropna().unique())],
+                        placeholder="Type or select a client...",
+                        clearable=True
+                    )
+                ], style={'width': '30%', 'margin': 'auto', 'padding': '10px'}),
+                html.Hr(),
                       
                       
-            html.H3("Client Summary", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif'}),          
+                html.H3("Client Summary", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif'}),          
             
-            # Title for Client Summary Table
-            html.H3("Client Project Status", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif'}),
+                # Title for Client Summary Table
+                html.H3("Client Project Status", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif'}),
         
-            # Client Summary Table
-            dash_table.DataTable(
-                id='client-summary-table',
-                columns=[{'name': 'Metric', 'id': 'Metric'}, {'name': 'Value', 'id': 'Value'}],
-                data=[],
-                style_table={'width': '40%', 'margin': 'auto', 'overflowY': 'auto'},
-                #style_cell=TABLE_CELL_STYLE
-                style_cell={'textAlign': 'left', 'fontFamily': 'Calibri, sans-serif'}
-            ),
-            # Title for Detailed Projects Table
-            html.H3("Project Summary", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif', 'margin-top': '20px'}),
+                # Client Summary Table
+                dash_table.DataTable(
+                    id='client-summary-table',
+                    columns=[{'name': 'Metric', 'id': 'Metric'}, {'name': 'Value', 'id': 'Value'}],
+                    data=[],
+                    style_table={'width': '40%', 'margin': 'auto', 'overflowY': 'auto'},
+                    #style_cell=TABLE_CELL_STYLE
+                    style_cell={'textAlign': 'left', 'fontFamily': 'Calibri, sans-serif'}
+                ),
+                # Title for Detailed Projects Table
+                html.H3("Project Summary", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif', 'margin-top': '20px'}),
         
-            # Detailed Projects Table for the selected client
-            dash_table.DataTable(
-                id='client-projects-table',
-                columns=[],  # set via callback
-                data=[],     # set via callback
-                style_table={'width': '80%', 'margin': 'auto', 'overflowY': 'auto'},
-                style_cell={'textAlign': 'left', 'fontFamily': 'Calibri, sans-serif'},
-                style_data_conditional=config.RIGHT_TABLE_RED_STYLE
-
-            ), # New: Date range picker for invoice dates
-            html.Div([
-                html.Label("Select Invoice Date Range:", style={'fontFamily': 'Calibri, sans-serif'}),
-                dcc.DatePickerRange(
-                    id='invoice-date-range',
-                    start_date_placeholder_text="Start Date",
-                    end_date_placeholder_text="End Date",
-                    display_format='YYYY-MM-DD'
-                )
-            ], style={'width': '30%', 'margin': 'auto', 'padding': '10px'}),
+                # Detailed Projects Table for the selected client
+                dash_table.DataTable(
+                    id='client-projects-table',
+                    columns=[],  # set via callback
+                    data=[],     # one page at a time, set via callback
+                    # Paged, sorted and filtered on the server (only the visible page is sent)
+                    page_action='custom',
+                    page_current=0,
+                    page_size=CLIENT_PROJECTS_PAGE_SIZE,
+                    sort_action='custom',
+                    sort_mode='multi',
+                    sort_by=[],
+                    filter_action='custom',
+                    filter_query='',
+                    style_table={'width': '80%', 'margin': 'auto', 'overflowY': 'auto'},
+                    style_cell={'textAlign': 'left', 'fontFamily': 'Calibri, sans-serif'},
+                    style_data_conditional=config.RIGHT_TABLE_RED_STYLE
+
+                ), # New: Date range picker for invoice dates
+                html.Div([
+                    html.Label("Select Invoice Date Range:", style={'fontFamily': 'Calibri, sans-serif'}),
+                    dcc.DatePickerRange(
+                        id='invoice-date-range',
+                        start_date_placeholder_text="Start Date",
+                        end_date_placeholder_text="End Date",
+                        display_format='YYYY-MM-DD'
+                    )
+                ], style={'width': '30%', 'margin': 'auto', 'padding': '10px'}),
             
    
-            #show last update date
-            html.Div(
-            f"Latest Data Update: {last_data_update}",
-            style={'color': 'gray', 'font-size': '12px', 'text-align': 'center', 'margin-top': '20px'}
-            ),
-            html.Div([
-                html.Button("Export Client Summary to Excel", id="export-excel-client", n_clicks=0),
-            dcc.Download(id="download-excel-client")
-            ], style={'textAlign': 'center', 'marginTop': '20px'}),
-            html.Div([
-                html.Button("Export Client Summary to PDF", id="export-pdf-client", n_clicks=0),
-                dcc.Download(id="download-pdf-client")
-            ], style={'textAlign': 'center', 'marginTop': '10px'})
-        ])
+                #show last update date
+                html.Div(
+                f"Latest Data Update: {last_data_update}",
+                style={'color': 'gray', 'font-size': '12px', 'text-align': 'center', 'margin-top': '20px'}
+                ),
+                html.Div([
+                    html.Button("Export Client Summary to Excel", id="export-excel-client", n_clicks=0),
+                dcc.Download(id="download-excel-client")
+                ], style={'textAlign': 'center', 'marginTop': '20px'}),
+                html.Div([
+                    html.Button("Export Client Summary to PDF", id="export-pdf-client", n_clicks=0),
+                    dcc.Download(id="download-pdf-client")
+                ], style={'textAlign': 'center', 'marginTop': '10px'})
+            ])
         
-    ]),
-    
-    #     # ----------------------------------------------------------------
-    # TAB 4*: ADD NEW PROJECT
-    # ----------------------------------------------------------------
-    dcc.Tab(label='Reports', value='tab-reports', children=[
-        html.Div([
-            html.H1("Weekly Project Reports", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif'}),
-            
-            # Date selection controls
+        ]),
+    
+        #     # ----------------------------------------------------------------
+        # TAB 4*: ADD NEW PROJECT
+        # ----------------------------------------------------------------
+        dcc.Tab(label='Reports', value='tab-reports', children=[
             html.Div([
-                html.Label("Select Month and Year:", style={'fontWeight': 'bold', 'fontSize': '16px'}),
-                dcc.DatePickerSingle(
-                    id='report-week-picker',  # keeping the name for compatibility
-                    date=pd.Timestamp.now().date(),
-                    display_format='MMMM YYYY'  # Format to show only month and year
-                ),
-                html.Div(id='selected-week-display', style={'marginTop': '10px'})
-            ], style={'width': '30%', 'margin': 'auto', 'textAlign': 'center', 'padding': '20px'}),
+                html.H1("Weekly Project Reports", style={'textAlign': 'center', 'fontFamily': 'Calibri, sans-serif'}),
             
-            # All projects table
-            html.Div([
-                html.H2(id='report-table-title', style={'textAlign': 'center'}),
-                html.H3("Monthly Invoice Report", style={'textAlign': 'center'}),
-                dash_table.DataTable(
-                    id='weekly-report-table',
-                    columns=[],
-                    data=[],
-                    style_table={'width': '95%', 'margin': 'auto', 'overflowX': 'auto'},
-                    style_cell={'textAlign': 'left', 'fontFamily': 'Calibri, sans-serif'},
-                    style_header={'backgroundColor': '#f8f9fa', 'fontWeight': 'bold'},
-                    style_data_conditional=[
-                        {
-                            'if': {'column_id': 'ER Invoiced', 'filter_query': '{ER Invoiced} < 1'},
-                            'color': 'red', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'column_id': 'ER Invoiced', 'filter_query': '{ER Invoiced} >= 1 && {ER Invoiced} <= 2.5'},
-                            'color': 'orange', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'column_id': 'ER Invoiced', 'filter_query': '{ER Invoiced} > 2.5'},
-                            'color': 'green', 'fontWeight': 'bold'
-                        },
+                # Date selection controls
+                html.Div([
+                    html.Label("Select Month and Year:", style={'fontWeight': 'bold', 'fontSize': '16px'}),
+                    dcc.DatePickerSingle(
+                        id='report-week-picker',  # keeping the name for compatibility
+                        date=pd.Timestamp.now().date(),
+                        display_format='MMMM YYYY'  # Format to show only month and year
+                    ),
+                    html.Div(id='selected-week-display', style={'marginTop': '10px'})
+                ], style={'width': '30%', 'margin': 'auto', 'textAlign': 'center', 'padding': '20px'}),
+            
+                # All projects table
+                html.Div([
+                    html.H2(id='report-table-title', style={'textAlign': 'center'}),
+                    html.H3("Monthly Invoice Report", style={'textAlign': 'center'}),
+                    dash_table.DataTable(
+                        id='weekly-report-table',
+                        columns=[],
+                        data=[],
+                        # Paged, sorted and filtered on the server (only the visible page is sent)
+                        page_action='custom',
+                        page_current=0,
+                        page_size=WEEKLY_REPORT_PAGE_SIZE,
+                        sort_action='custom',
+                        sort_mode='multi',
+                        sort_by=[],
+                        filter_action='custom',
+                        filter_query='',
+                        style_table={'width': '95%', 'margin': 'auto', 'overflowX': 'auto'},
+                        style_cell={'textAlign': 'left', 'fontFamily': 'Calibri, sans-serif'},
+                        style_header={'backgroundColor': '#f8f9fa', 'fontWeight': 'bold'},
+                        style_data_conditional=[
+                            {
+                                'if': {'column_id': 'ER Invoiced', 'filter_query': '{ER Invoiced} < 1'},
+                                'color': 'red', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'column_id': 'ER Invoiced', 'filter_query': '{ER Invoiced} >= 1 && {ER Invoiced} <= 2.5'},
+                                'color': 'orange', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'column_id': 'ER Invoiced', 'filter_query': '{ER Invoiced} > 2.5'},
+                                'color': 'green', 'fontWeight': 'bold'
+                            },
                         
                         
-                        {
-                            'if': {'column_id': 'ER DECON LLC', 'filter_query': '{ER DECON LLC} < 1'},
-                            'color': 'red', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'column_id': 'ER DECON LLC', 'filter_query': '{ER DECON LLC} >= 1 && {ER DECON LLC} <= 2.5'},
-                            'color': 'orange', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'column_id': 'ER DECON LLC', 'filter_query': '{ER DECON LLC} > 2.5'},
-                            'color': 'green', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'column_id': 'DECON LLC Invoiced', 'filter_query': '{DECON LLC Invoiced} < 1'},
-                            'color': 'red', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'column_id': 'DECON LLC Invoiced', 'filter_query': '{DECON LLC Invoiced} >= 1 && {DECON LLC Invoiced} <= 2.5'},
-                            'color': 'orange', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'column_id': 'DECON LLC Invoiced', 'filter_query': '{DECON LLC Invoiced} > 2.5'},
-                            'color': 'green', 'fontWeight': 'bold'
-                        },
-                        # Updated conditional formatting for Invoiced % using the numeric column
-                        {
-                            'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} < 0'},
-                            'color': 'red', 'fontWeight': 'bold'  # For N/A values (-1)
-                        },
-                        {
-                            'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} = 0'},
-                            'color': 'red', 'fontWeight': 'bold'  # For 0%
-                        },
-                        {
-                            'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} > 0 && {Invoiced %_num} < 60'},
-                            'color': 'darkorange', 'fontWeight': 'bold'  # 0-60%
-                        },
-                        {
-                            'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} >= 60 && {Invoiced %_num} < 80'},
-                            'color': 'gold', 'fontWeight': 'bold'  # 60-80%
-                        },
-                        {
-                            'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} >= 80 && {Invoiced %_num} < 90'},
-                            'color': 'yellowgreen', 'fontWeight': 'bold'  # 80-90%
-                        },
-                        {
-                            'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} >= 90 && {Invoiced %_num} <= 100'},
-                            'color': 'forestgreen', 'fontWeight': 'bold'  # 90-100%
-                        }
-                    ]
-                ),
-            ], style={'padding': '20px'}),
+                            {
+                                'if': {'column_id': 'ER DECON LLC', 'filter_query': '{ER DECON LLC} < 1'},
+                                'color': 'red', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'column_id': 'ER DECON LLC', 'filter_query': '{ER DECON LLC} >= 1 && {ER DECON LLC} <= 2.5'},
+                                'color': 'orange', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'column_id': 'ER DECON LLC', 'filter_query': '{ER DECON LLC} > 2.5'},
+                                'color': 'green', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'column_id': 'DECON LLC Invoiced', 'filter_query': '{DECON LLC Invoiced} < 1'},
+                                'color': 'red', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'column_id': 'DECON LLC Invoiced', 'filter_query': '{DECON LLC Invoiced} >= 1 && {DECON LLC Invoiced} <= 2.5'},
+                                'color': 'orange', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'column_id': 'DECON LLC Invoiced', 'filter_query': '{DECON LLC Invoiced} > 2.5'},
+                                'color': 'green', 'fontWeight': 'bold'
+                            },
+                            # Updated conditional formatting for Invoiced % using the numeric column
+                            {
+                                'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} < 0'},
+                                'color': 'red', 'fontWeight': 'bold'  # For N/A values (-1)
+                            },
+                            {
+                                'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} = 0'},
+                                'color': 'red', 'fontWeight': 'bold'  # For 0%
+                            },
+                            {
+                                'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} > 0 && {Invoiced %_num} < 60'},
+                                'color': 'darkorange', 'fontWeight': 'bold'  # 0-60%
+                            },
+                            {
+                                'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} >= 60 && {Invoiced %_num} < 80'},
+                                'color': 'gold', 'fontWeight': 'bold'  # 60-80%
+                            },
+                            {
+                                'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} >= 80 && {Invoiced %_num} < 90'},
+                                'color': 'yellowgreen', 'fontWeight': 'bold'  # 80-90%
+                            },
+                            {
+                                'if': {'column_id': 'Invoiced %', 'filter_query': '{Invoiced %_num} >= 90 && {Invoiced %_num} <= 100'},
+                                'color': 'forestgreen', 'fontWeight': 'bold'  # 90-100%
+                            }
+                        ]
+                    ),
+                ], style={'padding': '20px'}),
             
-            # Forecast summary table
-            html.Div([
-                html.H3("Forecast Summary", style={'textAlign': 'center'}),
-                dash_table.DataTable(
-                    id='forecast-summary-table',
-                    columns=[],
-                    data=[],
-                    style_table={'width': '70%', 'margin': 'auto', 'overflowX': 'auto'},
-                    style_cell={'textAlign': 'left', 'fontFamily': 'Calibri, sans-serif'},
-                    style_header={'backgroundColor': '#f8f9fa', 'fontWeight': 'bold'},
-                    style_data_conditional=[
-                        {
-                            'if': {'column_id': '%Forecast vs Actual', 'filter_query': '{%Forecast vs Actual} < "30%"'},
-                            'color': 'red', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'column_id': '%Forecast vs Actual', 'filter_query': '{%Forecast vs Actual} >= "30%" && {%Forecast vs Actual} < "75%"'},
-                            'color': 'orange', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'column_id': '%Forecast vs Actual', 'filter_query': '{%Forecast vs Actual} >= "75%"'},
-                            'color': 'green', 'fontWeight': 'bold'
-                        }
-                    ]
-                )
-            ], style={'padding': '20px'}),
+                # Forecast summary table
+                html.Div([
+                    html.H3("Forecast Summary", style={'textAlign': 'center'}),
+                    dash_table.DataTable(
+                        id='forecast-summary-table',
+                        columns=[],
+                        data=[],
+                        style_table={'width': '70%', 'margin': 'auto', 'overflowX': 'auto'},
+                        style_cell={'textAlign': 'left', 'fontFamily': 'Calibri, sans-serif'},
+                        style_header={'backgroundColor': '#f8f9fa', 'fontWeight': 'bold'},
+                        style_data_conditional=[
+                            {
+                                'if': {'column_id': '%Forecast vs Actual', 'filter_query': '{%Forecast vs Actual} < 30'},
+                                'color': 'red', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'column_id': '%Forecast vs Actual', 'filter_query': '{%Forecast vs Actual} >= 30 && {%Forecast vs Actual} < 75'},
+                                'color': 'orange', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'column_id': '%Forecast vs Actual', 'filter_query': '{%Forecast vs Actual} >= 75'},
+                                'color': 'green', 'fontWeight': 'bold'
+                            }
+                        ]
+                    )
+                ], style={'padding': '20px'}),
             
-            # Forecast by type table
-            html.Div([
-                html.H3("Forecast by Type", style={'textAlign': 'center'}),
-                dash_table.DataTable(
-                    id='forecast-type-table',
-                    columns=[],
-                    data=[],
-                    style_table={'width': '80%', 'margin': 'auto', 'overflowX': 'auto'},
-                    style_cell={'textAlign': 'left', 'fontFamily': 'Calibri, sans-serif'},
-                    style_header={'backgroundColor': '#f8f9fa', 'fontWeight': 'bold'},
-                    style_data_conditional=[
-                        {
-                            'if': {'column_id': 'Percentage Projected vs Actual', 'filter_query': '{Percentage Projected vs Actual} < "30%"'},
-                            'color': 'red', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'column_id': 'Percentage Projected vs Actual', 'filter_query': '{Percentage Projected vs Actual} >= "30%" && {Percentage Projected vs Actual} < "75%"'},
-                            'color': 'orange', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'column_id': 'Percentage Projected vs Actual', 'filter_query': '{Percentage Projected vs Actual} >= "75%"'},
-                            'color': 'green', 'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'row_index': -1},  # Last row (TOTAL)
-                            'fontWeight': 'bold'
-                        }
-                    ]
-                )
-            ], style={'padding': '20px'}),
-            html.Div([
-                html.H2("Projected vs Actual by Project Type", style={'textAlign':'center'}),
-                dcc.Graph(id='report-bar-chart')      # <-- placeholder
-            ], style={'padding':'20px'}),
-            # Export button
-            html.Div([
-                html.Button("Export to PDF", id="export-weekly-report", n_clicks=0),
-                dcc.Download(id="download-weekly-report-pdf")
-            ], style={'textAlign': 'center', 'marginTop': '20px', 'marginBottom': '40px'}),
-            html.Div(
-            f"Latest Data Update: {last_data_update}",
-            style={'color': 'gray', 'font-size': '12px', 'text-align': 'center', 'margin-top': '10px', 'marginBottom': '40px'}
-        )
-        ])
-    ]),
-    # ----------------------------------------------------------------
-    # TAB 4*: ADD NEW PROJECT
-    # ----------------------------------------------------------------
-    dcc.Tab(label='Add New Project', value='tab-add', children=[
-        html.Div([
-            html.H3("Add a New Project", style={'textAlign': 'center'}),
-            html.Div([
-                html.Label("Project No:"),
-                dcc.Input(id='input-project-no', type='text', placeholder='Project No')
-            ], style={'margin-bottom': '10px'}),
-            html.Div([
-                html.Label("Status:"),
-                dcc.Dropdown(
-                    id='input-status-dropdown',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['Status'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
-                    placeholder="Select Status",
-                    clearable=True
-                ),
-                html.Div(
-                    dcc.Input(id='input-status-other', type='text', placeholder='Enter new Status'),
-                    id='status-other-div',
-                    style={'display': 'none', 'margin-top': '5px'}
-                )
-            ], style={'margin-bottom': '10px'}),
-            html.Div([
-                html.Label("Type:"),
-                dcc.Dropdown(
-                    id='input-type-dropdown',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['Type'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
-                    placeholder="Select Type",
-                    clearable=True
-                ),
+                # Forecast by type table
+                html.Div([
+                    html.H3("Forecast by Type", style={'textAlign': 'center'}),
+                    dash_table.DataTable(
+                        id='forecast-type-table',
+                        columns=[],
+                        data=[],
+                        style_table={'width': '80%', 'margin': 'auto', 'overflowX': 'auto'},
+                        style_cell={'textAlign': 'left', 'fontFamily': 'Calibri, sans-serif'},
+                        style_header={'backgroundColor': '#f8f9fa', 'fontWeight': 'bold'},
+                        style_data_conditional=[
+                            {
+                                'if': {'column_id': 'Percentage Projected vs Actual', 'filter_query': '{Percentage Projected vs Actual} < 30'},
+                                'color': 'red', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'column_id': 'Percentage Projected vs Actual', 'filter_query': '{Percentage Projected vs Actual} >= 30 && {Percentage Projected vs Actual} < 75'},
+                                'color': 'orange', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'column_id': 'Percentage Projected vs Actual', 'filter_query': '{Percentage Projected vs Actual} >= 75'},
+                                'color': 'green', 'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'row_index': -1},  # Last row (TOTAL)
+                                'fontWeight': 'bold'
+                            }
+                        ]
+                    )
+                ], style={'padding': '20px'}),
+                html.Div([
+                    html.H2("Projected vs Actual by Project Type", style={'textAlign':'center'}),
+                    dcc.Graph(id='report-bar-chart')      # <-- placeholder
+                ], style={'padding':'20px'}),
+                # Export button
+                html.Div([
+                    html.Button("Export to PDF", id="export-weekly-report", n_clicks=0),
+                    dcc.Download(id="download-weekly-report-pdf")
+                ], style={'textAlign': 'center', 'marginTop': '20px', 'marginBottom': '40px'}),
                 html.Div(
-                    dcc.Input(id='input-type-other', type='text', placeholder='Enter new Type'),
-                    id='type-other-div',
-                    style={'display': 'none', 'margin-top': '5px'}
-                )
-            ], style={'margin-bottom': '10px'}),
+                f"Latest Data Update: {last_data_update}",
+                style={'color': 'gray', 'font-size': '12px', 'text-align': 'center', 'margin-top': '10px', 'marginBottom': '40px'}
+            )
+            ])
+        ]),
+        # ----------------------------------------------------------------
+        # TAB 4*: ADD NEW PROJECT
+        # ----------------------------------------------------------------
+        dcc.Tab(label='Add New Project', value='tab-add', children=[
             html.Div([
-                html.Label("Service Line:"),
-                dcc.Dropdown(
-                    id='input-service-line-dropdown',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['Service Line'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
-                    placeholder="Select Service Line",
-                    clearable=True
-                ),
-                html.Div(
-                    dcc.Input(id='input-service-line-other', type='text', placeholder='Enter new Service Line'),
-                    id='service-line-other-div',
-                    style={'display': 'none', 'margin-top': '5px'}
-                )
-            ], style={'margin-bottom': '10px'}),
+                html.H3("Add a New Project", style={'textAlign': 'center'}),
+                html.Div([
+                    html.Label("Project No:"),
+                    dcc.Input(id='input-project-no', type='text', placeholder='Project No')
+                ], style={'margin-bottom': '10px'}),
+                html.Div([
+                    html.Label("Status:"),
+                    dcc.Dropdown(
+                        id='input-status-dropdown',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['Status'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
+                        placeholder="Select Status",
+                        clearable=True
+                    ),
+                    html.Div(
+                        dcc.Input(id='input-status-other', type='text', placeholder='Enter new Status'),
+                        id='status-other-div',
+                        style={'display': 'none', 'margin-top': '5px'}
+                    )
+                ], style={'margin-bottom': '10px'}),
+                html.Div([
+                    html.Label("Type:"),
+                    dcc.Dropdown(
+                        id='input-type-dropdown',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['Type'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
+                        placeholder="Select Type",
+                        clearable=True
+                    ),
+                    html.Div(
+                        dcc.Input(id='input-type-other', type='text', placeholder='Enter new Type'),
+                        id='type-other-div',
+                        style={'display': 'none', 'margin-top': '5px'}
+                    )
+                ], style={'margin-bottom': '10px'}),
+                html.Div([
+                    html.Label("Service Line:"),
+                    dcc.Dropdown(
+                        id='input-service-line-dropdown',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['Service Line'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
+                        placeholder="Select Service Line",
+                        clearable=True
+                    ),
+                    html.Div(
+                        dcc.Input(id='input-service-line-other', type='text', placeholder='Enter new Service Line'),
+                        id='service-line-other-div',
+                        style={'display': 'none', 'margin-top': '5px'}
+                    )
+                ], style={'margin-bottom': '10px'}),
             
             
             
-            html.Div([
-                html.Label("Market Segment:"),
-                dcc.Dropdown(
-                    id='input-market-dropdown',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['Market Segment'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
-                    placeholder="Select Market Segment",
-                    clearable=True
-                ),
-                html.Div(
-                    dcc.Input(id='input-market-other', type='text', placeholder='Enter new Market Segment'),
-                    id='market-other-div',
-                    style={'display': 'none', 'margin-top': '5px'}
-                )
-            ], style={'margin-bottom': '10px'}),
-            html.Div([
-                html.Label("Project Manager (PM):"),
-                dcc.Dropdown(
-                    id='input-pm-dropdown',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['PM'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
-                    placeholder="Select PM",
-                    clearable=True
-                ),
-                html.Div(
-                    dcc.Input(id='input-pm-other', type='text', placeholder='Enter new PM'),
-                    id='pm-other-div',
-                    style={'display': 'none', 'margin-top': '5px'}
-                )
-            ], style={'margin-bottom': '10px'}),
-            html.Div([
-                html.Label("Project Description:"),
-                dcc.Input(id='input-project-description', type='text', placeholder='Project Description', style={'width': '100%'})
-            ], style={'margin-bottom': '10px'}),
-            html.Div([
-                html.Label("No.:"),
-                dcc.Input(id='input-no', type='text', placeholder='No.')
-            ], style={'margin-bottom': '10px'}),
-            html.Div([
-                html.Label("Clients:"),
-                dcc.Dropdown(
-                    id='input-clients-dropdown',
-                    options=[{'label': str(val), 'value': str(val)} 
-                             for val in sorted(global_projects_df['Clients'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
-                    placeholder="Select Clients",
-                    clearable=True
-                ),
-                html.Div(
-                    dcc.Input(id='input-clients-other', type='text', placeholder='Enter new Clients'),
-                    id='clients-other-div',
-                    style={'display': 'none', 'margin-top': '5px'}
-                )
-            ], style={'margin-bottom': '10px'}),
-            html.Div([
-                html.Label("Award Date (YYYY-MM-DD):"),
-                dcc.Input(id='input-award-date', type='text', placeholder='Award Date')
-            ], style={'margin-bottom': '10px'}),
-            html.Div([
-                html.Label("Contracted Amount:"),
-                dcc.Input(id='input-contracted-amount', type='number', placeholder='Contracted Amount')
-            ], style={'margin-bottom': '10px'}),
-            html.Button("Add Project", id='submit-new-project'),
-            html.Div(id='new-project-message', style={'margin-top': '10px', 'color': 'blue'})
-        ], style={'padding': '20px', 'textAlign': 'center'})
+                html.Div([
+                    html.Label("Market Segment:"),
+                    dcc.Dropdown(
+                        id='input-market-dropdown',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['Market Segment'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
+                        placeholder="Select Market Segment",
+                        clearable=True
+                    ),
+                    html.Div(
+                        dcc.Input(id='input-market-other', type='text', placeholder='Enter new Market Segment'),
+                        id='market-other-div',
+                        style={'display': 'none', 'margin-top': '5px'}
+                    )
+                ], style={'margin-bottom': '10px'}),
+                html.Div([
+                    html.Label("Project Manager (PM):"),
+                    dcc.Dropdown(
+                        id='input-pm-dropdown',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['PM'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
+                        placeholder="Select PM",
+                        clearable=True
+                    ),
+                    html.Div(
+                        dcc.Input(id='input-pm-other', type='text', placeholder='Enter new PM'),
+                        id='pm-other-div',
+                        style={'display': 'none', 'margin-top': '5px'}
+                    )
+                ], style={'margin-bottom': '10px'}),
+                html.Div([
+                    html.Label("Project Description:"),
+                    dcc.Input(id='input-project-description', type='text', placeholder='Project Description', style={'width': '100%'})
+                ], style={'margin-bottom': '10px'}),
+                html.Div([
+                    html.Label("No.:"),
+                    dcc.Input(id='input-no', type='text', placeholder='No.')
+                ], style={'margin-bottom': '10px'}),
+                html.Div([
+                    html.Label("Clients:"),
+                    dcc.Dropdown(
+                        id='input-clients-dropdown',
+                        options=[{'label': str(val), 'value': str(val)} 
+                                 for val in sorted(data.global_projects_df['Clients'].dropna().unique())] + [{'label': 'Other', 'value': 'Other'}],
+                        placeholder="Select Clients",
+                        clearable=True
+                    ),
+                    html.Div(
+                        dcc.Input(id='input-clients-other', type='text', placeholder='Enter new Clients'),
+                        id='clients-other-div',
+                        style={'display': 'none', 'margin-top': '5px'}
+                    )
+                ], style={'margin-bottom': '10px'}),
+                html.Div([
+                    html.Label("Award Date (YYYY-MM-DD):"),
+                    dcc.Input(id='input-award-date', type='text', placeholder='Award Date')
+                ], style={'margin-bottom': '10px'}),
+                html.Div([
+                    html.Label("Contracted Amount:"),
+                    dcc.Input(id='input-contracted-amount', type='number', placeholder='Contracted Amount')
+                ], style={'margin-bottom': '10px'}),
+                html.Button("Add Project", id='submit-new-project'),
+                html.Div(id='new-project-message', style={'margin-top': '10px', 'color': 'blue'})
+            ], style={'padding': '20px', 'textAlign': 'center'})
+        ])
     ])
-])
+
+
+app.layout = serve_layout
 #################################################################################################################
 # -------------------------------------------------------------------
 #  Define all Callbacks (callbacks remain as in your working version)
@@ -744,17 +833,11 @@ def update_report_bar_chart(selected_date):
     import plotly.graph_objects as go
     import pandas as pd
 
-    # 1) regenerate your report_data from your data_processing function
-    report_data, all_cols = data_processing.generate_monthly_report_data(
-        selected_date,
-        global_projects_df,
-        global_merged_df,
-        global_raw_invoices,
-        project_log_path
-    )
+    # 1) the month's project rows, shared (cached) with the weekly report table
+    df = monthly_report_tables(selected_date)[0].frame
     
-    # Handle empty report_data or missing 'Type' column
-    if not report_data:
+    # Handle an empty report
+    if df.empty:
         fig = go.Figure()
         fig.update_layout(
             title='Projected vs Actual by Project Type',
@@ -765,9 +848,7 @@ def update_report_bar_chart(selected_date):
         )
         return fig
 
-    df = pd.DataFrame(report_data)
-
-    if 'Type' not in df.columns or df.empty:
+    if 'Type' not in df.columns:
         fig = go.Figure()
         fig.update_layout(
             title='Projected vs Actual by Project Type',
@@ -870,13 +951,14 @@ def update_date_display(selected_date):
         State("project-table-left", "data"),
         State("project-table-right", "data"),
         State("service-item-table", "data"),
-        State("invoice-table", "data"),
         State("jobcode-dropdown", "value"),
         State("year-dropdown", "value"),
     ],
     prevent_initial_call=True
 )
-def export_dashboard_excel(n_clicks, left_data, right_data, service_data, invoice_data, selected_project, selected_years):
+def export_dashboard_excel(n_clicks, left_data, right_data, service_data, selected_project, selected_years):
+    # The invoice table only holds the visible page; export all of the project's invoices
+    invoice_data = invoice_table(selected_project).records()
     # Convert table data to DataFrames
     df_left = pd.DataFrame(left_data) if left_data and len(left_data) > 0 else pd.DataFrame()
     df_right = pd.DataFrame(right_data) if right_data and len(right_data) > 0 else pd.DataFrame()
@@ -937,17 +1019,21 @@ def export_dashboard_excel(n_clicks, left_data, right_data, service_data, invoic
         
         State("project-table-right", "data"),
         State("service-item-table", "data"),
-        State("invoice-table", "data"),
+        State("service-item-table", "columns"),
         State("jobcode-dropdown", "value"),  
         State("year-dropdown", "value")
     ],
     prevent_initial_call=True
 )
-def export_dashboard_pdf(n_clicks, left_data, right_data, service_data, invoice_data, selected_project, selected_years):
-    def data_to_html(data, title):
+def export_dashboard_pdf(n_clicks, left_data, right_data, service_data, service_columns, selected_project, selected_years):
+    # The invoice table only holds the visible page; export all of the project's invoices
+    invoices = invoice_table(selected_project)
+    invoice_data, invoice_columns = invoices.records(), invoices.columns
+    def data_to_html(data, title, columns=None):
         if not data or len(data)==0:
             return f"<h2>{title}</h2><p>No data available.</p>"
-        df = pd.DataFrame(data)
+        # Numeric columns are rendered the way the table shows them
+        df = pd.DataFrame(format_records(data, columns))
         return f"<h2>{title}</h2>" + df.to_html(index=False, border=1)
     
     # Generate the two pie chart figures from your function
@@ -998,8 +1084,8 @@ def export_dashboard_pdf(n_clicks, left_data, right_data, service_data, invoice_
         <h1>Dashboard Report</h1>
         {data_to_html(left_data, "Project Details")}
         {data_to_html(right_data, "Cost & Contract Details")}
-        {data_to_html(service_data, "Service Item Details")}
-        {data_to_html(invoice_data, "Invoices")}
+        {data_to_html(service_data, "Service Item Details", service_columns)}
+        {data_to_html(invoice_data, "Invoices", invoice_columns)}
         <h2>Total Hours per Service Item</h2>
         <img src="data:image/png;base64,{img_base64_hours}">
         <h2>Total Cost per Service Item</h2>
@@ -1022,52 +1108,12 @@ def export_client_pdf(n_clicks, selected_client, start_date, end_date):
     if not selected_client:
         return dcc.send_string("No data", "empty.pdf")
     
-        # 1. Filter projects for the selected client.
-    df_client_projects = global_projects_df[
-        global_projects_df['Clients'].str.strip().str.lower() == selected_client.lower()
-    ].copy()
-    
-    # 2. Filter invoices by the date range.
-    df_invoices_filtered = global_raw_invoices.copy()
-    if start_date and end_date:
-        df_invoices_filtered['Invoice Date'] = pd.to_datetime(
-            df_invoices_filtered['Invoice Date'], errors='coerce')
-        df_invoices_filtered = df_invoices_filtered[
-            (df_invoices_filtered['Invoice Date'] >= start_date) &
-            (df_invoices_filtered['Invoice Date'] <= end_date)
-        ]
-    invoices_grouped = df_invoices_filtered.groupby('Project No', as_index=False)['Actual'].sum()
-    invoices_grouped.rename(columns={'Actual': 'InvoiceNum'}, inplace=True)
-    
-    
-    # 3. Filter timesheet data by the same date range.
-    df_timesheet_filtered = global_merged_df.copy()
-    if start_date and end_date:
-        df_timesheet_filtered['local_date'] = pd.to_datetime(
-            df_timesheet_filtered['local_date'], errors='coerce')
-        df_timesheet_filtered = df_timesheet_filtered[
-            (df_timesheet_filtered['local_date'] >= start_date) &
-            (df_timesheet_filtered['local_date'] <= end_date)
-        ]
-    # Extract "Project No" from jobcode_2
-    df_timesheet_filtered['Project No'] = df_timesheet_filtered['jobcode_2'].apply(extract_project_number)
-    cost_grouped = df_timesheet_filtered.groupby('Project No', as_index=False)['day_cost'].sum()
-    cost_grouped.rename(columns={'day_cost': 'CostNum'}, inplace=True)
-    
-    # 4. Standardize the 'Project No' strings.
-    invoices_grouped['Project No'] = (
-        invoices_grouped['Project No'].astype(str).str.strip().apply(standardize_project_no))
-    cost_grouped['Project No'] = (
-        cost_grouped['Project No'].astype(str).str.strip().apply(standardize_project_no))
-    df_client_projects['Project No'] = (
-        df_client_projects['Project No'].astype(str).str.strip().apply(standardize_project_no))
-    
-    # 5. Merge the invoices and timesheet cost into the client projects.
-    df_detail = pd.merge(df_client_projects, invoices_grouped, on='Project No', how='left')
-    df_detail = pd.merge(df_detail, cost_grouped, on='Project No', how='left')
+    # Client projects with invoice and cost totals for the date range (same engine as the summary tab)
+    df_detail = client_totals(selected_client, start_date, end_date)
+    df_detail = df_detail.drop(columns=[c for c in CLIENT_TOTAL_COLUMNS if c not in ('InvoiceNum', 'CostNum')])
     
     # 6. Parse numeric values and format the cost columns.
-    df_detail['Contracted Amount Parsed'] = df_detail['Contracted Amount'].apply(parse_contract)
+    df_detail['Contracted Amount Parsed'] = parse_money_series(df_detail['Contracted Amount'])
     df_detail['TotalCostNum'] = df_detail['CostNum'].fillna(0)
     
     df_detail['Total Cost'] = df_detail['TotalCostNum'].apply(
@@ -1114,39 +1160,9 @@ def export_client_excel(n_clicks, selected_client, start_date, end_date):
     if not selected_client:
         return dcc.send_data_frame(pd.DataFrame().to_excel, "empty.xlsx", index=False)
     
-    # Replicate the filtering logic from update_client_summary
-    df_client_projects = global_projects_df[
-        global_projects_df['Clients'].str.strip().str.lower() == selected_client.lower()
-    ].copy()
-    
-    # Filter invoices by date
-    df_invoices_filtered = global_raw_invoices.copy()
-    if start_date and end_date:
-        df_invoices_filtered['Invoice Date'] = pd.to_datetime(df_invoices_filtered['Invoice Date'], errors='coerce')
-        df_invoices_filtered = df_invoices_filtered[
-            (df_invoices_filtered['Invoice Date'] >= start_date) & (df_invoices_filtered['Invoice Date'] <= end_date)
-        ]
-    invoices_grouped = df_invoices_filtered.groupby('Project No', as_index=False)['Actual'].sum()
-    invoices_grouped.rename(columns={'Actual': 'InvoiceNum'}, inplace=True)
-    
-    # Filter timesheet data by date
-    df_timesheet_filtered = global_merged_df.copy()
-    if start_date and end_date:
-        df_timesheet_filtered['local_date'] = pd.to_datetime(df_timesheet_filtered['local_date'], errors='coerce')
-        df_timesheet_filtered = df_timesheet_filtered[
-            (df_timesheet_filtered['local_date'] >= start_date) & (df_timesheet_filtered['local_date'] <= end_date)
-        ]
-    df_timesheet_filtered['Project No'] = df_timesheet_filtered['jobcode_2'].apply(extract_project_number)
-    cost_grouped = df_timesheet_filtered.groupby('Project No', as_index=False)['day_cost'].sum()
-    cost_grouped.rename(columns={'day_cost': 'CostNum'}, inplace=True)
-    
-    # Merge invoices and cost into the client projects
-    df_detail = df_client_projects.copy()
-    df_detail['Project No'] = df_detail['Project No'].astype(str).str.strip().apply(standardize_project_no)
-    invoices_grouped['Project No'] = invoices_grouped['Project No'].astype(str).str.strip().apply(standardize_project_no)
-    cost_grouped['Project No'] = cost_grouped['Project No'].astype(str).str.strip().apply(standardize_project_no)
-    df_detail = pd.merge(df_detail, invoices_grouped, on='Project No', how='left')
-    df_detail = pd.merge(df_detail, cost_grouped, on='Project No', how='left')
+    # Client projects with invoice and cost totals for the date range (same engine as the summary tab)
+    df_detail = client_totals(selected_client, start_date, end_date)
+    df_detail = df_detail.drop(columns=[c for c in CLIENT_TOTAL_COLUMNS if c not in ('InvoiceNum', 'CostNum')])
     
     # Here goes any additional formatting 
     #
@@ -1183,34 +1199,20 @@ def keep_second_number(val):
         return parts[-1]
     return parts[0] if parts else ""
 
-def revert_money(s):
-    """
-    Converts a formatted money string like "$4,500.00" to a float.
-    Returns 0.0 if conversion fails.
-    """
-    try:
-        return float(s.replace('$', '').replace(',', ''))
-    except Exception:
-        return 0.0
-
-@app.callback(
-    [Output('invoice-table', 'data'),
-     Output('invoice-table', 'columns')],
-    [Input('jobcode-dropdown', 'value')]
-)
-def update_invoice_table(selected_jobcode):
+@cached_callback(CALLBACK_RESULTS, current_version)
+def invoice_table(selected_jobcode):
+    """Invoice rows of the project with their TOTAL row, as a PagedTable (empty without a project or invoices)."""
     if not selected_jobcode:
-        return ([], [])
+        return PagedTable(pd.DataFrame(), [])
     
     # Standardize the selected project number.
     project_no_std = standardize_project_no(selected_jobcode)
     
-    # Copy raw invoices and filter by project.
-    df_invoices = global_raw_invoices.copy()
-    df_invoices['Project No'] = df_invoices['Project No'].astype(str).str.strip().apply(standardize_project_no)
-    df_invoices = df_invoices[df_invoices['Project No'] == project_no_std]
+    # Invoices of the project (shared project view), copied because they are reformatted below
+    df_invoices = project_view(selected_jobcode).invoices.copy()
+    df_invoices['Project No'] = project_no_std
     if df_invoices.empty:
-        return ([], [])
+        return PagedTable(pd.DataFrame(), [])
     
     # Rename columns: 'Actual' -> 'Amount'
     rename_map = {}
@@ -1230,54 +1232,86 @@ def update_invoice_table(selected_jobcode):
     # Clean "Invoice No": keep only the second (or last) number if there are multiples.
     df_invoices['Invoice No'] = df_invoices['Invoice No'].apply(keep_second_number)
     
-    # Process "Amount": Create a helper numeric column and then format it.
-    df_invoices['Amount_num'] = df_invoices['Amount'].apply(
-        lambda x: revert_money(x) if isinstance(x, str) and x.strip() != "" else (x if pd.notnull(x) else 0)
-    )
-    df_invoices['Amount'] = df_invoices['Amount_num'].apply(lambda x: f"${x:,.2f}" if x > 0 else "")
+    # "Amount": the ledger's Actual is already float64; non-positive amounts are left blank.
+    df_invoices['Amount_num'] = parse_money_series(df_invoices['Amount']).fillna(0)
+    df_invoices['Amount'] = df_invoices['Amount_num'].where(df_invoices['Amount_num'] > 0)
     
     # Process Payment: leave it as text.
     if 'Payment' in df_invoices.columns:
         df_invoices['Payment'] = df_invoices['Payment'].fillna('').astype(str).str.strip()
+        received = df_invoices['Payment'].str.lower() == "payment received"
+    else:
+        received = pd.Series(False, index=df_invoices.index)
     
     # Create "Recieved_invoices_num": if Payment equals "payment recieved" (case-insensitive), copy Amount_num.
-    df_invoices['Recieved_invoices_num'] = df_invoices.apply(
-        lambda row: row['Amount_num']
-        if row.get('Payment', '').strip().lower() == "payment received"
-        else 0,
-        axis=1
-    )
+    df_invoices['Recieved_invoices_num'] = df_invoices['Amount_num'].where(received, 0)
 
-    df_invoices['Recieved invoices'] = df_invoices['Recieved_invoices_num'].apply(
-        lambda x: f"${x:,.2f}" if x > 0 else ""
-    )
+    df_invoices['Recieved invoices'] = df_invoices['Recieved_invoices_num'].where(df_invoices['Recieved_invoices_num'] > 0)
     
     # Build the columns for the Dash table.
     columns = [
         {'name': 'Invoice Date', 'id': 'Invoice Date'},
         {'name': 'Invoice No',   'id': 'Invoice No'},
-        {'name': 'Amount',       'id': 'Amount'},
+        numeric_column('Amount', money_format()),
         {'name': 'Payment',      'id': 'Payment'},
         {'name': 'Payment Date', 'id': 'Payment Date'},
-        {'name': 'Received Payments', 'id': 'Recieved invoices'}
+        numeric_column('Received Payments', money_format(), 'Recieved invoices')
     ]
     
-    # Append a TOTAL row.
+    # TOTAL row (kept after the invoice rows on the last page).
     total_amount = df_invoices['Amount_num'].sum()
     total_recieved = df_invoices['Recieved_invoices_num'].sum()
     total_row = {
         'Invoice Date': 'TOTAL',
         'Invoice No': '',
-        'Amount': f"${total_amount:,.2f}" if total_amount > 0 else "",
+        'Amount': total_amount if total_amount > 0 else None,
         'Payment': '',
         'Payment Date': '',
-        'Recieved invoices': f"${total_recieved:,.2f}" if total_recieved > 0 else ""
+        'Recieved invoices': total_recieved if total_recieved > 0 else None
     }
-    df_invoices = pd.concat([df_invoices, pd.DataFrame([total_row])], ignore_index=True)
-    
     final_col_ids = [col['id'] for col in columns]
-    data = df_invoices[final_col_ids].to_dict('records')
-    return data, columns
+    return PagedTable(df_invoices[final_col_ids], columns, totals=total_row)
+
+
+@app.callback(
+    Output('invoice-table', 'columns'),
+    [Input('jobcode-dropdown', 'value')]
+)
+def update_invoice_table(selected_jobcode):
+    return invoice_table(selected_jobcode).columns
+
+
+# Table properties the DataTables change themselves while paging, sorting and filtering
+TABLE_PAGING_PROPS = ('page_current', 'page_size', 'sort_by', 'filter_query')
+
+
+def start_page(page_current):
+    """
+    (page to show, page_current output) for a paging callback. A new selection starts on
+    the first page and sends it back to the table from the same callback, so the table is
+    not paged twice; the table's own paging, sorting and filtering keep page_current.
+    """
+    if any(trigger['prop_id'].rsplit('.', 1)[-1] not in TABLE_PAGING_PROPS
+           for trigger in dash.callback_context.triggered):
+        return 0, 0
+    return page_current, dash.no_update
+
+
+@app.callback(
+    [Output('invoice-table', 'data'),
+     Output('invoice-table', 'page_count'),
+     Output('invoice-table', 'page_current')],
+    [Input('jobcode-dropdown', 'value'),
+     Input('invoice-table', 'page_current'),
+     Input('invoice-table', 'page_size'),
+     Input('invoice-table', 'sort_by'),
+     Input('invoice-table', 'filter_query')]
+)
+def page_invoice_table(selected_jobcode, page_current, page_size, sort_by, filter_query):
+    # A new project starts on the first page
+    page_current, page_reset = start_page(page_current)
+    # Only the requested page of the (sorted / filtered) invoices is sent
+    return (*invoice_table(selected_jobcode).page(page_current, page_size, sort_by, filter_query), page_reset)
 
 
 
@@ -1290,25 +1324,20 @@ def update_invoice_table(selected_jobcode):
     ],
     [Input('tabs-example', 'value')]
 )
+@cached_callback(CALLBACK_RESULTS, current_version)
 def update_client_summary_pies(selected_tab):
     import plotly.express as px
-    df = global_merged_df.copy()
-    df['Project No'] = df['jobcode_2'].apply(extract_project_number)
-    df_merged = pd.merge(
-        df,
-        global_projects_df[['Project No', 'Clients']],
-        on='Project No',
-        how='left'
-    )
-    print_green("Shape of df_merged for client pies: " + str(df_merged.shape))
-    #print_green(str(df_merged[['Project No', 'Clients', 'day_cost', 'hours']].head(20)))
+    # Read the precomputed (client, year, month, staff_type) cube instead of the timesheet rows
+    cube = data.global_client_cube
+    print_green("Client cube rows for client pies: " + str(len(cube)))
     
     # Filter out DECON LLC from the data because this is the tab for DECON LLC + DECON SAS, well include decon sas as a contractor on the llc only tab
     
-    df_merged_filtered = df_merged[~df_merged['Clients'].str.contains('DECON LLC', case=False, na=False)]
+    cube_filtered = cube[~cube['Clients'].str.contains('DECON LLC', case=False, na=False)]
     
-    cost_by_client = df_merged_filtered.groupby('Clients', as_index=False)['day_cost'].sum()
-    hours_by_client = df_merged_filtered.groupby('Clients', as_index=False)['hours'].sum()
+    by_client = cube_filtered.groupby('Clients', as_index=False, observed=True)[['day_cost', 'hours']].sum()
+    cost_by_client = by_client[['Clients', 'day_cost']]
+    hours_by_client = by_client[['Clients', 'hours']]
     #print_green("Aggregated cost_by_client:\n" + str(cost_by_client.head(20)))
     #print_green("Aggregated hours_by_client:\n" + str(hours_by_client.head(20)))
     fig_cost = px.pie(cost_by_client, names='Clients', values='day_cost', title="Total Cost by Client")
@@ -1327,12 +1356,6 @@ def update_client_summary_pies(selected_tab):
 
     return fig_cost, fig_hours
 #################################################################################################################
-def parse_contract(x):
-    try:
-        return float(str(x).replace('$', '').replace(',', '').strip())
-    except:
-        return None
-#################################################################################################################
 def safe_divide_contract(row):
     cost = row['CostNum']
     if (isinstance(cost, (int, float)) and cost > 0 and row['Contracted Amount Parsed'] is not None):
@@ -1345,36 +1368,22 @@ def safe_divide_invoiced(row):
         return  inv/cost
     return None
 #################################################################################################################
-# Callback for Client Summary Tab (with additional metrics and time filter)
-@app.callback(
-    [
-        Output('client-summary-table', 'data'),
-        Output('client-summary-table', 'columns'),
-        Output('client-projects-table', 'data'),
-        Output('client-projects-table', 'columns')
-    ],
-    [Input('client-dropdown', 'value'),
-     Input('invoice-date-range', 'start_date'),
-     Input('invoice-date-range', 'end_date')]
-)
-def update_client_summary(selected_client, start_date, end_date):
+# Client Summary Tab tables (with additional metrics and time filter)
+@cached_callback(CALLBACK_RESULTS, current_version)
+def client_summary_tables(selected_client, start_date, end_date):
+    """(status summary data, summary columns, PagedTable of the client's projects with a TOTAL row)"""
 
     
     
     #return empty if no client is selected in the dropdown
     if not selected_client:
-        return [], [], [], []
+        return [], [], PagedTable(pd.DataFrame(), [])
     
-    #filter projects for selected client
-    df_client_projects = global_projects_df[
-        #global_projects_df['Clients'].str.lower() == selected_client.lower()
-        global_projects_df['Clients'].str.strip().str.lower() == selected_client.lower()
-    ].copy()
-    
-    df_detail= df_client_projects.copy()
+    # Client projects with invoice / cost / hours totals for the date range
+    df_detail = client_totals(selected_client, start_date, end_date)
     
     print_green("Client selected: " + selected_client)
-    print_green("Number of projects for client: " + str(len(df_client_projects)))
+    print_green("Number of projects for client: " + str(len(df_detail)))
     
     #build summary data
     possible_statuses = [
@@ -1385,137 +1394,20 @@ def update_client_summary(selected_client, start_date, end_date):
     
     summary_data = []
     for status in possible_statuses:
-        count = df_client_projects['Status'].str.strip().str.lower().eq(status.lower()).sum()
+        count = df_detail['Status'].str.strip().str.lower().eq(status.lower()).sum()
         summary_data.append({"Metric": f"{status} Projects", "Value": f"{count}"})
     summary_columns = [{'name': 'Metric', 'id': 'Metric'},
                        {'name': 'Value', 'id': 'Value'}]
     
-    #client_project_nos = df_client_projects['Project No'].unique().tolist()
-    # --- Filter Invoices by Date Range ---
-    #df_invoices_filtered = global_invoices.copy()
-    
-    
-    #filter invoices by date range using raw invoices df
-    df_invoices_filtered = global_raw_invoices.copy()
+    # Numeric display columns (the table formats them); non-positive costs/hours show as N/A
+    df_detail['DECON LLC Cost'] = df_detail['Type1CostNum'].where(df_detail['Type1CostNum'] > 0)
+    df_detail['DECON Col Cost'] = df_detail['Type2CostNum'].where(df_detail['Type2CostNum'] > 0)
+    df_detail['DECON LLC Hours'] = df_detail['Type1HoursNum'].where(df_detail['Type1HoursNum'] > 0)
+    df_detail['DECON Col Hours'] = df_detail['Type2HoursNum'].where(df_detail['Type2HoursNum'] > 0)
 
-    # Assume invoices have a column named "Invoice Date"
-    if start_date and end_date:
-        df_invoices_filtered['Invoice Date'] = pd.to_datetime(df_invoices_filtered['Invoice Date'], errors='coerce')
-        df_invoices_filtered = df_invoices_filtered[
-            (df_invoices_filtered['Invoice Date'] >= start_date) &
-            (df_invoices_filtered['Invoice Date'] <= end_date)
-        ]
-    #invoices_grouped = df_invoices_filtered.groupby('Project No', as_index=False)['TotalProjectInvoice'].sum()
-    #i changed this because im accesing a raw data df
-    
-    invoices_grouped = df_invoices_filtered.groupby('Project No', as_index=False)['Actual'].sum()
-    #invoices_grouped.rename(columns={'Actual': 'TotalProjectInvoice'}, inplace=True)
-    invoices_grouped.rename(columns={'Actual': 'InvoiceNum'}, inplace=True)
 
-    #4 filter timesheet data by date range:
-
-    # Also filter timesheet data using the same date range (assuming 'local_date' is the date in the timesheet)
-    df_timesheet_filtered = global_merged_df.copy()
-    
-    if start_date and end_date:
-        df_timesheet_filtered['local_date'] = pd.to_datetime(df_timesheet_filtered['local_date'], errors='coerce')
-        df_timesheet_filtered = df_timesheet_filtered[
-            (df_timesheet_filtered['local_date'] >= start_date) &
-            (df_timesheet_filtered['local_date'] <= end_date)
-        ]
-        
-    # Extract "Project No" from "jobcode_2"
-    df_timesheet_filtered['Project No'] = df_timesheet_filtered['jobcode_2'].apply(extract_project_number)
-    #cost_grouped = df_timesheet_filtered.groupby('Project No', as_index=False)['day_cost'].sum()
-    cost_grouped = df_timesheet_filtered.groupby('Project No', as_index=False).agg({
-        'day_cost': 'sum',
-        'hours': 'sum'  # Add this line to also sum hours
-    })
-    
-    cost_grouped.rename(columns={'day_cost': 'CostNum', 'hours': 'HoursNum'}, inplace=True)
-    
-    type1_cost_grouped = df_timesheet_filtered[df_timesheet_filtered['staff_type'] == 1].groupby('Project No', as_index=False)['day_cost'].sum()
-    type2_cost_grouped = df_timesheet_filtered[df_timesheet_filtered['staff_type'] == 2].groupby('Project No', as_index=False)['day_cost'].sum()
-    
-    type1_cost_grouped.rename(columns={'day_cost': 'Type1CostNum'}, inplace=True)
-    type2_cost_grouped.rename(columns={'day_cost': 'Type2CostNum'}, inplace=True)
-    type1_hours_grouped = df_timesheet_filtered[df_timesheet_filtered['staff_type'] == 1].groupby('Project No', as_index=False)['hours'].sum()
-    type2_hours_grouped = df_timesheet_filtered[df_timesheet_filtered['staff_type'] == 2].groupby('Project No', as_index=False)['hours'].sum()
-
-    type1_hours_grouped.rename(columns={'hours': 'Type1HoursNum'}, inplace=True)
-    type2_hours_grouped.rename(columns={'hours': 'Type2HoursNum'}, inplace=True)
-
-    # Standardize project numbers
-    type1_cost_grouped['Project No'] = type1_cost_grouped['Project No'].astype(str).str.strip().apply(standardize_project_no)
-    type2_cost_grouped['Project No'] = type2_cost_grouped['Project No'].astype(str).str.strip().apply(standardize_project_no)
-    type1_hours_grouped['Project No'] = type1_hours_grouped['Project No'].astype(str).str.strip().apply(standardize_project_no)
-    type2_hours_grouped['Project No'] = type2_hours_grouped['Project No'].astype(str).str.strip().apply(standardize_project_no)
-
-    # Merge them into df_detail along with the other data
-    df_detail = pd.merge(df_detail, type1_cost_grouped, on='Project No', how='left')
-    df_detail = pd.merge(df_detail, type2_cost_grouped, on='Project No', how='left')
-    df_detail = pd.merge(df_detail, type1_hours_grouped, on='Project No', how='left')
-    df_detail = pd.merge(df_detail, type2_hours_grouped, on='Project No', how='left')
-
-    # Fill NaN values with 0
-    df_detail['Type1CostNum'] = df_detail['Type1CostNum'].fillna(0)
-    df_detail['Type2CostNum'] = df_detail['Type2CostNum'].fillna(0)
-    df_detail['Type1HoursNum'] = df_detail['Type1HoursNum'].fillna(0)
-    df_detail['Type2HoursNum'] = df_detail['Type2HoursNum'].fillna(0)
-
-    # Format for display
-    df_detail['DECON LLC Cost'] = df_detail['Type1CostNum'].apply(
-        lambda x: f"${x:,.2f}" if x > 0 else "N/A"
-    )
-    df_detail['DECON Col Cost'] = df_detail['Type2CostNum'].apply(
-        lambda x: f"${x:,.2f}" if x > 0 else "N/A"
-    )
-    
-        
-        # Format for display
-    df_detail['DECON LLC Hours'] = df_detail['Type1HoursNum'].apply(
-        lambda x: f"{x:.2f}" if x > 0 else "N/A"
-    )
-    df_detail['DECON Col Hours'] = df_detail['Type2HoursNum'].apply(
-        lambda x: f"{x:.2f}" if x > 0 else "N/A"
-    )
 
 
-
-
-    #merge filtered data with selected client projects 
-    #df_detail = df_client_projects.copy()
-
-    #standardize 'Project No' strings 
-    invoices_grouped['Project No'] = (
-        invoices_grouped['Project No']
-        .astype(str)
-        .str.strip()
-        .apply(standardize_project_no))
-
-    
-    cost_grouped['Project No'] = (
-        cost_grouped['Project No']
-        .astype(str)
-        .str.strip()
-        .apply(standardize_project_no))
-    df_detail['Project No'] = (
-        df_detail['Project No']
-        .astype(str)
-        .str.strip()
-        .apply(standardize_project_no)
-    )
-    
-    
-    ##############
-    
-
-    #  Merge invoice totals and cost into df_detail
-    df_detail = pd.merge(df_detail, invoices_grouped, on='Project No', how='left')
-    #
-    df_detail = pd.merge(df_detail, cost_grouped, on='Project No', how='left')
-    
-    
     #  Rename columns so day_cost becomes 'Total Cost'
     #df_detail.rename(columns={'TotalProjectInvoice': 'Total Invoice', 'day_cost': 'Total Cost'}, inplace=True)
     
@@ -1526,7 +1418,7 @@ def update_client_summary(selected_client, start_date, end_date):
 
     
     # Parse the contracted amount into a numeric column
-    df_detail['Contracted Amount Parsed'] = df_detail['Contracted Amount'].apply(parse_contract)
+    df_detail['Contracted Amount Parsed'] = parse_money_series(df_detail['Contracted Amount'])
     
     
     #  Keep a purely numeric column for cost
@@ -1544,42 +1436,15 @@ def update_client_summary(selected_client, start_date, end_date):
     df_detail['ER Contract'] = df_detail.apply(safe_divide_contract, axis=1)
     df_detail['ER Invoiced'] = df_detail.apply(safe_divide_invoiced, axis=1)
     
-    #format numeric columns for display
-    
-    #    - We'll create "Total Cost" and "Total Invoice" display columns from numeric
-    df_detail['Total Cost'] = df_detail['CostNum'].apply(
-        lambda x: f"${x:,.2f}" if pd.notnull(x) and x > 0 else "N/A"
-    )
-    df_detail['Total Cost'] = df_detail['TotalCostNum'].apply(
-    lambda x: f"${x:,.2f}" if x > 0 else "N/A")
+    #numeric display columns: missing / non-positive totals are left empty (shown as N/A)
+    df_detail['Total Cost'] = df_detail['TotalCostNum'].where(df_detail['TotalCostNum'] > 0)
+    df_detail['Total Invoice'] = df_detail['InvoiceNum'].where(df_detail['InvoiceNum'] > 0)
+    df_detail['Contracted Amount'] = df_detail['Contracted Amount Parsed']
+    df_detail['Total Hours'] = df_detail['HoursNum'].where(df_detail['HoursNum'] > 0)
 
-    df_detail['Total Invoice'] = df_detail['InvoiceNum'].apply(
-        lambda x: f"${x:,.2f}" if pd.notnull(x) and x > 0 else "N/A"
-    )
-    df_detail['Contracted Amount'] = df_detail['Contracted Amount Parsed'].apply(
-        lambda x: f"${x:,.2f}" if pd.notnull(x) else "N/A"
-    )
-    # Convert ER columns to string with 2 decimals, or N/A
-    df_detail['ER Contract'] = df_detail['ER Contract'].apply(
-        lambda x: f"{x:.2f}" if pd.notnull(x) else "N/A"
-    )
-    df_detail['ER Invoiced'] = df_detail['ER Invoiced'].apply(
-        lambda x: f"{x:.2f}" if pd.notnull(x) else "N/A"
-    )
-    df_detail['Total Hours'] = df_detail['HoursNum'].apply(
-        lambda x: f"{x:.2f}" if pd.notnull(x) and x > 0 else "N/A"
-    )
-
-    df_detail['New_ER'] = None
-    for idx, row in df_detail.iterrows():
-        project_no = row['Project No']
-        new_er = calculate_new_er(global_projects_df, project_no, global_merged_df)
-        df_detail.at[idx, 'New_ER'] = new_er
+    df_detail['New_ER'] = df_detail['Project No'].map(data.global_project_kpis['ER DECON LLC'])
     
-    # Format the new ER column like the other ER columns
-    df_detail['DECON LLC ER'] = df_detail['New_ER'].apply(
-        lambda x: f"{x:.2f}" if pd.notnull(x) else "N/A"
-    )
+    df_detail['DECON LLC ER'] = df_detail['New_ER']
     """
     # 3) Create a separate display column for total cost
     df_detail['Total Cost'] = df_detail['TotalCostNum'].apply(
@@ -1625,16 +1490,14 @@ def update_client_summary(selected_client, start_date, end_date):
     total_type1_hours = df_detail['Type1HoursNum'].sum()
     total_type2_hours = df_detail['Type2HoursNum'].sum()
 
-    totals_row['DECON LLC Cost'] = f"${total_type1_cost:,.2f}" if not pd.isna(total_type1_cost) else "N/A"
-    totals_row['DECON Col Cost'] = f"${total_type2_cost:,.2f}" if not pd.isna(total_type2_cost) else "N/A"
-   
-    totals_row['DECON LLC Hours'] = f"{total_type1_hours:.2f}" if not pd.isna(total_type1_hours) else "N/A"
-    totals_row['DECON Col Hours'] = f"{total_type2_hours:.2f}" if not pd.isna(total_type2_hours) else "N/A" 
-    # Format the totals for display
-    totals_row['Contracted Amount'] = f"${total_contracted:,.2f}" if not pd.isna(total_contracted) else "N/A"
-    totals_row['Total Invoice'] = f"${total_invoice:,.2f}" if not pd.isna(total_invoice) else "N/A"
-    totals_row['Total Cost'] = f"${total_cost:,.2f}" if not pd.isna(total_cost) else "N/A"
-    totals_row['Total Hours'] = f"{total_hours:.2f}" if not pd.isna(total_hours) else "N/A"
+    totals_row['DECON LLC Cost'] = total_type1_cost
+    totals_row['DECON Col Cost'] = total_type2_cost
+    totals_row['DECON LLC Hours'] = total_type1_hours
+    totals_row['DECON Col Hours'] = total_type2_hours
+    totals_row['Contracted Amount'] = total_contracted
+    totals_row['Total Invoice'] = total_invoice
+    totals_row['Total Cost'] = total_cost
+    totals_row['Total Hours'] = total_hours
     
     
     # Calculate the weighted average ERs (optional)
@@ -1648,23 +1511,54 @@ def update_client_summary(selected_client, start_date, end_date):
     else:
         totals_row['ER Invoiced'] = "N/A"
     """    
-    # Append the totals row to the DataFrame
-    df_detail_final = pd.concat([df_detail_final, pd.DataFrame([totals_row])], ignore_index=True)
-     
-  
-    
     ##########################
-    detail_data = df_detail_final.to_dict('records')
     
-    #dash table columns with numeric formatting on er columns 
+    #dash table columns with numeric formatting on money / hours / er columns
     detail_columns = []
     for col in detail_cols:
-        if col in ['ER Contract', 'ER Invoiced', 'DECON LLC ER']:
-            detail_columns.append({'name': col, 'id': col, 'type': 'numeric', 'format': Format(precision=2, scheme=Scheme.fixed)})
+        if col in CLIENT_MONEY_COLUMNS:
+            detail_columns.append(numeric_column(col, money_format('N/A')))
+        elif col in CLIENT_NUMBER_COLUMNS:
+            detail_columns.append(numeric_column(col, number_format(2, 'N/A')))
         else:
             detail_columns.append({'name': col, 'id': col})
-            #return all 
-    return summary_data, summary_columns, detail_data, detail_columns
+            #return all (the totals row stays after the projects on the last page)
+    return summary_data, summary_columns, PagedTable(df_detail_final, detail_columns, totals=totals_row)
+
+
+@app.callback(
+    [
+        Output('client-summary-table', 'data'),
+        Output('client-summary-table', 'columns'),
+        Output('client-projects-table', 'columns')
+    ],
+    [Input('client-dropdown', 'value'),
+     Input('invoice-date-range', 'start_date'),
+     Input('invoice-date-range', 'end_date')]
+)
+def update_client_summary(selected_client, start_date, end_date):
+    summary_data, summary_columns, projects = client_summary_tables(selected_client, start_date, end_date)
+    return summary_data, summary_columns, projects.columns
+
+
+@app.callback(
+    [Output('client-projects-table', 'data'),
+     Output('client-projects-table', 'page_count'),
+     Output('client-projects-table', 'page_current')],
+    [Input('client-dropdown', 'value'),
+     Input('invoice-date-range', 'start_date'),
+     Input('invoice-date-range', 'end_date'),
+     Input('client-projects-table', 'page_current'),
+     Input('client-projects-table', 'page_size'),
+     Input('client-projects-table', 'sort_by'),
+     Input('client-projects-table', 'filter_query')]
+)
+def page_client_projects(selected_client, start_date, end_date, page_current, page_size, sort_by, filter_query):
+    # A new client or date range starts on the first page
+    page_current, page_reset = start_page(page_current)
+    # Only the requested page of the (sorted / filtered) projects is sent
+    _, _, projects = client_summary_tables(selected_client, start_date, end_date)
+    return (*projects.page(page_current, page_size, sort_by, filter_query), page_reset)
 #######################################end of update client function 
 # Callback for Service Item Details Table#################################################################################################################
 @app.callback(
@@ -1678,70 +1572,35 @@ def update_service_item_table(selected_project_no, selected_years):
     if selected_project_no is None:
         return [], []
     
-    # Create a new column "Project No" in merged timesheet data if not already present.
-    if 'Project No' not in global_merged_df.columns:
-        #global_merged_df['Project No'] = global_merged_df['jobcode_2'].apply(extract_project_number)
-        df_filtered = global_projects_df[global_projects_df['Project No'] == selected_project_no]
-
-    
-    # Filter the merged timesheet data using the selected project number.
-    #df_filtered = global_merged_df[global_merged_df['Project No'] == selected_project_no]
-    df_filtered = global_merged_df[global_merged_df['Project No'] == selected_project_no].copy()
-
-    # Then, filter further by year if provided.
-    if selected_years:
-        selected_years_int = [int(y) for y in selected_years]
-        df_filtered = df_filtered[df_filtered['local_date'].dt.year.isin(selected_years_int)]
-    
+    # Hours and cost per service item of the shared project/years view
+    view = project_view(selected_project_no, selected_years)
+    print(f"Service items for {selected_project_no}: {len(view.timesheet)} timesheet rows")
+    service_item_col = 'Service Item'
+    grouped = view.service_items.copy()
     
-    
-    # Debug: print the available columns in df_filtered
-    print("Columns in df_filtered:")
-    print(df_filtered.columns.tolist())
-    
-    # Now try printing the subset you need
-    print(df_filtered[['Project No','local_date','Service Item','day_cost','hours']].tail(50))
-    
-    
-    
-    
-    
-    # Group by the service item column. For example, assume the column is named "Service Item".
-    service_item_col = None
-    for col in df_filtered.columns:
-        if col.lower().replace("_", " ").strip() == "service item":
-            service_item_col = col
-            break
-    if service_item_col is None:
-        return [], []
-    
-    grouped = df_filtered.groupby(service_item_col, as_index=False).agg({'hours': 'sum', 'day_cost': 'sum'})
-    
-    # Format display columns.
-    grouped['Total Hours'] = grouped['hours'].apply(lambda x: f"{x:.2f}")
-    grouped['Total Cost'] = grouped['day_cost'].apply(lambda x: f"${x:,.2f}")
+    grouped = grouped.rename(columns={'hours': 'Total Hours', 'day_cost': 'Total Cost'})
     
     # Compute totals.
-    total_hours = grouped['hours'].sum()
-    total_cost = grouped['day_cost'].sum()
+    total_hours = grouped['Total Hours'].sum()
+    total_cost = grouped['Total Cost'].sum()
     
-    # Convert to records and append a final "Total" row.
-    data = grouped[[service_item_col, 'Total Hours', 'Total Cost']].to_dict('records')
-    data.append({
+    # Convert to records and append a final "Total" row (numbers; the columns format them).
+    table_data = table_records(grouped[[service_item_col, 'Total Hours', 'Total Cost']])
+    table_data.append({
         service_item_col: "Total",
-        'Total Hours': f"{total_hours:.2f}",
-        'Total Cost': f"${total_cost:,.2f}"
+        'Total Hours': round(float(total_hours), 2),
+        'Total Cost': round(float(total_cost), 2)
     })
     
     columns = [
         {'name': 'Service Item', 'id': service_item_col},
-        {'name': 'Total Hours', 'id': 'Total Hours'},
-        {'name': 'Total Cost', 'id': 'Total Cost'}
+        numeric_column('Total Hours', number_format(2)),
+        numeric_column('Total Cost', money_format())
     ]
     #print("DEBUG: Rows for project =", selected_project_no, "years =", selected_years)
     #print(df_filtered[['Project No','local_date','Service Item','day_cost','hours']].tail(50))
 
-    return data, columns
+    return table_data, columns
 # Callback for Service Item Pie Charts#################################################################################################################
 @app.callback(
     [Output('service-hours-pie-chart', 'figure'),
@@ -1749,46 +1608,23 @@ def update_service_item_table(selected_project_no, selected_years):
     [Input('jobcode-dropdown', 'value'),
      Input('year-dropdown', 'value')]
 )
+@cached_callback(CALLBACK_RESULTS, current_version)
 def update_service_item_pie_charts(selected_project_no, selected_years):
     if not selected_project_no:
         default_fig = px.pie(title="No data available")
         return default_fig, default_fig
 
-    # Filter by 'Project No' instead of 'jobcode_2'
-    df_filtered = global_merged_df[global_merged_df['Project No'] == selected_project_no].copy()
-
-    if selected_years:
-        try:
-            selected_years_int = [int(y) for y in selected_years]
-            df_filtered = df_filtered[df_filtered['local_date'].dt.year.isin(selected_years_int)]
-        except Exception:
-            pass
-
-    if df_filtered.empty:
+    # Hours and cost per service item of the shared project/years view
+    view = project_view(selected_project_no, selected_years)
+    if view.timesheet.empty:
         default_fig = px.pie(title="No data available after filtering")
         return default_fig, default_fig
 
-    # Identify the "service item" column
-    service_item_col = None
-    for col in df_filtered.columns:
-        if col.lower().replace("_", " ").strip() == "service item":
-            service_item_col = col
-            break
-    if service_item_col is None:
-        # Alternatively, try scanning for any column name containing "service"
-        for col in df_filtered.columns:
-            if "service" in col.lower():
-                service_item_col = col
-                break
-
-    if not service_item_col:
-        default_fig = px.pie(title="No 'service item' column found")
-        return default_fig, default_fig
-
-    grouped = df_filtered.groupby(service_item_col, as_index=False).agg({'hours': 'sum', 'day_cost': 'sum'})
+    service_item_col = 'Service Item'
+    grouped = view.service_items
     if grouped.empty:
         default_fig = px.pie(title="No data after grouping")
-        return default_fig, default_fig                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                               
+        return default_fig, default_fig
 
     # Build the two pie charts
     fig_hours = px.pie(grouped, names=service_item_col, values='hours', title="Total Hours per Service Item")
@@ -1811,7 +1647,7 @@ def update_service_item_pie_charts(selected_project_no, selected_years):
      Input('filter-pm', 'value')]
 )
 def update_jobcode_options(filter_clients, filter_type, filter_status, filter_service, filter_market, filter_pm):
-    filtered_projects = global_projects_df.copy()
+    filtered_projects = data.global_projects_df.copy()
     
     if not any([filter_clients, filter_type, filter_status, filter_service, filter_market, filter_pm]):
         pass
@@ -1850,7 +1686,7 @@ def update_jobcode_options(filter_clients, filter_type, filter_status, filter_se
             print("After PM filter:", len(filter_pm))
             
     #valid_projects = filtered_projects['Project No'].unique()
-    #valid_jobcodes = global_merged_df[global_merged_df['jobcode_2'].apply(lambda x: extract_project_number(x) in valid_projects)]
+    #valid_jobcodes = data.global_merged_df[data.global_merged_df['jobcode_2'].apply(lambda x: extract_project_number(x) in valid_projects)]
     #jobcode_values = valid_jobcodes['jobcode_2'].unique()
     #options = [{'label': jc, 'value': jc} for jc in sorted(jobcode_values)]
     
@@ -1870,13 +1706,8 @@ def update_award_date(selected_jobcode):
     if selected_jobcode is None:
         return ""
     
-    #extracted_code = extract_project_number(selected_jobcode)
-    #filtered = global_projects_df[global_projects_df['Project No'].str[:7] == extracted_code]
-    filtered = global_projects_df[global_projects_df['Project No'] == selected_jobcode]
-
-    
-    if not filtered.empty:
-        project_record = filtered.iloc[0]
+    project_record = project_view(selected_jobcode).record
+    if project_record is not None:
         award_date_raw = project_record.get('Award Date', "No Award Date Available")
         try:
             award_date = pd.to_datetime(award_date_raw)
@@ -1898,6 +1729,7 @@ def update_award_date(selected_jobcode):
      Output('project-table-right', 'columns')],
     [Input('jobcode-dropdown', 'value')]
 )
+@cached_callback(CALLBACK_RESULTS, current_version)
 def update_project_tables(selected_jobcode):
     if not selected_jobcode:
         return [], [{"name": "Field", "id": "Field"}, {"name": "Value", "id": "Value"}], [], [
@@ -1908,32 +1740,12 @@ def update_project_tables(selected_jobcode):
 
     print(f"Selected jobcode: {selected_jobcode}")
     
-    # Create a direct copy to avoid modifying the original
-    projects_df_copy = global_projects_df.copy()
-    
-    # Print project columns to debug
-    print(f"Projects DataFrame columns: {projects_df_copy.columns.tolist()}")
-    print(f"First few Project No values: {projects_df_copy['Project No'].head(5).tolist()}")
-    
-    # Use multiple matching methods to find the project
-    # Method 1: Direct match
-    filtered = projects_df_copy[projects_df_copy['Project No'].astype(str).str.strip() == str(selected_jobcode).strip()]
-    print(f"Method 1 (Direct match) found {len(filtered)} rows")
-    
-    # Method 2: Match with standardized project numbers
-    if filtered.empty:
-        selected_std = standardize_project_no(str(selected_jobcode))
-        projects_std = projects_df_copy['Project No'].astype(str).apply(standardize_project_no)
-        filtered = projects_df_copy[projects_std == selected_std]
-        print(f"Method 2 (Standardized match) found {len(filtered)} rows")
-    
-    # Method 3: Check if it's a substring (last resort)
-    if filtered.empty:
-        filtered = projects_df_copy[projects_df_copy['Project No'].astype(str).str.contains(str(selected_jobcode), regex=False)]
-        print(f"Method 3 (Substring match) found {len(filtered)} rows")
-    
+    # Project log row and KPI row from the shared project view
+    # (direct match, then standardized match, then substring match as a last resort)
+    view = project_view(selected_jobcode)
+
     # If still no match, create manual data
-    if filtered.empty:
+    if view.record is None:
         print(f"ERROR: No project found for {selected_jobcode}")
         
         # Create hardcoded data for testing/demonstration
@@ -1962,7 +1774,7 @@ def update_project_tables(selected_jobcode):
         return left_data, left_columns, right_table_data, right_columns
     
     # We found a match, proceed with creating the tables
-    project_record_series = filtered.iloc[0]
+    project_record_series = view.record
     print(f"Found project: {project_record_series['Project No']}")
     
     # Create the left table data (Project Details)
@@ -1976,49 +1788,17 @@ def update_project_tables(selected_jobcode):
                 'Value': str(project_record_series[field])
             })
     
-    # Process cost data
-    total_cost = 0
-    # Ensure selected_jobcode is treated as a string for filtering in global_merged_df
-    # as 'Project No' in global_merged_df might have been standardized or derived differently.
-    # It's safer to rely on extract_project_number for jobcode_2 if that's the primary link.
-    df_timesheet_filtered = global_merged_df[global_merged_df['jobcode_2'].astype(str).apply(extract_project_number) == standardize_project_no(str(selected_jobcode))]
-    if df_timesheet_filtered.empty:
-         # Fallback: Try direct match on 'Project No' if it exists and was reliably created
-        if 'Project No' in global_merged_df.columns:
-            df_timesheet_filtered = global_merged_df[global_merged_df['Project No'].astype(str).str.strip() == str(selected_jobcode).strip()]
-
-    if not df_timesheet_filtered.empty:
-        total_cost = df_timesheet_filtered['day_cost'].sum()
-    
-    # Get invoice data
-    total_invoice = 0
-    if 'Project No' in global_raw_invoices.columns:
-        # Standardize both sides of the comparison for robustness
-        df_invoices = global_raw_invoices[global_raw_invoices['Project No'].astype(str).str.strip().apply(standardize_project_no) == standardize_project_no(str(selected_jobcode).strip())]
-        if not df_invoices.empty and 'Actual' in df_invoices.columns:
-            # Ensure 'Actual' is numeric before summing
-            total_invoice = pd.to_numeric(df_invoices['Actual'], errors='coerce').sum()
-    
-    # Get contracted amount
-    contracted_amount = None
-    if 'Contracted Amount' in project_record_series and pd.notna(project_record_series['Contracted Amount']):
-        try:
-            if isinstance(project_record_series['Contracted Amount'], str):
-                contracted_amount = float(project_record_series['Contracted Amount'].replace('$', '').replace(',', ''))
-            else:
-                contracted_amount = float(project_record_series['Contracted Amount'])
-        except:
-            contracted_amount = None
-    
-    # Calculate derived values
-    remaining_to_invoice = contracted_amount - total_invoice if contracted_amount is not None and total_invoice is not None else None
+    # Totals and ER ratios: one row of the per-project KPI table
+    kpi_row = view.kpis
+    as_value = lambda column: None if kpi_row is None or pd.isna(kpi_row[column]) else float(kpi_row[column])
+
+    total_cost = as_value('Total Cost') or 0
+    total_invoice = as_value('Invoiced Amount') or 0
+    contracted_amount = as_value('Contracted Amount')
+    remaining_to_invoice = contracted_amount - total_invoice if contracted_amount is not None else None
     er_contract = contracted_amount / total_cost if total_cost > 0 and contracted_amount is not None else None
-    er_invoiced = total_invoice / total_cost if total_cost > 0 and total_invoice is not None and total_invoice > 0 else None
-    
-    # Calculate ER DECON LLC
-    # Standardize selected_jobcode before passing to calculate_new_er
-    standardized_selected_jobcode = standardize_project_no(str(selected_jobcode))
-    er_decon_llc = calculate_new_er(global_projects_df, standardized_selected_jobcode, global_merged_df)
+    er_invoiced = total_invoice / total_cost if total_cost > 0 and total_invoice > 0 else None
+    er_decon_llc = as_value('ER DECON LLC')
 
     # Format values
     format_money = lambda x: f"${x:,.2f}" if x is not None else "N/A"
@@ -2056,14 +1836,8 @@ def update_project_description(selected_jobcode):
     if selected_jobcode is None:
         return ""
     
-    ##extracted_code = extract_project_number(selected_jobcode)
-    #filtered = global_projects_df[global_projects_df['Project No'].str[:7] == extracted_code]
-    #filtered = global_projects_df[global_projects_df['Project No'] == selected_project_no]
-
-    filtered = global_projects_df[global_projects_df['Project No'] == selected_jobcode]
-
-    if not filtered.empty:
-        project_record = filtered.iloc[0]
+    project_record = project_view(selected_jobcode).record
+    if project_record is not None:
         description = project_record.get('Project Description', "No Description Available")
         return html.Div([html.B("Project Description:"), " " + str(description)])
     return "No Project Description Found."
@@ -2073,17 +1847,18 @@ project_log_path = r"\\192.168.39.20\Confidential\12 Invoicing\Contracted Projec
 @app.callback(
     Output("download-weekly-report-pdf", "data"),
     Input("export-weekly-report", "n_clicks"),
-    [State('weekly-report-table', 'data'),
-     State('weekly-report-table', 'columns'),
-     State('forecast-summary-table', 'data'),
+    [State('forecast-summary-table', 'data'),
      State('forecast-summary-table', 'columns'),
      State('forecast-type-table', 'data'),
      State('forecast-type-table', 'columns'),
      State('report-week-picker', 'date')],
     prevent_initial_call=True
 )
-def export_weekly_report_pdf(n_clicks, table_data, table_columns, forecast_summary_data, forecast_summary_columns, 
+def export_weekly_report_pdf(n_clicks, forecast_summary_data, forecast_summary_columns, 
                             forecast_type_data, forecast_type_columns, selected_date):
+    # The table only holds the visible page; the export takes every row of the report
+    report = monthly_report_tables(selected_date)[0]
+    table_data, table_columns = report.records(), report.columns
     if not selected_date or not table_data:
         return dcc.send_string("No data to export", "empty_report.pdf")
     
@@ -2225,7 +2000,8 @@ def export_weekly_report_pdf(n_clicks, table_data, table_columns, forecast_summa
             for col in columns:
                 col_id = col['id']
                 col_name = col['name'] if 'name' in col else col_id
-                value = row.get(col_id, '')
+                # Numeric cells are rendered as the table shows them
+                value = format_cell(row.get(col_id, ''), col)
                 
                 # Determine text alignment based on column type
                 text_align_class = ''
@@ -2289,7 +2065,8 @@ def export_weekly_report_pdf(n_clicks, table_data, table_columns, forecast_summa
             html_string += "<tr>"
             for col in forecast_summary_columns:
                 col_id = col['id']
-                value = row.get(col_id, '')
+                # Numeric cells are rendered as the table shows them
+                value = format_cell(row.get(col_id, ''), col)
                 
                 # Determine text alignment based on column type
                 text_align_class = ''
@@ -2333,7 +2110,8 @@ def export_weekly_report_pdf(n_clicks, table_data, table_columns, forecast_summa
             
             for col in forecast_type_columns:
                 col_id = col['id']
-                value = row.get(col_id, '')
+                # Numeric cells are rendered as the table shows them
+                value = format_cell(row.get(col_id, ''), col)
                 
                 # Determine text alignment based on column type
                 text_align_class = ''
@@ -2373,45 +2151,13 @@ def export_weekly_report_pdf(n_clicks, table_data, table_columns, forecast_summa
         try:
             import plotly.graph_objects as go
             
-            # Check if we're dealing with a DataFrame or a list of dictionaries
-            if isinstance(df_forecast_type, pd.DataFrame):
-                # Filter out the 'TOTAL' row for the chart
-                df_for_chart = df_forecast_type[df_forecast_type['Type'] != 'TOTAL'].copy()
-                
-                # Prepare data for the chart
-                project_types = df_for_chart['Type'].tolist()
-                
-                # Extract numeric values from currency strings
-                def parse_currency(value):
-                    if isinstance(value, str):
-                        return float(value.replace('$', '').replace(',', ''))
-                    return float(value) if pd.notnull(value) else 0
-                
-                # Convert currency strings to float values
-                projected_values = [parse_currency(val) for val in df_for_chart['Projected']]
-                actual_values = [parse_currency(val) for val in df_for_chart['Actual']]
-                
-            else:
-                # We're dealing with a list of dictionaries (records)
-                # Filter out the 'TOTAL' row for the chart
-                df_for_chart = [row for row in df_forecast_type if row.get('Type') != 'TOTAL']
-                
-                # Prepare data for the chart
-                project_types = [row.get('Type', '') for row in df_for_chart]
-                projected_values = []
-                actual_values = []
-                
-                for row in df_for_chart:
-                    # Extract numeric values from currency strings
-                    projected_str = row.get('Projected', '$0.00')
-                    actual_str = row.get('Actual', '$0.00')
-                    
-                    # Convert the currency strings to float
-                    projected_val = float(projected_str.replace('$', '').replace(',', ''))
-                    actual_val = float(actual_str.replace('$', '').replace(',', ''))
-                    
-                    projected_values.append(projected_val)
-                    actual_values.append(actual_val)
+            # Filter out the 'TOTAL' row for the chart
+            df_for_chart = df_forecast_type[df_forecast_type['Type'] != 'TOTAL'].copy()
+            
+            # Prepare data for the chart (the table sends Projected / Actual as numbers)
+            project_types = df_for_chart['Type'].tolist()
+            projected_values = pd.to_numeric(df_for_chart['Projected'], errors='coerce').fillna(0).tolist()
+            actual_values = pd.to_numeric(df_for_chart['Actual'], errors='coerce').fillna(0).tolist()
             
             # Create a grouped bar chart using plotly
             fig = go.Figure()
@@ -2498,54 +2244,43 @@ def export_weekly_report_pdf(n_clicks, table_data, table_columns, forecast_summa
         print_red(f"Error generating PDF: {str(e)}")
         return dcc.send_string(f"Error generating PDF: {str(e)}", "error.pdf")
 # Fixing syntax and logical errors in the script
-@app.callback(
-    [Output('weekly-report-table', 'data'),
-     Output('weekly-report-table', 'columns'),
-     Output('forecast-summary-table', 'data'),
-     Output('forecast-summary-table', 'columns'),
-     Output('forecast-type-table', 'data'),
-     Output('forecast-type-table', 'columns')],
-    Input('report-week-picker', 'date')
-)
-
-def generate_monthly_report(selected_date):
+# The report also reads the project log on the share, so its mtime is part of the key
+@cached_callback(CALLBACK_RESULTS, current_version, extra_key=lambda: file_stamp(project_log_path))
+def monthly_report_tables(selected_date):
+    """
+    (PagedTable of the month's projects with a TOTAL row, forecast summary data,
+    forecast summary columns, forecast by type data, forecast by type columns)
+    """
     if not selected_date:
-        return [], [], [], [], [], []
+        return PagedTable(pd.DataFrame(), []), [], [], [], []
     
     # Call the function from data_processing
     project_log_path = r"\\192.168.39.20\Confidential\12 Invoicing\Contracted Projects\00_Project Log\2025 Projects Log.xlsx"
     
+    # Totals and ER ratios come from the stored KPI table, as on the project dashboard
     report_data, all_columns = data_processing.generate_monthly_report_data(
         selected_date, 
-        global_projects_df, 
-        global_merged_df, 
-        global_raw_invoices,
-        project_log_path
+        data.global_projects_df, 
+        data.global_merged_df, 
+        data.global_raw_invoices,
+        project_log_path,
+        project_kpis=data.global_project_kpis
     )
     if not report_data:
-        return [], [], [], [], [], []
+        return PagedTable(pd.DataFrame(), []), [], [], [], []
     
-    # Format 'Projected' and 'Actual' in each project row as currency
+    # Money and percentage columns are sent as numbers and formatted by the table
     for row in report_data: # report_data is a list of dicts
-        if 'Projected' in row:
-            try:
-                # Ensure value is float before formatting
-                projected_val = float(row['Projected']) 
-                row['Projected'] = f"${projected_val:,.2f}"
-            except (ValueError, TypeError):
-                # If conversion fails or it's already formatted, keep original or set default
-                if not (isinstance(row['Projected'], str) and '$' in str(row['Projected'])):
-                    row['Projected'] = "$0.00"
-        
-        if 'Actual' in row:
-            try:
-                # Ensure value is float before formatting
-                actual_val = float(row['Actual']) 
-                row['Actual'] = f"${actual_val:,.2f}"
-            except (ValueError, TypeError):
-                # If conversion fails or it's already formatted, keep original or set default
-                if not (isinstance(row['Actual'], str) and '$' in str(row['Actual'])):
-                    row['Actual'] = "$0.00"
+        for col in ('Projected', 'Actual'):
+            value = pd.to_numeric(row.get(col), errors='coerce')
+            # Rounded to cents so the totals add up to the amounts shown
+            row[col] = round(float(value), 2) if pd.notna(value) else 0.0
+        # -1 marks invoices without a contract (shown as N/A)
+        invoiced_percent = row.get('Invoiced %_num')
+        row['Invoiced %'] = round(float(invoiced_percent), 1) if pd.notna(invoiced_percent) and invoiced_percent >= 0 else None
+        # "N/A" display values become None; the rest are the 2-decimal ratios
+        decon_invoiced = pd.to_numeric(row.get('DECON LLC Invoiced'), errors='coerce')
+        row['DECON LLC Invoiced'] = float(decon_invoiced) if pd.notna(decon_invoiced) else None
     
     # Define which columns to display (customize this list as needed)
     visible_columns = [
@@ -2583,36 +2318,30 @@ def generate_monthly_report(selected_date):
             col['name'] = 'Client'
         elif col['id'] == 'DECON LLC Invoiced':
             col['name'] = 'ER DECON LLC'
+    numeric_formats = {
+        'Projected': money_format('N/A'),
+        'Actual': money_format('N/A'),
+        'Invoiced %': percent_format(1, 'N/A'),
+        'DECON LLC Invoiced': number_format(2, 'N/A'),
+    }
+    display_columns = [numeric_column(col['name'], numeric_formats[col['id']], col['id']) if col['id'] in numeric_formats else col
+                       for col in display_columns]
     
     # Create a totals row
     totals_row = {col: '' for col in visible_columns}  # Initialize with empty strings for all columns
     totals_row['Project No'] = 'TOTAL:'
     
-    # Helper function to extract numeric values from formatted strings
-    def extract_numeric(value):
-        if isinstance(value, str):
-            # Remove $, % and commas, then convert to float
-            cleaned = value.replace('$', '').replace(',', '').replace('%', '')
-            try:
-                return float(cleaned)
-            except:
-                return 0
-        # If it's already a number (int or float), return it directly
-        if isinstance(value, (int, float)):
-            return value
-        return 0 # For any other case, return 0
-    
     # Calculate totals for numeric columns
     if report_data:
         # Calculate sum for Projected column
         if 'Projected' in visible_columns:
-            projected_sum = sum(extract_numeric(row.get('Projected', 0)) for row in report_data if 'TOTAL:' not in str(row.get('Project No', '')))
-            totals_row['Projected'] = f"${projected_sum:,.2f}" if projected_sum > 0 else "N/A"
+            projected_sum = sum(row.get('Projected', 0) for row in report_data if 'TOTAL:' not in str(row.get('Project No', '')))
+            totals_row['Projected'] = projected_sum if projected_sum > 0 else None
         
         # Calculate sum for Actual column
         if 'Actual' in visible_columns:
-            actual_sum = sum(extract_numeric(row.get('Actual', 0)) for row in report_data if 'TOTAL:' not in str(row.get('Project No', '')))
-            totals_row['Actual'] = f"${actual_sum:,.2f}" if actual_sum > 0 else "N/A"
+            actual_sum = sum(row.get('Actual', 0) for row in report_data if 'TOTAL:' not in str(row.get('Project No', '')))
+            totals_row['Actual'] = actual_sum if actual_sum > 0 else None
         
     # Append the totals row
     report_data.append(totals_row)
@@ -2636,34 +2365,34 @@ def generate_monthly_report(selected_date):
             forecast_value = month_forecast.iloc[0].get('ForecastValue', 0)
             
             # Get projected and actual totals
-            projected_sum = sum(extract_numeric(row.get('Projected', 0)) for row in report_data if 'TOTAL:' not in str(row.get('Project No', '')))
-            actual_sum = sum(extract_numeric(row.get('Actual', 0)) for row in report_data if 'TOTAL:' not in str(row.get('Project No', '')))
+            projected_sum = sum(row.get('Projected', 0) for row in report_data if 'TOTAL:' not in str(row.get('Project No', '')))
+            actual_sum = sum(row.get('Actual', 0) for row in report_data if 'TOTAL:' not in str(row.get('Project No', '')))
             
             # Calculate percentage of forecast vs actual
             percent_forecast_actual = (actual_sum / forecast_value * 100) if forecast_value > 0 else 0
             
             # Add data row
             forecast_summary_data.append({
-                'ForecastValue': f"${forecast_value:,.2f}" if forecast_value > 0 else "$0.00",
-                'Projected': f"${projected_sum:,.2f}" if projected_sum > 0 else "$0.00",
-                'Actual': f"${actual_sum:,.2f}" if actual_sum > 0 else "$0.00",
-                '%Forecast vs Actual': f"{percent_forecast_actual:.0f}%"
+                'ForecastValue': round(forecast_value, 2) if forecast_value > 0 else 0.0,
+                'Projected': round(projected_sum, 2) if projected_sum > 0 else 0.0,
+                'Actual': round(actual_sum, 2) if actual_sum > 0 else 0.0,
+                '%Forecast vs Actual': round(percent_forecast_actual)
             })
     
     # If no data, add empty row
     if not forecast_summary_data:
         forecast_summary_data.append({
-            'ForecastValue': "$0.00",
-            'Projected': "$0.00",
-            'Actual': "$0.00",
-            '%Forecast vs Actual': "0%"
+            'ForecastValue': 0.0,
+            'Projected': 0.0,
+            'Actual': 0.0,
+            '%Forecast vs Actual': 0.0
         })
     
     forecast_summary_columns = [
-        {'name': 'ForecastValue', 'id': 'ForecastValue'},
-        {'name': 'Projected', 'id': 'Projected'},
-        {'name': 'Actual', 'id': 'Actual'},
-        {'name': '%Forecast vs Actual', 'id': '%Forecast vs Actual'}
+        numeric_column('ForecastValue', money_format()),
+        numeric_column('Projected', money_format()),
+        numeric_column('Actual', money_format()),
+        numeric_column('%Forecast vs Actual', percent_format(0))
     ]
     
     # ------------------- CREATE FORECAST BY TYPE TABLE -------------------
@@ -2678,8 +2407,8 @@ def generate_monthly_report(selected_date):
                 continue
                 
             row_type = row.get('Type', 'Unknown')
-            projected = extract_numeric(row.get('Projected', 0))
-            actual = extract_numeric(row.get('Actual', 0))
+            projected = row.get('Projected', 0)
+            actual = row.get('Actual', 0)
             
             if row_type not in type_groups:
                 type_groups[row_type] = {'Projected': 0, 'Actual': 0}
@@ -2695,9 +2424,9 @@ def generate_monthly_report(selected_date):
             
             forecast_type_data.append({
                 'Type': type_name,
-                'Projected': f"${projected:,.2f}" if projected > 0 else "$0.00",
-                'Actual': f"${actual:,.2f}" if actual > 0 else "$0.00",
-                'Percentage Projected vs Actual': f"{percent:.0f}%"
+                'Projected': round(projected, 2) if projected > 0 else 0.0,
+                'Actual': round(actual, 2) if actual > 0 else 0.0,
+                'Percentage Projected vs Actual': round(percent)
             })
         
         # Sort by type
@@ -2710,30 +2439,63 @@ def generate_monthly_report(selected_date):
         
         forecast_type_data.append({
             'Type': 'TOTAL',
-            'Projected': f"${total_projected:,.2f}" if total_projected > 0 else "$0.00",
-            'Actual': f"${total_actual:,.2f}" if total_actual > 0 else "$0.00",
-            'Percentage Projected vs Actual': f"{total_percent:.0f}%"
+            'Projected': round(total_projected, 2) if total_projected > 0 else 0.0,
+            'Actual': round(total_actual, 2) if total_actual > 0 else 0.0,
+            'Percentage Projected vs Actual': round(total_percent)
         })
     
     # If no data, add empty row with totals
     if not forecast_type_data:
         forecast_type_data = [
-            {'Type': '0-Pay App (LS)', 'Projected': '$0.00', 'Actual': '$0.00', 'Percentage Projected vs Actual': '0%'},
-            {'Type': '1-Pay App (TM)', 'Projected': '$0.00', 'Actual': '$0.00', 'Percentage Projected vs Actual': '0%'},
-            {'Type': '2-Organic', 'Projected': '$0.00', 'Actual': '$0.00', 'Percentage Projected vs Actual': '0%'},
-            {'Type': '3-Large', 'Projected': '$0.00', 'Actual': '$0.00', 'Percentage Projected vs Actual': '0%'},
-            {'Type': 'TOTAL', 'Projected': '$0.00', 'Actual': '$0.00', 'Percentage Projected vs Actual': '0%'}
+            {'Type': '0-Pay App (LS)', 'Projected': 0.0, 'Actual': 0.0, 'Percentage Projected vs Actual': 0.0},
+            {'Type': '1-Pay App (TM)', 'Projected': 0.0, 'Actual': 0.0, 'Percentage Projected vs Actual': 0.0},
+            {'Type': '2-Organic', 'Projected': 0.0, 'Actual': 0.0, 'Percentage Projected vs Actual': 0.0},
+            {'Type': '3-Large', 'Projected': 0.0, 'Actual': 0.0, 'Percentage Projected vs Actual': 0.0},
+            {'Type': 'TOTAL', 'Projected': 0.0, 'Actual': 0.0, 'Percentage Projected vs Actual': 0.0}
         ]
     
     forecast_type_columns = [
         {'name': 'Type', 'id': 'Type'},
-        {'name': 'Projected', 'id': 'Projected'},
-        {'name': 'Actual', 'id': 'Actual'},
-        {'name': 'Percentage Projected vs Actual', 'id': 'Percentage Projected vs Actual'}
+        numeric_column('Projected', money_format()),
+        numeric_column('Actual', money_format()),
+        numeric_column('Percentage Projected vs Actual', percent_format(0))
     ]
     
-    # The data still has all fields, but we're only showing selected columns
-    return report_data, display_columns, forecast_summary_data, forecast_summary_columns, forecast_type_data, forecast_type_columns
+    # The project rows keep the shown columns plus the helper used by the table's conditional styles
+    report_rows = [row for row in report_data if row is not totals_row]
+    fields = [col['id'] for col in display_columns] + [col for col in ['Invoiced %_num'] if col in report_rows[0]]
+    report = PagedTable(pd.DataFrame(report_rows, columns=fields), display_columns, totals=totals_row)
+    return report, forecast_summary_data, forecast_summary_columns, forecast_type_data, forecast_type_columns
+
+
+@app.callback(
+    [Output('weekly-report-table', 'columns'),
+     Output('forecast-summary-table', 'data'),
+     Output('forecast-summary-table', 'columns'),
+     Output('forecast-type-table', 'data'),
+     Output('forecast-type-table', 'columns')],
+    Input('report-week-picker', 'date')
+)
+def generate_monthly_report(selected_date):
+    report, *forecast_tables = monthly_report_tables(selected_date)
+    return (report.columns, *forecast_tables)
+
+
+@app.callback(
+    [Output('weekly-report-table', 'data'),
+     Output('weekly-report-table', 'page_count'),
+     Output('weekly-report-table', 'page_current')],
+    [Input('report-week-picker', 'date'),
+     Input('weekly-report-table', 'page_current'),
+     Input('weekly-report-table', 'page_size'),
+     Input('weekly-report-table', 'sort_by'),
+     Input('weekly-report-table', 'filter_query')]
+)
+def page_weekly_report(selected_date, page_current, page_size, sort_by, filter_query):
+    # A new month starts on the first page
+    page_current, page_reset = start_page(page_current)
+    # Only the requested page of the (sorted / filtered) report is sent
+    return (*monthly_report_tables(selected_date)[0].page(page_current, page_size, sort_by, filter_query), page_reset)
 
 
 def load_forecast_invoicing():
@@ -2762,49 +2524,22 @@ def load_forecast_invoicing():
     [Input('jobcode-dropdown','value'),
      Input('year-dropdown','value')]
 )
+@cached_callback(CALLBACK_RESULTS, current_version)
 def update_time_distribution_pie_chart(selected_project_no, selected_years):
     import plotly.express as px, plotly.graph_objects as go
 
-    # 1) Quick debug
-    print("↪ selected_project_no:", selected_project_no)
-    print("↪ sample Project Nos:", global_merged_df['Project No'].unique()[:5])
-
     if not selected_project_no:
         return go.Figure(layout={'title': "No project selected"})
 
-    # 2) Match project (strip spacing & cast to str)
-    df_filtered = global_merged_df[
-        global_merged_df['Project No'].astype(str).str.strip()
-        == str(selected_project_no).strip()
-    ].copy()
-    print("↪ after Project No filter:", len(df_filtered), "rows")
-
-    if df_filtered.empty:
-        return go.Figure(layout={'title': "No data for selected project"})
-
-    # 3) Ensure datetime
-    df_filtered['local_date'] = pd.to_datetime(df_filtered['local_date'], errors='coerce')
-
-    # 4) Apply year filter
-    if selected_years:
-        yrs = [int(y) for y in selected_years]
-        df_filtered = df_filtered[df_filtered['local_date'].dt.year.isin(yrs)]
-        print("↪ after year filter:", len(df_filtered), "rows")
-    if df_filtered.empty:
-        return go.Figure(layout={'title': "No data for selected years"})
-
-    # 5) Detect employee column robustly
-    candidates = ['Employee', 'Personnel', 'Employee Name', 'full_name', 'fname']
-    employee_col = next((c for c in candidates if c in df_filtered.columns), None)
-    if not employee_col:
-        print("ERROR: no employee column found; available:", df_filtered.columns.tolist())
-        return go.Figure(layout={'title': "No employee data found"})
-
-    # 6) Group and plot
-    df_grouped = df_filtered.groupby(employee_col)['hours'].sum().reset_index()
+    # Query the precomputed (Project No, Employee, year) rollup
+    df_grouped = project_view(selected_project_no, selected_years).employee_totals[['Employee', 'hours']]
+    print("↪ selected_project_no:", selected_project_no, "employees:", len(df_grouped))
+    if df_grouped.empty:
+        return go.Figure(layout={'title': "No data for selected filters"})
     if df_grouped['hours'].sum() == 0:
         return go.Figure(layout={'title': "No hours recorded"})
 
+    employee_col = 'Employee'
     fig = px.pie(df_grouped, names=employee_col, values='hours',
                  title=f"Time Distribution by Employee for {selected_project_no}")
     fig.update_traces(textinfo='none',
@@ -2818,6 +2553,7 @@ def update_time_distribution_pie_chart(selected_project_no, selected_years):
     [Input('jobcode-dropdown', 'value'),
      Input('year-dropdown', 'value')]
 )
+@cached_callback(CALLBACK_RESULTS, current_version)
 def update_cost_distribution_pie_chart(selected_project_no, selected_years):
     import plotly.express as px
     import plotly.graph_objects as go
@@ -2831,39 +2567,17 @@ def update_cost_distribution_pie_chart(selected_project_no, selected_years):
             annotations=[dict(text="Please select a project", x=0.5, y=0.5, showarrow=False)]
         ))
     
-    # Filter dataframe for the selected project
-    df_filtered = global_merged_df[global_merged_df['Project No'] == selected_project_no].copy()
-    print(f"Filtered rows by project: {len(df_filtered)}")
-    
-    # Filter by selected years
-    if selected_years:
-        selected_years_int = [int(y) for y in selected_years]
-        df_filtered = df_filtered[df_filtered['local_date'].dt.year.isin(selected_years_int)]
-        print(f"Filtered rows after year filter: {len(df_filtered)}")
+    # Query the precomputed (Project No, Employee, year) rollup
+    cost_by_user = project_view(selected_project_no, selected_years).employee_totals[['Employee', 'day_cost']]
+    print(f"Employees for project/years: {len(cost_by_user)}")
     
-    if df_filtered.empty:
+    if cost_by_user.empty:
         return go.Figure(layout=dict(
             title="No data for selected filters",
             annotations=[dict(text="No timesheet entries found", x=0.5, y=0.5, showarrow=False)]
         ))
     
-    # Look for employee column
-    employee_col = None
-    for col_name in ['Employee', 'Personel', 'full_name', 'fname']:
-        if col_name in df_filtered.columns and not df_filtered[col_name].isna().all():
-            employee_col = col_name
-            break
-    
-    if employee_col is None:
-        print("DEBUG: No valid employee column found")
-        return go.Figure(layout=dict(
-            title="No employee data found",
-            annotations=[dict(text="Could not identify employee column", x=0.5, y=0.5, showarrow=False)]
-        ))
-    
-    # Group by employee, but make sure day_cost is numeric
-    df_filtered['day_cost'] = pd.to_numeric(df_filtered['day_cost'], errors='coerce')
-    cost_by_user = df_filtered.groupby(employee_col)['day_cost'].sum().reset_index()
+    employee_col = 'Employee'
     
     # Filter out zero or negative costs
     cost_by_user = cost_by_user[cost_by_user['day_cost'] > 0]
@@ -2936,11 +2650,11 @@ def main():
         return
 
 if __name__ == "__main__":
+    # Load the tables in the background right away; the server accepts connections meanwhile (see /ready)
+    data.start_background()
     main()
     #app.run_server(debug=True, host='10.1.2.189', port=8050, use_reloader=False) 
-    # Add this somewhere before the server starts
-    print("First few rows of merged data:")
-    print(global_merged_df[['Project No', 'jobcode_2', 'hours', 'Employee', 'Personel']].head(5))#app.run(debug=True, host='localhost', port=7050, use_reloader=False)  
+    #app.run(debug=True, host='localhost', port=7050, use_reloader=False)  
     app.run(debug=True, host='0.0.0.0', port=7050, use_reloader=False)
 
 # Callback for Time Distribution By Employee Pie Chart
@@ -0,0 +1,94 @@
+# callback_cache.py
+"""
+Bounded LRU cache for callback results.
+
+Results are keyed on the callback's inputs plus the dataset version
+(last_update.txt, see data_access.dataset_version). Revisiting a project or
+client returns the stored result, and a refresh of the store changes the
+version, so stale entries are never served and age out of the LRU.
+"""
+import functools
+import os
+import threading
+from collections import OrderedDict
+
+# Entries kept per cache before the least recently used one is dropped
+CALLBACK_CACHE_SIZE = 256
+
+
+def freeze(value):
+    """Hashable form of a callback argument (dropdown values arrive as lists)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return tuple(sorted(freeze(v) for v in value))
+    return value
+
+
+def file_stamp(path):
+    """mtime_ns of path, or None if it cannot be read (used to key results on source files)."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ResultCache:
+    """Thread-safe LRU map with hit/miss counters."""
+
+    def __init__(self, max_entries=CALLBACK_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+        # Computed outside the lock so slow callbacks do not block each other
+        value = compute()
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+def cached_callback(cache, version, extra_key=None):
+    """
+    Decorator caching a callback's return value in `cache`, keyed on the
+    function name, version() and the call's arguments (plus extra_key() when
+    given, e.g. the mtime of a workbook the callback reads directly).
+    Exceptions such as PreventUpdate are not cached.
+    Apply it below @app.callback so Dash registers the cached function.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, version(), extra_key() if extra_key else None, freeze(args), freeze(kwargs))
+            return cache.get_or_compute(key, lambda: func(*args, **kwargs))
+        return wrapper
+    return decorator
@@ -12,7 +12,7 @@ def run_complete_process():
         
         # Paso 1: Ejecutar main() para cargar todos los datos
         print("Paso 1: Ejecutando main()...")
-        # main() returns: global_merged_df, global_projects_df, global_invoices, global_raw_invoices, last_update, last_data_update
+        # main() returns: global_merged_df, global_projects_df, global_invoices, global_raw_invoices, last_update, last_data_update, global_rate_periods, global_yearly_rollup, global_invoice_ledger
         main_results = main()
         print(f"main() retornó {len(main_results)} elementos")
         
@@ -22,6 +22,7 @@ def run_complete_process():
         global_invoices_summary = main_results[2] 
         global_raw_invoices = main_results[3]
         # main_results[4] is last_update, main_results[5] is last_data_update (not used here)
+        global_invoice_ledger = main_results[8]
         
         print(f"✅ Datos cargados:")
         print(f"  - Merged DF: {len(global_merged_df)} filas")
@@ -37,7 +38,8 @@ def run_complete_process():
         
         # generate_monthly_report_data returns: project_data_list, column_definitions
         generated_project_data, generated_column_info = generate_monthly_report_data(
-            selected_date, global_projects_df, global_merged_df, global_raw_invoices, project_log_path
+            selected_date, global_projects_df, global_merged_df, global_raw_invoices, project_log_path,
+            invoice_ledger=global_invoice_ledger
         )
         
         print(f"✅ Datos generados - Proyectos (filas de datos): {len(generated_project_data)}, Definiciones de columna: {len(generated_column_info)}")
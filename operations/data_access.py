@@ -0,0 +1,307 @@
+# data_access.py
+"""
+Lazy access to the precomputed dashboard tables.
+
+Each table is read from the columnar store (data_store) the first time a
+callback asks for it, so importing app_main is cheap and the server can
+start accepting connections before the data is in memory. DataSource
+watches last_update.txt and swaps in a fresh snapshot after a precompute,
+without restarting the server.
+"""
+import os
+import threading
+import time
+
+import flask
+import numpy as np
+import pandas as pd
+
+from data_store import load_table, stored_table_path
+from utility_funcs import print_green, print_orange, print_red, standardize_project_no, normalize_series
+
+# Tables written by data_processing.precompute_and_save
+DASHBOARD_TABLES = (
+    "global_merged_df",
+    "global_projects_df",
+    "global_invoices",
+    "global_raw_invoices",
+    "global_invoice_ledger",
+    "global_yearly_rollup",
+    "global_project_kpis",
+    "global_client_cube",
+)
+# Written last by precompute_and_save; a change means a new dataset is complete
+VERSION_FILE = "last_update.txt"
+NO_ROWS = np.array([], dtype=int)
+
+
+def dataset_version(output_dir):
+    """Identify the stored dataset by the content and mtime of VERSION_FILE (None if missing)."""
+    path = os.path.join(output_dir, VERSION_FILE)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+        with open(path, "r") as f:
+            text = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return f"{text}@{mtime_ns}"
+
+
+def table_stamp(output_dir, name):
+    """mtime_ns of the stored file of table `name` (None if it has no file)."""
+    path = stored_table_path(name, output_dir)
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+class StaleSnapshotError(RuntimeError):
+    """A snapshot table could not be loaded because a newer refresh has rewritten the store."""
+
+
+class DataSnapshot:
+    """
+    One set of dashboard tables loaded from output_dir on first use.
+
+    Tables are available as attributes (snapshot.global_merged_df, ...).
+    `columns` limits the columns read for a table and `transforms` maps a
+    table name to a function applied once right after it is loaded.
+    `fallbacks` maps a table name to a function building it from the snapshot
+    when the store has no file for it (stores written by an older pipeline).
+
+    The version and the table file stamps are read when the snapshot is
+    created. A table is only loaded while the store still matches them (checked
+    before and after the read), so a snapshot never mixes tables from two
+    refreshes; otherwise the snapshot is marked stale and the load raises
+    StaleSnapshotError until DataSource swaps in the refreshed data.
+    """
+
+    def __init__(self, output_dir, columns=None, transforms=None, fallbacks=None):
+        self.output_dir = output_dir
+        self.columns = columns or {}
+        self.transforms = transforms or {}
+        self.fallbacks = fallbacks or {}
+        self._tables = {}
+        self._locks = {name: threading.Lock() for name in DASHBOARD_TABLES}
+        self._text = {}
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+        self.stale = False
+        # Read the version, the update stamps and the table stamps now so they
+        # describe this snapshot, not a later refresh (re-read if one lands meanwhile)
+        while True:
+            self.version = dataset_version(output_dir)
+            self._text = {}
+            self.read_text("last_update.txt", "Unknown")
+            self.read_text("last_data_update.txt", "Unknown")
+            self._stamps = {name: table_stamp(output_dir, name) for name in DASHBOARD_TABLES}
+            if dataset_version(output_dir) == self.version:
+                break
+
+    def check_current(self, name):
+        """Raise StaleSnapshotError (and mark the snapshot stale) if a refresh rewrote the store or table `name`."""
+        if not self.stale and dataset_version(self.output_dir) == self.version \
+                and table_stamp(self.output_dir, name) == self._stamps[name]:
+            return
+        self.stale = True
+        print_orange(f"{name} was rewritten by a refresh after dataset {self.version} was opened; not loading it")
+        raise StaleSnapshotError(name)
+
+    def get(self, name):
+        """Return table `name`, loading it on first use (one loader per table)."""
+        df = self._tables.get(name)
+        if df is not None:
+            return df
+        with self._locks[name]:
+            df = self._tables.get(name)
+            if df is None:
+                start = time.time()
+                self.check_current(name)
+                try:
+                    df = load_table(name, self.output_dir, columns=self.columns.get(name))
+                except FileNotFoundError:
+                    if name not in self.fallbacks:
+                        raise
+                    print_orange(f"{name} not in store; building it from the other tables")
+                    df = self.fallbacks[name](self)
+                self.check_current(name)
+                if name in self.transforms:
+                    df = self.transforms[name](df)
+                self._tables[name] = df
+                print_green(f"Loaded {name}: {len(df)} rows in {time.time() - start:.2f}s")
+        return df
+
+    def derived(self, name, build):
+        """Return build(self), computed once per snapshot and cached under `name`."""
+        if name not in self._derived:
+            with self._derived_lock:
+                if name not in self._derived:
+                    self._derived[name] = build(self)
+        return self._derived[name]
+
+    def project_rows(self, name, project_no, standardized=False):
+        """
+        Rows of table `name` for one project. The Project No -> row positions
+        index is built once per table, so a lookup only touches that project's
+        rows. With standardized=True both sides go through standardize_project_no.
+        """
+        df = self.get(name)
+
+        def build_index(_):
+            keys = df['Project No'].astype(str).str.strip()
+            if standardized:
+                keys = normalize_series(keys, categorical=False)
+            return df.groupby(keys, observed=True).indices
+
+        positions = self.derived((name, 'project_index', standardized), build_index)
+        key = str(project_no).strip()
+        if standardized:
+            key = standardize_project_no(key)
+        return df.take(positions.get(key, NO_ROWS))
+
+    def date_range(self, name, date_col, start_date=None, end_date=None):
+        """
+        Rows of table `name` with start_date <= date_col <= end_date (the whole
+        table if either bound is missing). The pipeline stores tables sorted by
+        date, so the range is found by binary search and returned as one slice;
+        an unsorted table is sorted once per snapshot first.
+        """
+        df = self.get(name)
+        if not (start_date and end_date):
+            return df
+
+        def sorted_frame(_):
+            dates = df[date_col]
+            n_dated = int(dates.notna().sum())
+            if dates.iloc[:n_dated].is_monotonic_increasing and dates.iloc[n_dated:].isna().all():
+                return df, n_dated
+            print_orange(f"{name} is not stored in {date_col} order; sorting it once")
+            return df.sort_values(date_col, kind='stable', na_position='last'), n_dated
+
+        by_date, n_dated = self.derived((name, 'sorted_by', date_col), sorted_frame)
+        dates = by_date[date_col].to_numpy()[:n_dated]
+        start = np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date)), side='left')
+        end = np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date)), side='right')
+        return by_date.iloc[start:end]
+
+    def __getattr__(self, name):
+        if name in DASHBOARD_TABLES:
+            return self.get(name)
+        raise AttributeError(name)
+
+    def read_text(self, file_name, default):
+        """Read (once) a small text file such as last_update.txt from output_dir."""
+        if file_name not in self._text:
+            try:
+                with open(os.path.join(self.output_dir, file_name), "r") as f:
+                    self._text[file_name] = f.read().strip()
+            except FileNotFoundError:
+                self._text[file_name] = default
+        return self._text[file_name]
+
+    @property
+    def last_update(self):
+        return self.read_text("last_update.txt", "Unknown")
+
+    @property
+    def last_data_update(self):
+        return self.read_text("last_data_update.txt", "Unknown")
+
+    def is_ready(self):
+        """True once every dashboard table is in memory."""
+        return all(name in self._tables for name in DASHBOARD_TABLES)
+
+    def preload(self):
+        for name in DASHBOARD_TABLES:
+            try:
+                self.get(name)
+            except StaleSnapshotError:
+                # The store is being refreshed; the refreshed snapshot is loaded instead
+                return
+            except Exception as e:
+                print_red(f"ERROR: preloading {name} failed: {e}")
+
+    def start_preload(self):
+        """Load all tables in a background thread; returns the thread."""
+        thread = threading.Thread(target=self.preload, name="data-preload", daemon=True)
+        thread.start()
+        return thread
+
+
+class DataSource:
+    """
+    Serves the current DataSnapshot and replaces it when the store is refreshed.
+
+    Attribute access (source.global_merged_df, source.last_update, ...) goes
+    to the current snapshot. Within a Flask request the snapshot is pinned on
+    first use, so a callback that is running during a swap finishes on the
+    snapshot it started with. `on_swap` functions run after each swap, so
+    caches holding the previous snapshot's data can drop it. A snapshot found
+    stale (see DataSnapshot) is replaced as soon as the refresh is complete.
+    """
+
+    def __init__(self, output_dir, columns=None, transforms=None, fallbacks=None, poll_seconds=30, on_swap=()):
+        self.output_dir = output_dir
+        self.columns = columns
+        self.transforms = transforms
+        self.fallbacks = fallbacks
+        self.poll_seconds = poll_seconds
+        self.on_swap = list(on_swap)
+        self._current = DataSnapshot(output_dir, columns, transforms, fallbacks)
+        self._reload_lock = threading.Lock()
+        self._background_lock = threading.Lock()
+        self._background_started = False
+
+    @property
+    def current(self):
+        if self._current.stale:
+            self.reload_if_changed()
+        if flask.has_request_context():
+            if 'data_snapshot' not in flask.g:
+                flask.g.data_snapshot = self._current
+            return flask.g.data_snapshot
+        return self._current
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.current, name)
+
+    def reload_if_changed(self):
+        """Load and swap in a new snapshot if VERSION_FILE changed. Returns True on swap."""
+        with self._reload_lock:
+            version = dataset_version(self.output_dir)
+            if version is None or version == self._current.version:
+                return False
+            print_green(f"Dataset changed ({self._current.version} -> {version}); loading new snapshot")
+            snapshot = DataSnapshot(self.output_dir, self.columns, self.transforms, self.fallbacks)
+            snapshot.preload()
+            self._current = snapshot
+            for hook in self.on_swap:
+                hook()
+            print_green(f"Now serving dataset {snapshot.version}")
+            return True
+
+    def watch(self):
+        while True:
+            time.sleep(self.poll_seconds)
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                print_red(f"ERROR: reloading dataset failed: {e}")
+
+    def start_watcher(self):
+        """Poll for refreshed data in a background thread; returns the thread."""
+        thread = threading.Thread(target=self.watch, name="data-watcher", daemon=True)
+        thread.start()
+        return thread
+
+    def start_background(self):
+        """Start the table preload and the refresh watcher, once per process (later calls do nothing)."""
+        with self._background_lock:
+            if self._background_started:
+                return
+            self._background_started = True
+        self.start_preload()
+        self.start_watcher()
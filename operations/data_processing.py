@@ -4,21 +4,45 @@
 #validated
 ########################################################################
 ##Import libraries and locally defined functions
-from utility_funcs import print_green, print_cyan, print_orange, print_red, print_orange, standardize_project_no, sanitize_filename, extract_project_number
+from utility_funcs import print_green, print_cyan, print_orange, print_red, print_orange, standardize_project_no, normalize_series, sanitize_filename, extract_project_number
 from config import TABLE_STYLE, TABLE_CELL_STYLE, TABLE_CELL_CONDITIONAL, RIGHT_TABLE_RED_STYLE
 ########################################################################
 import os
 import re
+import io
 import base64
 import numpy as np
 import pandas as pd
 import warnings
 from datetime import datetime
 import glob
+import json
+import hashlib
+from data_store import write_table, write_text, replace_atomically
+from callback_cache import ResultCache
 #######################################################################
 #file paths
 project_log_path = r"\\192.168.39.20\Confidential\12 Invoicing\Contracted Projects\00_Project Log\2025 Projects Log.xlsx"
 PICKLE_OUTPUT_DIR = r"C:\Users\jose.pineda\Desktop\smart_decon\operations\pickles"
+# Per-CSV parsed timesheet cache + manifest used by load_timesheet_folder
+TIMESHEET_CACHE_DIR = os.path.join(PICKLE_OUTPUT_DIR, "tsheet_cache")
+TIMESHEET_MANIFEST_FILE = "timesheet_manifest.json"
+# Columns identifying one real timesheet entry across overlapping exports
+TIMESHEET_ENTRY_KEY = ['username', 'local_date', 'jobcode_2', 'local_start_time', 'local_end_time', 'hours']
+
+# Rate column labels built by rates_ingestion, e.g. "2023Whole_Year", "2024JAN", "2024JUL (1-15)"
+RATE_COLUMN_PATTERN = re.compile(
+    r"^(\d{4})(Whole_Year|JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC|JUL \(1-15\)|JUL \(15-31\))$"
+)
+# Start of the period covered by the 2022 whole-year rate (any earlier date falls back to it)
+RATE_FALLBACK_START = pd.Timestamp(1900, 1, 1)
+# Columns of the merged timesheet frame read by the dashboard and reports;
+# rates live in the separate long table built by build_rate_periods
+MERGED_DF_COLUMNS = [
+    'ID#', 'Employee', 'full_name', 'fname', 'lname', 'number', 'correct_number',
+    'Personel', 'staff_type', 'local_date', 'hours',
+    'jobcode_1', 'jobcode_2', 'jobcode_3', 'Service Item',
+]
 
 #######################################################################
 #testing
@@ -26,6 +50,52 @@ PICKLE_OUTPUT_DIR = r"C:\Users\jose.pineda\Desktop\smart_decon\operations\pickle
 # DATA LOADING FUNCTIONS
 # ==============================
 
+# Workbooks kept in memory by open_workbook during a refresh (the rates file and the project log)
+WORKBOOK_CACHE_SIZE = 2
+WORKBOOK_CACHE = ResultCache(WORKBOOK_CACHE_SIZE)
+
+def workbook_stamp(path):
+    """(mtime_ns, size) of a workbook; an edited file gets a new stamp."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def read_workbook(path):
+    """Read an Excel workbook from the network share in one pass and wrap it in a pd.ExcelFile."""
+    with open(path, 'rb') as f:
+        content = io.BytesIO(f.read())
+    workbook = pd.ExcelFile(content, engine='openpyxl')
+    print_green(f"Opened workbook {os.path.basename(path)} ({len(content.getbuffer()) / 1e6:.1f} MB, {len(workbook.sheet_names)} sheets)")
+    return workbook
+
+def open_workbook(path):
+    """
+    pd.ExcelFile of the workbook that every sheet loader of a refresh can parse
+    from (pd.read_excel accepts it in place of the path). Kept per (path, stamp)
+    until release_workbooks(), so the share is read once per refresh.
+    """
+    return WORKBOOK_CACHE.get_or_compute((path, workbook_stamp(path)), lambda: read_workbook(path))
+
+def release_workbooks():
+    """Drop the cached workbooks and their raw bytes once a refresh has parsed every sheet."""
+    WORKBOOK_CACHE.clear()
+
+# Parsed sheets for read_sheet_cached, keyed on (path, workbook stamp, sheet_name, read options);
+# sheets of an edited workbook get new keys and the old ones age out
+SHEET_CACHE_SIZE = 24
+SHEET_CACHE = ResultCache(SHEET_CACHE_SIZE)
+
+def read_sheet_cached(path, sheet_name, **kwargs):
+    """
+    pd.read_excel(path, sheet_name=sheet_name, **kwargs) served from an in-process
+    cache keyed on the workbook's stamp (see workbook_stamp), so an edited
+    workbook is read again. Only the parsed sheet is kept, not the workbook.
+    Returns a copy, so callers may modify it.
+    """
+    cache_key = (path, workbook_stamp(path), sheet_name, repr(sorted(kwargs.items())))
+    sheet = SHEET_CACHE.get_or_compute(
+        cache_key, lambda: pd.read_excel(read_workbook(path), sheet_name=sheet_name, **kwargs))
+    return sheet.copy()
+
 def load_rates_from_single_sheet(file_path):
     print_green("Inside load_rates_from_single_sheet")
     df_rates = pd.read_excel(file_path, sheet_name='Rates', header=None)
@@ -69,7 +139,7 @@ def load_third_file_dynamic(third_file):
         first_col = df_data.columns[0]
         df_data.rename(columns={first_col: "Project No"}, inplace=True)
 
-    df_data["Project No"] = df_data["Project No"].astype(str).str.strip().apply(standardize_project_no)
+    df_data["Project No"] = normalize_series(df_data["Project No"].astype(str), categorical=False)
 
     # Ensure the 'Month' column exists or derive it if possible
     if 'Month' not in df_data.columns:
@@ -89,24 +159,170 @@ def load_third_file_dynamic(third_file):
 
     return df_data.reset_index(drop=True)
 
-def load_timesheet_folder(folder_path):
+def file_content_hash(file_path, chunk_size=1 << 20):
+    """Return the SHA-1 hex digest of a file, read in chunks so large exports stay cheap."""
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_timesheet_manifest(cache_dir):
+    """
+    Load the timesheet manifest (one entry per CSV: path, size, mtime, sha1, rows, cache_file).
+    Returns an empty manifest if the file is missing or unreadable.
+    """
+    manifest_path = os.path.join(cache_dir, TIMESHEET_MANIFEST_FILE)
+    try:
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print_red(f"Timesheet manifest unreadable, rebuilding cache: {str(e)}")
+        return {}
+
+def save_timesheet_manifest(cache_dir, manifest):
+    """Write the timesheet manifest atomically (temp file + rename)."""
+    manifest_path = os.path.join(cache_dir, TIMESHEET_MANIFEST_FILE)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def read_timesheet_csv(file_path):
+    """Parse one timesheet export, renaming 'service item' -> 'Service Item' if present."""
+    df_temp = pd.read_csv(file_path, header=0, index_col=0)
+
+    # rename if you see "service item"
+    if 'service item' in df_temp.columns:
+        df_temp.rename(columns={'service item': 'Service Item'}, inplace=True)
+    return df_temp
+
+def load_cached_timesheet(file_path, manifest, cache_dir):
+    """
+    Return the parsed DataFrame for one timesheet CSV, using the per-file cache when possible.
+    - Same size and mtime as the manifest entry: load the cached frame without touching the CSV.
+    - Size or mtime changed: hash the CSV; if the content is unchanged, reuse the cache.
+    - Otherwise (new or edited export): parse the CSV and refresh the cache + manifest entry.
+    Returns (df, parsed) where parsed is True if the CSV had to be read.
+    """
+    filename = os.path.basename(file_path)
+    stat = os.stat(file_path)
+    entry = manifest.get(filename)
+    digest = None
+
+    if entry:
+        cache_path = os.path.join(cache_dir, entry['cache_file'])
+        if os.path.exists(cache_path):
+            if entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+                return pd.read_pickle(cache_path), False
+            digest = file_content_hash(file_path)
+            if digest == entry['sha1']:
+                entry['size'] = stat.st_size
+                entry['mtime'] = stat.st_mtime
+                return pd.read_pickle(cache_path), False
+
+    df_temp = read_timesheet_csv(file_path)
+    if digest is None:
+        digest = file_content_hash(file_path)
+
+    cache_file = os.path.splitext(filename)[0] + ".pkl"
+    df_temp.to_pickle(os.path.join(cache_dir, cache_file))
+    manifest[filename] = {
+        'path': file_path,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'sha1': digest,
+        'rows': len(df_temp),
+        'cache_file': cache_file,
+    }
+    return df_temp, True
+
+def timesheet_entry_keys(df):
+    """
+    Hash each timesheet row on TIMESHEET_ENTRY_KEY into a uint64 array.
+    'username' is read from the index when the CSV was loaded with index_col=0.
+    Raises ValueError if a key column is missing, instead of hashing it as NaN
+    (which would make distinct entries look like duplicates).
+    """
+    key_frame = df.reset_index()
+    missing = [col for col in TIMESHEET_ENTRY_KEY if col not in key_frame.columns]
+    if missing:
+        print_red(f"ERROR: timesheet export is missing key column(s) {missing}")
+        raise ValueError(f"Timesheet export is missing key column(s): {', '.join(missing)}")
+    return pd.util.hash_pandas_object(key_frame[TIMESHEET_ENTRY_KEY], index=False).to_numpy()
+
+def reconcile_timesheet_exports(exports):
+    """
+    Reconcile overlapping cumulative exports (e.g. 2025-06-01_thru_06-04 / 06-11 / 06-18).
+    exports: list of (df, start_date, end_date) tuples, in any order.
+    Exports are streamed from the newest report_end_date to the oldest:
+    - rows dated inside a range already covered by a newer export are dropped
+      (the newer export is the current version of those days);
+    - rows whose entry key was already kept from a newer export are dropped,
+      using a hash index of the keys instead of sorting the rows.
+    Returns the reconciled frames in the original order, plus the number of rows dropped.
+    """
+    order = sorted(range(len(exports)), key=lambda i: exports[i][2] or datetime.min, reverse=True)
+    seen_keys = set()
+    covered_ranges = []
+    reconciled = [None] * len(exports)
+    dropped = 0
+
+    for i in order:
+        df, start_date, end_date = exports[i]
+        keep = np.ones(len(df), dtype=bool)
+
+        if covered_ranges and 'local_date' in df.columns:
+            dates = pd.to_datetime(df['local_date'], errors='coerce')
+            for covered_start, covered_end in covered_ranges:
+                keep &= ~((dates >= covered_start) & (dates <= covered_end)).to_numpy()
+
+        keys = timesheet_entry_keys(df)
+        if seen_keys:
+            keep &= ~pd.Index(keys).isin(seen_keys)
+
+        dropped += int((~keep).sum())
+        kept_df = df[keep] if not keep.all() else df
+        seen_keys.update(keys[keep].tolist())
+        if start_date is not None and end_date is not None:
+            covered_ranges.append((start_date, end_date))
+        reconciled[i] = kept_df
+
+    return reconciled, dropped
+
+def load_timesheet_folder(folder_path, cache_dir=None):
     """
     Loads CSV files matching 'timesheet_report_*.csv' and merges them.
     Also renames 'service item' -> 'Service Item' if present.
+    Only new or changed files are parsed; the rest come from the per-file cache
+    tracked by the manifest in cache_dir (defaults to TIMESHEET_CACHE_DIR).
+    Overlapping exports are reconciled so each entry appears once (see reconcile_timesheet_exports).
     Returns the merged dataframe and the most recent date from filenames.
     """
     pattern = os.path.join(folder_path, "timesheet_report_*.csv")
-    csv_files = glob.glob(pattern)
+    csv_files = sorted(glob.glob(pattern))
     if not csv_files:
         print_red(f"No timesheet files found in {folder_path}")
         return pd.DataFrame(), None
 
-    df_list = []
-    last_end_date = None
+    if cache_dir is None:
+        cache_dir = TIMESHEET_CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = load_timesheet_manifest(cache_dir)
+
+    exports = []
+    parsed_files = 0
     most_recent_date=None
     for file_path in csv_files:
         filename = os.path.basename(file_path)
         match = re.search(r'thru_(\d{4}-\d{2}-\d{2})\.csv$', filename)
+        start_match = re.search(r'timesheet_report_(\d{4}-\d{2}-\d{2})_thru_', filename)
+        try:
+            start_date = datetime.strptime(start_match.group(1), "%Y-%m-%d") if start_match else None
+        except ValueError:
+            start_date = None
         if match:
             end_date_str = match.group(1)
             try:
@@ -119,15 +335,27 @@ def load_timesheet_folder(folder_path):
         else:
             end_date = None
 
-        df_temp = pd.read_csv(file_path, header=0, index_col=0)
-
-        # rename if you see "service item"
-        if 'service item' in df_temp.columns:
-            df_temp.rename(columns={'service item': 'Service Item'}, inplace=True)
+        df_temp, parsed = load_cached_timesheet(file_path, manifest, cache_dir)
+        parsed_files += int(parsed)
 
         df_temp["report_end_date"] = end_date
-        df_list.append(df_temp)
-        #last_end_date = end_date
+        exports.append((df_temp, start_date, end_date))
+
+    # Drop manifest entries (and cached frames) for exports that were removed from the folder
+    current_files = {os.path.basename(p) for p in csv_files}
+    for filename in [f for f in manifest if f not in current_files]:
+        stale = manifest.pop(filename)
+        try:
+            os.remove(os.path.join(cache_dir, stale['cache_file']))
+        except OSError:
+            pass
+    save_timesheet_manifest(cache_dir, manifest)
+    print_green(f"Timesheets: parsed {parsed_files} new/changed file(s), reused {len(csv_files) - parsed_files} cached file(s)")
+
+    # Overlapping cumulative exports: keep one row per real entry (newest export wins)
+    df_list, dropped_rows = reconcile_timesheet_exports(exports)
+    if dropped_rows:
+        print_orange(f"Timesheets: dropped {dropped_rows} row(s) superseded by newer overlapping exports")
 
     df_merged = pd.concat(df_list, ignore_index=True)
     
@@ -163,7 +391,7 @@ def get_project_log_data(years=[2023, 2024, 2025]):
             sheet_name = f"5_Invoice-{year}"
             
             print_green(f"Attempting to load project log from: {project_log_path}, sheet: {sheet_name}")
-            df_projects = pd.read_excel(project_log_path, sheet_name=sheet_name, engine='openpyxl', dtype={'Project No': str, 'Project No.': str})
+            df_projects = pd.read_excel(open_workbook(project_log_path), sheet_name=sheet_name, engine='openpyxl', dtype={'Project No': str, 'Project No.': str})
             print_green(f"Successfully loaded sheet {sheet_name} with {len(df_projects)} rows")
             
             # Add a Year column to identify the source
@@ -188,7 +416,7 @@ def get_project_log_data(years=[2023, 2024, 2025]):
             
             # Check if Project No column exists, standardize if it does
             if 'Project No' in df_projects.columns:
-                df_projects["Project No"] = df_projects["Project No"].astype(str).str.strip().apply(standardize_project_no)
+                df_projects["Project No"] = normalize_series(df_projects["Project No"].astype(str), categorical=False)
             
             # Add to the combined DataFrame
             combined_df = pd.concat([combined_df, df_projects], ignore_index=True)
@@ -214,7 +442,7 @@ def import_forecast_invoicing():
     try:
         # Read the '6_Summary Invoice' sheet
         df_forecast = pd.read_excel(
-            project_log_path, 
+            open_workbook(project_log_path),
             sheet_name='6_Summary Invoice',
             header=None,  # No header so we can explicitly find it
             engine='openpyxl'
@@ -346,165 +574,250 @@ def import_forecast_invoicing():
 # ==============================
 # DATA PROCESSING FUNCTIONS     
 # ==============================
-def calculate_new_er(df_project, project_no, df_merged_costs):
-    # First check if there are any staff_type=1 entries (US employees) for this project
-    # If there are no US employees, return None (which will display as N/A)
-    project_costs = df_merged_costs[df_merged_costs['jobcode_2'].notna() & 
-                                  df_merged_costs['jobcode_2'].str.startswith(project_no)]
-    
-    # Check if we have any US employees (staff_type=1) with hours
-    type_1_entries = project_costs[project_costs['staff_type'] == 1]
-    if type_1_entries.empty or type_1_entries['day_cost'].sum() == 0:
-        return None  # No US employees, so return None which will show as N/A
-    
-    # Check if the project has 0% invoiced
-    project_row = df_project[df_project['Project No'] == project_no]
-    if not project_row.empty:
-        # Try to extract invoiced percentage
-        if 'Invoiced %' in project_row.columns:
-            try:
-                invoiced_pct = project_row['Invoiced %'].iloc[0]
-                # Handle string percentage values (with % symbol)
-                if isinstance(invoiced_pct, str) and '%' in invoiced_pct:
-                    invoiced_pct = float(invoiced_pct.replace('%', '').strip())
-                # If invoice percentage is 0%, return 0 for ER DECON LLC
-                if invoiced_pct == 0:
-                    return 0
-            except:
-                pass  # Continue with normal calculation if there's an error
-    
-    # Check if staff_type exists first
-    if 'staff_type' not in df_merged_costs.columns:
-        print_orange("DEBUG: 'staff_type' column not found in data")
-        print(f"Available columns: {df_merged_costs.columns.tolist()}")
-        return None
-    
-    if project_row.empty or 'Contracted Amount' not in project_row.columns:
-        print("DEBUG: No project found or missing Contracted Amount column")
-        return None
-    
-    contracted_amount = project_row['Contracted Amount'].iloc[0]
-    # Parse contracted amount if it's a string
-    if isinstance(contracted_amount, str):
+# staff_type -> label used for the per-staff-type KPI columns
+STAFF_TYPE_LABELS = {1: 'DECON LLC', 2: 'DECON Col'}
+
+
+def parse_money(value):
+    """'$1,234.50' / 1234.5 -> 1234.5; unparseable or missing -> NaN."""
+    if isinstance(value, str):
         try:
-            contracted_amount = float(contracted_amount.replace('$', '').replace(',', ''))
-        except:
-            print(f"DEBUG: Could not parse contracted amount: {contracted_amount}")
-            return None
-    
-    if pd.isna(contracted_amount):
-        print("DEBUG: Contracted Amount is NaN")
-        return None
-    
-    # Sum costs by staff type (1 and 2)
-    type_1_cost = project_costs[project_costs['staff_type'] == 1]['day_cost'].sum()
-    type_2_cost = project_costs[project_costs['staff_type'] == 2]['day_cost'].sum()
-    
-    if type_1_cost == 0:
-        return None  # Can't calculate ratio with zero type_1_cost
-    
-    new_er = (contracted_amount - type_2_cost) / type_1_cost
-    return new_er
+            return float(value.replace('$', '').replace(',', ''))
+        except ValueError:
+            return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
 
 
-def calculate_decon_llc_invoiced(df_project, project_no, df_merged_costs, df_raw_invoices):
+def parse_money_series(values):
+    """Vectorized parse_money: '$1,234.50' / 1234.5 -> 1234.5 (float64); unparseable or missing -> NaN."""
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype('float64')
+    text = values.astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False).str.strip()
+    return pd.to_numeric(text, errors='coerce').where(values.notna()).astype('float64')
+
+
+# Money columns parsed to float64 when a sheet is loaded (accumulative columns are matched by name)
+MONEY_COLUMNS = ['Actual', 'Contracted Amount', 'Projected']
+
+
+def is_money_column(column, columns=MONEY_COLUMNS):
+    name = str(column).lower()
+    return column in columns or 'acum' in name or 'accum' in name
+
+
+def coerce_money_columns(df, columns=MONEY_COLUMNS):
     """
-    Calculate the DECON LLC Invoiced ratio: (Invoiced Amount - Type 2 Cost) / Type 1 Cost
-    
-    Args:
-        df_project: DataFrame containing project information
-        project_no: Project number to calculate for
-        df_merged_costs: DataFrame containing timesheet and rate information
-        df_raw_invoices: DataFrame containing invoice information
-        
-    Returns:
-        float: DECON LLC Invoiced value or None if can't be calculated
+    Parse df's money columns (see is_money_column) to float64 in place, once at
+    ingestion, so later code never re-parses '$1,234.50' strings. Missing or
+    unparseable cells become NaN. Returns df.
     """
-    # Debug for specific projects with issues
-    debug_project = (project_no == "2051.00")
-    
-    if debug_project:
-        print_orange(f"DEBUG {project_no}: Starting calculation for DECON LLC Invoiced")
-    
-    # First check if there are any staff_type=1 entries (US employees) for this project
-    # If there are no US employees, return None (which will display as N/A)
-    project_costs = df_merged_costs[df_merged_costs['jobcode_2'].notna() & 
-                                  df_merged_costs['jobcode_2'].str.startswith(project_no)]
-    
-    # Check if we have any US employees (staff_type=1) with hours
-    type_1_entries = project_costs[project_costs['staff_type'] == 1]
-    if type_1_entries.empty or type_1_entries['day_cost'].sum() == 0:
-        if debug_project:
-            print_orange(f"DEBUG {project_no}: No US employees (staff_type=1) found or zero cost, returning None")
-        return None
-    
-    # Check if staff_type exists
-    if 'staff_type' not in df_merged_costs.columns:
-        print_orange(f"DEBUG {project_no}: 'staff_type' column not found in data")
-        return None
-    
-    # First, check if the project has 0% invoiced
-    project_row = df_project[df_project['Project No'] == project_no]
-    if not project_row.empty:
-        # Try to extract invoiced percentage
-        if 'Invoiced %' in project_row.columns:
-            try:
-                invoiced_pct = project_row['Invoiced %'].iloc[0]
-                # Handle string percentage values (with % symbol)
-                if isinstance(invoiced_pct, str) and '%' in invoiced_pct:
-                    invoiced_pct = float(invoiced_pct.replace('%', '').strip())
-                # If invoice percentage is 0%, return 0
-                if invoiced_pct == 0:
-                    if debug_project:
-                        print_orange(f"DEBUG {project_no}: 0% invoiced project, returning 0")
-                    return 0
-                # Debug for 100% invoiced projects
-                if invoiced_pct == 100 and debug_project:
-                    print_orange(f"DEBUG {project_no}: Found 100% invoiced project")
-            except Exception as e:
-                if debug_project:
-                    print_orange(f"DEBUG {project_no}: Error extracting invoiced %: {str(e)}")
-      # Get the total invoiced amount for this project
-    invoiced_amount = None
-    project_invoices = df_raw_invoices[df_raw_invoices['Project No'].apply(
-        lambda x: standardize_project_no(str(x)) == project_no
-    )].copy()
-    
-    if not project_invoices.empty:
-        # Convert 'Actual' column to numeric before summing
-        project_invoices['Actual'] = pd.to_numeric(project_invoices['Actual'], errors='coerce')
-        invoiced_amount = project_invoices['Actual'].sum()
-        
-        if debug_project:
-            print_orange(f"DEBUG {project_no}: Found {len(project_invoices)} invoices with total amount: {invoiced_amount}")
+    for column in [c for c in df.columns if is_money_column(c, columns)]:
+        df[column] = parse_money_series(df[column])
+    return df
+
+
+def is_zero_invoiced(value):
+    """True when a project-log 'Invoiced %' value (0, 0.0, '0%', '0.0 %') means nothing invoiced."""
+    try:
+        if isinstance(value, str) and '%' in value:
+            value = float(value.replace('%', '').strip())
+        return bool(value == 0)
+    except Exception:
+        return False
+
+
+def format_er_display(values, has_worked_hours, invoiced_percent_num):
+    """
+    Display strings for ER DECON LLC / DECON LLC Invoiced:
+    "N/A" without worked hours, the value with 2 decimals when it exists,
+    "N/A" for fully invoiced projects (never 0.00), otherwise "0.00".
+    """
+    formatted = values.map(lambda v: f"{v:.2f}" if pd.notna(v) else None)
+    return pd.Series(np.select(
+        [~has_worked_hours, values.notna(), invoiced_percent_num >= 99.9],
+        ["N/A", formatted, "N/A"],
+        default="0.00"
+    ), index=values.index)
+
+
+def compute_er_table(projects, costs, invoices=None, ledger=None):
+    """
+    Every ER ratio for every project in one pass, indexed by standardized Project No
+    (project log projects plus any project that only appears in the invoices).
+
+    projects: project log rows ('Project No', 'Contracted Amount', optional 'Invoiced %')
+    costs: timesheet rows with jobcode_2, staff_type, day_cost, hours (and 'Project No')
+    invoices: raw invoice rows ('Project No', 'Actual', optional 'Invoice No' / 'Invoice Date')
+    ledger: build_invoice_ledger(invoices), built here when not given
+
+    Columns:
+      Contracted Amount, Total Cost, Total Hours, DECON LLC / DECON Col Cost and
+      Hours (by staff_type), Invoiced Amount (ledger total, NaN without invoices),
+      Total Invoice (same, 0 without invoices), Remaining to Invoice, Type1 Cost,
+      Type2 Cost (jobcode_2 prefix match), Invoiced %, Invoiced %_num, has_worked_hours,
+      ER Contract, ER Invoiced, ER DECON LLC, DECON LLC Invoiced (NaN when not
+      computable) and their "... Display" strings.
+    """
+    has_invoices = invoices is not None and not invoices.empty
+    keys = normalize_series(projects['Project No'].astype(str), categorical=False)
+    first = ~keys.duplicated()
+    project_log = projects[first].set_index(keys[first])
+    # Projects that only appear in the invoices still get a DECON LLC Invoiced value
+    index = pd.Index(keys[first].values, name='Project No')
+    if has_invoices:
+        invoice_keys = normalize_series(invoices['Project No'].astype(str), categorical=False)
+        index = index.append(pd.Index(invoice_keys.unique()).difference(index)).rename('Project No')
+    table = pd.DataFrame(index=index)
+
+    table['Contracted Amount'] = (parse_money_series(project_log['Contracted Amount']).reindex(index).values
+                                  if 'Contracted Amount' in projects.columns else np.nan)
+    table['Zero Invoiced'] = (project_log['Invoiced %'].map(is_zero_invoiced).reindex(index, fill_value=False).values
+                              if 'Invoiced %' in projects.columns else False)
+
+    # Totals by the timesheet's own Project No, standardized after grouping (few distinct values)
+    cost_project_no = costs['Project No'] if 'Project No' in costs.columns else derive_project_no(costs)
+    def by_project(frame):
+        return frame.groupby(normalize_series(frame.index.get_level_values(0).astype(str), categorical=False).values).sum()
+    totals = by_project(costs.groupby(cost_project_no, observed=True)[['day_cost', 'hours']].sum())
+    table['Total Cost'] = totals['day_cost'].reindex(table.index).fillna(0).values
+    table['Total Hours'] = totals['hours'].reindex(table.index).fillna(0).values
+    table['has_worked_hours'] = table['Total Hours'] > 0
+    # Same totals split by staff type (1 = DECON LLC / US, 2 = DECON Colombia)
+    by_staff_type = (by_project(costs.groupby([cost_project_no, 'staff_type'], observed=True)[['day_cost', 'hours']].sum()
+                                .unstack('staff_type'))
+                     .reindex(columns=pd.MultiIndex.from_product([['day_cost', 'hours'], list(STAFF_TYPE_LABELS)]))
+                     .reindex(table.index).fillna(0))
+    for staff_type, label in STAFF_TYPE_LABELS.items():
+        table[f'{label} Cost'] = by_staff_type[('day_cost', staff_type)].values
+        table[f'{label} Hours'] = by_staff_type[('hours', staff_type)].values
+
+    # Type 1 / type 2 cost of rows whose jobcode_2 starts with the project number.
+    # Costs are summed per distinct jobcode first, so the prefix match runs on a few thousand labels.
+    by_jobcode = (costs[costs['jobcode_2'].notna()]
+                  .groupby(['jobcode_2', 'staff_type'], observed=True)['day_cost'].sum()
+                  .reset_index())
+    by_jobcode['jobcode_2'] = by_jobcode['jobcode_2'].astype(str)
+    type_costs = pd.DataFrame(0.0, index=table.index, columns=[1, 2])
+    for length in table.index.str.len().unique():
+        prefix_costs = (by_jobcode.groupby([by_jobcode['jobcode_2'].str[:length], 'staff_type'])['day_cost']
+                        .sum().unstack().reindex(columns=[1, 2]))
+        rows = table.index[table.index.str.len() == length]
+        type_costs.loc[rows] = prefix_costs.reindex(rows).fillna(0).values
+    table['Type1 Cost'] = type_costs[1].values
+    table['Type2 Cost'] = type_costs[2].values
+
+    # Invoice totals by standardized Project No, from the deduplicated ledger
+    if has_invoices:
+        if ledger is None:
+            ledger = build_invoice_ledger(invoices)
+        table['Invoiced Amount'] = ledger_totals(ledger).reindex(table.index).values
+        table['Total Invoice'] = table['Invoiced Amount'].fillna(0)
     else:
-        if debug_project:
-            print_orange(f"DEBUG {project_no}: No invoices found in df_raw_invoices")
-    
-    if pd.isna(invoiced_amount) or invoiced_amount == 0:
-        if debug_project:
-            print_orange(f"DEBUG {project_no}: No invoices found or zero amount")
-        return None
-    
-    # Sum costs by staff type (1 and 2)
-    type_1_cost = project_costs[project_costs['staff_type'] == 1]['day_cost'].sum()
-    type_2_cost = project_costs[project_costs['staff_type'] == 2]['day_cost'].sum()
-    
-    if debug_project:
-        print_orange(f"DEBUG {project_no}: type_1_cost = {type_1_cost}, type_2_cost = {type_2_cost}")
-    
-    if type_1_cost == 0:
-        if debug_project:
-            print_orange(f"DEBUG {project_no}: type_1_cost is zero, calculation not possible")
+        table['Invoiced Amount'] = np.nan
+        table['Total Invoice'] = 0.0
+
+    contracted = table['Contracted Amount']
+    table['Remaining to Invoice'] = contracted - table['Invoiced Amount'].fillna(0)
+    total_cost = table['Total Cost']
+    total_invoice = table['Total Invoice']
+    type_1_cost = table['Type1 Cost']
+    type_2_cost = table['Type2 Cost']
+
+    table['ER Contract'] = (contracted / total_cost).where((total_cost > 0) & (contracted != 0))
+    table['ER Invoiced'] = (total_invoice / total_cost).where((total_cost > 0) & (total_invoice != 0))
+
+    # Invoiced % = Total Invoice / Contracted Amount; -1 marks invoices without a contract
+    has_contract = contracted > 0
+    table['Invoiced %_num'] = np.select(
+        [has_contract & (total_invoice >= 0), has_contract, total_invoice > 0],
+        [total_invoice / contracted * 100, 0, -1],
+        default=0
+    )
+    table['Invoiced %'] = np.where(
+        has_contract & (total_invoice >= 0), table['Invoiced %_num'].map(lambda p: f"{p:.1f}%"),
+        np.where(~has_contract & (total_invoice > 0), "N/A", "0.0%")
+    )
+
+    # DECON LLC ratios exclude Colombian staff (type 2) from the denominator:
+    # no US (type 1) cost -> NaN, 0% invoiced in the project log -> 0
+    has_us_cost = type_1_cost != 0
+    invoiced_amount = table['Invoiced Amount'].where(table['Invoiced Amount'] != 0)
+    table['ER DECON LLC'] = ((contracted - type_2_cost) / type_1_cost).mask(table['Zero Invoiced'], 0).where(has_us_cost)
+    table['DECON LLC Invoiced'] = ((invoiced_amount - type_2_cost) / type_1_cost).mask(table['Zero Invoiced'], 0).where(has_us_cost)
+
+    for col in ['ER DECON LLC', 'DECON LLC Invoiced']:
+        table[f'{col} Display'] = format_er_display(table[col], table['has_worked_hours'], table['Invoiced %_num'])
+
+    print_green(f"Computed ER table for {len(table)} projects")
+    return table
+
+
+# Numeric columns added by client_project_totals
+CLIENT_TOTAL_COLUMNS = ['InvoiceNum', 'CostNum', 'HoursNum',
+                        'Type1CostNum', 'Type2CostNum', 'Type1HoursNum', 'Type2HoursNum']
+
+
+def client_project_totals(projects, costs, invoices, client):
+    """
+    The client's projects (standardized Project No) with invoice, cost and hours
+    totals over the given timesheet rows and invoice ledger rows (see
+    build_invoice_ledger; both already limited to the selected date range),
+    used by the client summary tab and its exports.
+
+    Timesheet totals come from one groupby on (Project No, staff_type); the
+    all-staff and per-staff-type columns are all read off that result.
+    InvoiceNum / CostNum / HoursNum are NaN for projects without rows; the
+    staff-type columns are 0.
+    """
+    client_projects = projects[projects['Clients'].str.strip().str.lower() == client.lower()].copy()
+    client_projects['Project No'] = normalize_series(client_projects['Project No'].astype(str), categorical=False)
+
+    def by_project(frame):
+        return frame.groupby(normalize_series(frame.index.astype(str), categorical=False).values).sum()
+
+    grouped = costs.groupby(['Project No', 'staff_type'], observed=True, dropna=False)[['day_cost', 'hours']].sum()
+    totals = (grouped.groupby(level='Project No', observed=True).sum()
+              .rename(columns={'day_cost': 'CostNum', 'hours': 'HoursNum'}))
+    by_staff_type = (grouped.unstack('staff_type')
+                     .reindex(columns=pd.MultiIndex.from_product([['day_cost', 'hours'], list(STAFF_TYPE_LABELS)]))
+                     .reindex(totals.index).fillna(0))
+    for staff_type in STAFF_TYPE_LABELS:
+        totals[f'Type{staff_type}CostNum'] = by_staff_type[('day_cost', staff_type)]
+        totals[f'Type{staff_type}HoursNum'] = by_staff_type[('hours', staff_type)]
+    totals = by_project(totals)
+    invoice_totals = by_project(invoices.groupby('Project No', observed=True)['Actual'].sum())
+
+    detail = client_projects.reset_index(drop=True)
+    detail['InvoiceNum'] = detail['Project No'].map(invoice_totals)
+    for column in totals.columns:
+        detail[column] = detail['Project No'].map(totals[column])
+    staff_columns = [c for c in CLIENT_TOTAL_COLUMNS if c.startswith('Type')]
+    detail[staff_columns] = detail[staff_columns].fillna(0)
+    return detail
+
+
+def er_value(er_table, project_no, column):
+    """One value from compute_er_table as a float, or None if missing."""
+    if project_no not in er_table.index:
         return None
-    
-    # Calculate DECON LLC Invoiced
-    decon_llc_invoiced = (invoiced_amount - type_2_cost) / type_1_cost
-    
-    if debug_project:
-        print_orange(f"DEBUG {project_no}: Final calculation: ({invoiced_amount} - {type_2_cost}) / {type_1_cost} = {decon_llc_invoiced}")
-    
-    return decon_llc_invoiced
+    value = er_table.at[project_no, column]
+    return None if pd.isna(value) else float(value)
+
+
+def calculate_new_er(df_project, project_no, df_merged_costs):
+    """ER DECON LLC for one project: (Contracted Amount - Type 2 Cost) / Type 1 Cost, or None."""
+    projects = df_project[df_project['Project No'] == project_no]
+    return er_value(compute_er_table(projects, df_merged_costs), project_no, 'ER DECON LLC')
+
+
+def calculate_decon_llc_invoiced(df_project, project_no, df_merged_costs, df_raw_invoices):
+    """DECON LLC Invoiced for one project: (Invoiced Amount - Type 2 Cost) / Type 1 Cost, or None."""
+    projects = df_project[df_project['Project No'] == project_no]
+    return er_value(compute_er_table(projects, df_merged_costs, df_raw_invoices), project_no, 'DECON LLC Invoiced')
 
 ######################################################
 
@@ -516,10 +829,15 @@ def calculate_decon_llc_invoiced(df_project, project_no, df_merged_costs, df_raw
 
 
 
-def generate_monthly_report_data(selected_date, global_projects_df, global_merged_df, global_raw_invoices, project_log_path):
+def generate_monthly_report_data(selected_date, global_projects_df, global_merged_df, global_raw_invoices, project_log_path,
+                                 project_kpis=None, invoice_ledger=None):
     """
     Generate monthly report data based on the selected date.
     Returns report data and columns for displaying the monthly project report.
+
+    project_kpis: the stored per-project KPI table (compute_er_table output, indexed
+    by Project No) the dashboard reads its totals and ER ratios from; computed here
+    when not given, from invoice_ledger (build_invoice_ledger) if that is given.
     """
     if not selected_date:
         return [], []
@@ -542,8 +860,8 @@ def generate_monthly_report_data(selected_date, global_projects_df, global_merge
     sheet_name = f"5_Invoice-{selected_year}"
 
     try:
-        # Read the selected sheet from the project log
-        df_sheet = pd.read_excel(project_log_path, sheet_name=sheet_name, dtype={'Project No': str, 'Project No.': str})
+        # Read the selected sheet from the project log (parsed once per workbook version)
+        df_sheet = read_sheet_cached(project_log_path, sheet_name, dtype={'Project No': str, 'Project No.': str})
         print_green(f"Successfully loaded sheet {sheet_name} from project log")
         print_green(f"Sheet columns: {df_sheet.columns.tolist()}")
 
@@ -559,6 +877,8 @@ def generate_monthly_report_data(selected_date, global_projects_df, global_merge
 
         # Filter rows where Month column matches the selected month
         df_month = df_sheet[pd.to_numeric(df_sheet['Month'], errors='coerce') == selected_month].copy()
+        # Projected / Actual / accumulative amounts as float64 (NaN when missing)
+        coerce_money_columns(df_month, ['Projected', 'Actual'])
         print_green(f"Found {len(df_month)} projects for month {selected_month} in year {selected_year}")
 
         # Validate the DataFrame before processing
@@ -584,6 +904,16 @@ def generate_monthly_report_data(selected_date, global_projects_df, global_merge
         projects_in_month = df_month[project_column].dropna().unique().tolist()
         projects_in_month = [standardize_project_no(str(p)) for p in projects_in_month if str(p).strip().upper() != 'TOTAL']
 
+        # Group the sheet and project log once by project; every total and ER ratio
+        # comes from the per-project KPI table, so the loop below only does lookups
+        no_rows = np.array([], dtype=int)
+        project_positions = global_projects_df.groupby(
+            normalize_series(global_projects_df['Project No'].astype(str), categorical=False)).indices
+        month_positions = df_month.groupby(
+            normalize_series(df_month[project_column].astype(str), categorical=False)).indices
+        er_table = (project_kpis if project_kpis is not None
+                    else compute_er_table(global_projects_df, global_merged_df, global_raw_invoices, invoice_ledger))
+
         # Now build the report with these projects
         active_project_details = []
 
@@ -593,83 +923,29 @@ def generate_monthly_report_data(selected_date, global_projects_df, global_merge
                 continue
 
             # Find this project in the projects dataframe
-            project_df = global_projects_df[global_projects_df['Project No'].apply(
-                lambda x: standardize_project_no(str(x)) == project_no
-            )]
+            project_df = global_projects_df.iloc[project_positions.get(project_no, no_rows)]
 
             if project_df.empty:
                 print_red(f"Project {project_no} not found in projects database!")
                 continue
 
-            project_row = project_df.iloc[0]            # Get all invoices for this project (for ER calculation)
-            project_invoices = global_raw_invoices[global_raw_invoices['Project No'].apply(
-                lambda x: standardize_project_no(str(x)) == project_no
-            )]
-
-            if not project_invoices.empty:
-                # First, ensure 'Actual' column is numeric
-                project_invoices['Actual'] = project_invoices['Actual'].apply(
-                    lambda x: float(str(x).replace('$', '').replace(',', '')) 
-                    if pd.notnull(x) else 0
-                )
-                
-                # Sort by date to get latest versions
-                if 'Invoice Date' in project_invoices.columns:
-                    project_invoices = project_invoices.sort_values('Invoice Date', ascending=True)
-                
-                # Check if we have an invoice number column to identify unique invoices
-                if 'Invoice No' in project_invoices.columns:
-                    # Group by invoice number and take the latest version of each invoice
-                    latest_invoices = project_invoices.groupby('Invoice No', as_index=False).last()
-                    print(f"DEBUG: Using {len(latest_invoices)} unique invoices after removing duplicates")
-                    total_invoice = latest_invoices['Actual'].sum()
-                else:
-                    # If no invoice number, use all entries (original behavior)
-                    total_invoice = project_invoices['Actual'].sum()
-            else:
-                total_invoice = 0
-            
-            
-            # Before filtering
-            print(f"DEBUG: For Project {project_no} - Looking for matching invoices in {len(global_raw_invoices)} records")
-            print(f"DEBUG: First 3 invoice Project No values: {global_raw_invoices['Project No'].head(3).tolist()}")
-            print(f"DEBUG: First 3 standardized values: {global_raw_invoices['Project No'].head(3).apply(lambda x: standardize_project_no(str(x))).tolist()}")
-            print(f"DEBUG: Project No we're looking for: {project_no}")
-
-            # After filtering
-            print(f"DEBUG: Found {len(project_invoices)} invoices for project {project_no}")
-            if not project_invoices.empty:
-                print(f"DEBUG: Invoice amounts: {project_invoices['Actual'].tolist()}")
-                print(f"DEBUG: Total invoice: {project_invoices['Actual'].sum()}")
-            else:
-                print(f"DEBUG: No invoices found for project {project_no}")
-            
-            
-            
-            # Get total cost from timesheet data
-            #project_costs = global_merged_df[global_merged_df['Project No'] == project_no]
-            project_costs = global_merged_df[
-            global_merged_df['jobcode_2'].apply(extract_project_number) == project_no]
-            total_cost = project_costs['day_cost'].sum() if not project_costs.empty else 0
-
-            # Parse contracted amount
-            contracted_amount = project_row.get('Contracted Amount', None)
-            if isinstance(contracted_amount, str):
-                try:
-                    contracted_amount = float(contracted_amount.replace('$', '').replace(',', ''))
-                except:
-                    contracted_amount = None
+            project_row = project_df.iloc[0]
+            er_row = er_table.loc[project_no]
 
-            # Calculate ER values
-            er_contract = contracted_amount / total_cost if total_cost > 0 and contracted_amount else None
-            er_invoiced = total_invoice / total_cost if total_cost > 0 and total_invoice else None
+            total_invoice = er_row['Total Invoice']
+            total_cost = er_row['Total Cost']
+            has_worked_hours = er_row['has_worked_hours']
+            print(f"DEBUG: Project {project_no} - total invoice {total_invoice}, total cost {total_cost}")
 
-            # Calculate ER DECON LLC (excluding Colombian staff)
-            new_er = calculate_new_er(global_projects_df, project_no, global_merged_df)
-            
-            # Calculate DECON LLC Invoiced (excluding Colombian staff for invoiced amount)
-            decon_llc_invoiced = calculate_decon_llc_invoiced(global_projects_df, project_no, global_merged_df, global_raw_invoices)
+            # Contracted amount, parsed once for all projects by parse_money_series in the ER table
+            contracted_amount = er_value(er_table, project_no, 'Contracted Amount')
 
+            # ER values (NaN in the table -> None in the record)
+            er_contract = er_value(er_table, project_no, 'ER Contract')
+            er_invoiced = er_value(er_table, project_no, 'ER Invoiced')
+            # ER DECON LLC and DECON LLC Invoiced exclude Colombian staff
+            new_er = er_value(er_table, project_no, 'ER DECON LLC')
+            decon_llc_invoiced = er_value(er_table, project_no, 'DECON LLC Invoiced')
 
             def extract_number_part(value):
                 """Extract just the number prefix from strings like '1-Something', '2-Other', etc."""
@@ -685,9 +961,7 @@ def generate_monthly_report_data(selected_date, global_projects_df, global_merge
             
             
             # Get Projected, Actual, and Acummulative from the sheet for this project
-            project_month_data = df_month[df_month[project_column].apply(
-                lambda x: standardize_project_no(str(x)) == project_no
-            )].copy()
+            project_month_data = df_month.iloc[month_positions.get(project_no, no_rows)].copy()
             
             # Extract Projected, Actual, and Acummulative values
             projected_value = None
@@ -695,23 +969,11 @@ def generate_monthly_report_data(selected_date, global_projects_df, global_merge
             acummulative_value = None
             
             if not project_month_data.empty:
+                first_value = lambda column: None if pd.isna(project_month_data[column].iloc[0]) else float(project_month_data[column].iloc[0])
                 if 'Projected' in project_month_data.columns:
-                    projected_value = project_month_data['Projected'].iloc[0]
-                    if isinstance(projected_value, str):
-                        projected_value = projected_value.replace('$', '').replace(',', '')
-                    try:
-                        projected_value = float(projected_value) if pd.notnull(projected_value) else None
-                    except:
-                        projected_value = None
-                
+                    projected_value = first_value('Projected')
                 if 'Actual' in project_month_data.columns:
-                    actual_value = project_month_data['Actual'].iloc[0]
-                    if isinstance(actual_value, str):
-                        actual_value = actual_value.replace('$', '').replace(',', '')
-                    try:
-                        actual_value = float(actual_value) if pd.notnull(actual_value) else None
-                    except:
-                        actual_value = None
+                    actual_value = first_value('Actual')
                 
                 # Handle different spellings of "Acummulative"/"Accumulative"
                 acum_col = None
@@ -721,29 +983,11 @@ def generate_monthly_report_data(selected_date, global_projects_df, global_merge
                         break
                 
                 if acum_col:
-                    acummulative_value = project_month_data[acum_col].iloc[0]
-                    if isinstance(acummulative_value, str):
-                        acummulative_value = acummulative_value.replace('$', '').replace(',', '')
-                    try:
-                        acummulative_value = float(acummulative_value) if pd.notnull(acummulative_value) else None
-                    except:
-                        acummulative_value = None
+                    acummulative_value = first_value(acum_col)
             
-            # Calculate Invoiced Percentage (total_invoice / contracted_amount)
-            if contracted_amount is not None and contracted_amount > 0:
-                if total_invoice is not None and total_invoice >= 0:
-                    invoiced_percent_num = (total_invoice / contracted_amount) * 100
-                    invoiced_percent = f"{invoiced_percent_num:.1f}%"
-                else: # No invoice info
-                    invoiced_percent_num = 0
-                    invoiced_percent = "0.0%"
-            else: # No contracted amount
-                if total_invoice is not None and total_invoice > 0:
-                    invoiced_percent_num = -1  # Sentinel for N/A
-                    invoiced_percent = "N/A"
-                else: # No invoice and no contract
-                    invoiced_percent_num = 0
-                    invoiced_percent = "0.0%"
+            # Invoiced Percentage (total_invoice / contracted_amount), -1 = N/A sentinel
+            invoiced_percent = er_row['Invoiced %']
+            invoiced_percent_num = er_row['Invoiced %_num']
 
 
             # En data_processing.py, líneas ~740 (ANTES de crear project_record):
@@ -779,44 +1023,10 @@ def generate_monthly_report_data(selected_date, global_projects_df, global_merge
                 'DECON LLC Invoiced': decon_llc_invoiced if decon_llc_invoiced is not None else None,
             }
 
-            # Check if there are worked hours for this project for ER DECON LLC display
-            has_worked_hours = not project_costs.empty and project_costs['hours'].sum() > 0
-            
-            # For ER DECON LLC:
-            # - Display "N/A" for projects with no worked hours
-            # - Display actual value if calculated
-            # - Only display "0.00" for projects with worked hours but zero calculated value
-            if not has_worked_hours:
-                project_record['ER DECON LLC'] = "N/A"
-            else:
-                # If we have a valid value, use it
-                if new_er is not None:
-                    project_record['ER DECON LLC'] = f"{new_er:.2f}"
-                # Special handling for 100% invoiced projects - should never show 0.00
-                elif invoiced_percent_num is not None and invoiced_percent_num >= 99.9:  # Use 99.9% to handle floating point issues
-                    # For 100% invoiced projects, show N/A if we can't calculate a proper value
-                    project_record['ER DECON LLC'] = "N/A"
-                else:
-                    # For all other cases with worked hours but no calculated value
-                    project_record['ER DECON LLC'] = "0.00"
-
-            # For DECON LLC Invoiced - similar logic as above:
-            # - Display "N/A" for projects with no worked hours
-            # - Display actual value if calculated
-            # - Only display "0.00" for projects with worked hours but zero calculated value
-            if not has_worked_hours:
-                project_record['DECON LLC Invoiced'] = "N/A"
-            else:
-                # If we have a valid value, use it
-                if decon_llc_invoiced is not None:
-                    project_record['DECON LLC Invoiced'] = f"{decon_llc_invoiced:.2f}"
-                # Special handling for 100% invoiced projects - should never show 0.00
-                elif invoiced_percent_num is not None and invoiced_percent_num >= 99.9:  # Use 99.9% to handle floating point issues
-                    # For 100% invoiced projects, show N/A if we can't calculate a proper value
-                    project_record['DECON LLC Invoiced'] = "N/A"
-                else:
-                    # For all other cases with worked hours but no calculated value
-                    project_record['DECON LLC Invoiced'] = "0.00"
+            # ER DECON LLC / DECON LLC Invoiced display: "N/A" without worked hours,
+            # the value when calculated, "N/A" for 100% invoiced projects, otherwise "0.00"
+            project_record['ER DECON LLC'] = er_row['ER DECON LLC Display']
+            project_record['DECON LLC Invoiced'] = er_row['DECON LLC Invoiced Display']
 
             active_project_details.append(project_record)
 
@@ -865,7 +1075,7 @@ def handle_duplicate_projects(df_projects):
     print_green("Checking for duplicate project numbers...")
     
     # Standardize Project No before checking for duplicates
-    df_projects['Project No'] = df_projects['Project No'].astype(str).str.strip().apply(standardize_project_no)
+    df_projects['Project No'] = normalize_series(df_projects['Project No'].astype(str), categorical=False)
     
     # Find project numbers that are duplicated
     duplicated_project_nos = df_projects[df_projects.duplicated(subset=['Project No'], keep=False)]['Project No'].unique()
@@ -1031,11 +1241,11 @@ def calculate_invoiced_percentage(actual_value, contracted_amount):
     Returns:
         tuple: (formatted_percentage_string, numeric_percentage_for_filtering)
     """
-    # Convert values to float if they're strings
+    # Convert values to float if they're strings (amounts loaded by main() already are)
     if isinstance(actual_value, str):
-        actual_value = float(actual_value.replace('$', '').replace(',', ''))
+        actual_value = parse_money(actual_value)
     if isinstance(contracted_amount, str):
-        contracted_amount = float(contracted_amount.replace('$', '').replace(',', ''))
+        contracted_amount = parse_money(contracted_amount)
         
     # Calculate percentage if we have valid inputs
     if contracted_amount is not None and contracted_amount > 0 and actual_value is not None and actual_value > 0:
@@ -1049,61 +1259,111 @@ def calculate_invoiced_percentage(actual_value, contracted_amount):
         return "0.0%", 0
 
 
-def calculate_day_cost(merged_df):
+def build_rate_periods(df_actual_rates):
     """
-    Example day_cost logic:
-    - If year == 2023, we might have a single "2023WHOLE_Year" column in df_actual_rates
-    - If month == 7, we might have partial July columns (like "2024JUL (1-15)" / "2024JUL (15-31)")
-    - Otherwise, for e.g. 2022, we might have "2022JAN", "2022FEB", etc.
+    Melt the wide rates sheet into a long table with one row per employee and
+    rate period: ID#, period_label, period_start, period_end (inclusive), rate.
+
+    The periods reproduce the sheet's rules:
+    - any date before 2022 and 2022 outside July use "2022Whole_Year"
+    - July (2022 and 2024+) is split into "JUL (1-15)" and "JUL (15-31)"
+    - 2023 uses "2023Whole_Year"
+    - 2024+ uses the monthly columns, e.g. "2024JAN"
+    Columns that none of these rules would read are ignored.
+    """
+    periods = []
+    for col in df_actual_rates.columns:
+        match = RATE_COLUMN_PATTERN.match(str(col))
+        if not match:
+            continue
+        year, period = int(match.group(1)), match.group(2)
+
+        if period == "Whole_Year":
+            if year == 2022:
+                periods.append((col, RATE_FALLBACK_START, pd.Timestamp(2022, 6, 30)))
+                periods.append((col, pd.Timestamp(2022, 8, 1), pd.Timestamp(2022, 12, 31)))
+            elif year == 2023:
+                periods.append((col, pd.Timestamp(2023, 1, 1), pd.Timestamp(2023, 12, 31)))
+        elif period.startswith("JUL "):
+            if year == 2022 or year >= 2024:
+                if period == "JUL (1-15)":
+                    periods.append((col, pd.Timestamp(year, 7, 1), pd.Timestamp(year, 7, 15)))
+                else:
+                    periods.append((col, pd.Timestamp(year, 7, 16), pd.Timestamp(year, 7, 31)))
+        elif year >= 2024 and period != "JUL":
+            start = pd.Timestamp(f"{year}-{period}-01")
+            periods.append((col, start, start + pd.offsets.MonthEnd(0)))
+
+    df_periods = pd.DataFrame(periods, columns=['period_label', 'period_start', 'period_end'])
+    if df_periods.empty:
+        return pd.DataFrame(columns=['ID#', 'period_label', 'period_start', 'period_end', 'rate'])
+
+    rate_cols = list(dict.fromkeys(df_periods['period_label']))
+    df_rates = df_actual_rates.loc[:, ~df_actual_rates.columns.duplicated()]
+    long_rates = df_rates[['ID#'] + rate_cols].melt(
+        id_vars='ID#', var_name='period_label', value_name='rate'
+    )
+    long_rates['rate'] = pd.to_numeric(long_rates['rate'], errors='coerce')
+
+    rate_periods = long_rates.merge(df_periods, on='period_label', how='inner')
+    # One rate per employee and period; a repeated ID# keeps its first rates row
+    rate_periods = (
+        rate_periods.drop_duplicates(subset=['ID#', 'period_start'], keep='first')
+        .sort_values('period_start', kind='stable')
+        .reset_index(drop=True)
+    )[['ID#', 'period_label', 'period_start', 'period_end', 'rate']]
+
+    print_green(f"Built rate periods: {len(rate_periods)} rows for "
+                f"{rate_periods['ID#'].nunique()} employees, {len(df_periods)} periods")
+    return rate_periods
+
+
+def calculate_day_cost(merged_df, rate_periods):
+    """
+    Assign day_cost = rate * hours, looking up each row's rate in the long
+    rate_periods table (see build_rate_periods) by ID# and local_date.
+    Rows with no date or no matching rate period cost 0. Rows whose ID# is
+    not in the rates sheet get NaN inside the rate periods, as with the
+    row-wise lookup, and their ID#s are logged.
     """
     merged_df['local_date'] = pd.to_datetime(merged_df['local_date'], errors='coerce')
 
-    def row_day_cost(row):
-        dt = row['local_date']
-        if pd.isnull(dt):
-            return 0
-
-        year = dt.year
-        month = dt.month
-        day   = dt.day
-
-        # 1) Fallback for any date before 2022
-        if year < 2022:
-            col_name = "2022Whole_Year"
-            return row.get(col_name, 0) * row['hours']
-
-        # 2) If year == 2022, do partial July if you have those columns, otherwise do 2022Whole_Year
-        if year == 2022:
-            if month == 7:
-                # Only if you truly have "2022JUL (1-15)" in your columns
-                if day <= 15:
-                    col_name = "2022JUL (1-15)"
-                else:
-                    col_name = "2022JUL (15-31)"
-            else:
-                col_name = "2022Whole_Year"
-            return row.get(col_name, 0) * row['hours']
-
-        # 3) If year == 2023, assume a single "2023Whole_Year" column
-        if year == 2023:
-            col_name = "2023Whole_Year"
-            return row.get(col_name, 0) * row['hours']
-
-        # 4) If year >= 2024, use monthly columns + partial July
-        if month == 7:
-            # partial July columns: "2024JUL (1-15)", "2024JUL (15-31)", etc.
-            if day <= 15:
-                col_name = f"{year}JUL (1-15)"
-            else:
-                col_name = f"{year}JUL (15-31)"
-        else:
-            # e.g. "2024JAN", "2024FEB", ...
-            col_name = f"{year}{dt.strftime('%b').upper()}"
+    lookup = pd.DataFrame({
+        'ID#': merged_df['ID#'].to_numpy(),
+        'local_date': merged_df['local_date'].dt.normalize().to_numpy(),
+        'row_pos': np.arange(len(merged_df)),
+    })
+    lookup = lookup.dropna(subset=['local_date']).sort_values('local_date', kind='stable')
+
+    periods = rate_periods[['ID#', 'period_start', 'period_end', 'rate']].astype(
+        {'ID#': lookup['ID#'].dtype}
+    ).sort_values('period_start', kind='stable')
 
-        return row.get(col_name, 0) * row['hours']
+    matched = pd.merge_asof(
+        lookup, periods,
+        left_on='local_date', right_on='period_start',
+        by='ID#', direction='backward'
+    )
+    in_period = (matched['local_date'] <= matched['period_end']).to_numpy()
+
+    rates = np.zeros(len(merged_df))
+    rates[matched['row_pos'].to_numpy()[in_period]] = matched['rate'].to_numpy()[in_period]
 
+    # ID#s missing from the rates sheet have no rate for any period: NaN
+    no_rates = lookup[~lookup['ID#'].isin(periods['ID#'])]
+    if not no_rates.empty:
+        any_period = pd.merge_asof(
+            no_rates, periods[['period_start', 'period_end']].drop_duplicates(),
+            left_on='local_date', right_on='period_start', direction='backward'
+        )
+        dated = (any_period['local_date'] <= any_period['period_end']).to_numpy()
+        rates[any_period['row_pos'].to_numpy()[dated]] = np.nan
+        print_orange(f"calculate_day_cost: no rates for ID# "
+                     f"{', '.join(map(str, pd.unique(no_rates['ID#'])))}; "
+                     f"day_cost is NaN for their {dated.sum()} row(s) in a rate period")
 
-    merged_df['day_cost'] = merged_df.apply(row_day_cost, axis=1)
+    merged_df['day_cost'] = rates * merged_df['hours']
+    merged_df.loc[merged_df['local_date'].isna(), 'day_cost'] = 0
 
     print_green("After calculate_day_cost, check a few rows with hours > 0:")
     has_hours = merged_df[merged_df['hours'] > 0].head(15)
@@ -1119,25 +1379,96 @@ def calculate_day_cost(merged_df):
     return merged_df
 
 
-def assign_total_hours(merged_df):
-    for year in range(2017, 2026):
-        col_name = f"total_hours_{year}"
-        merged_df[col_name] = merged_df['hours'].where(merged_df['local_date'].dt.year == year)
+def sort_by_date(df, date_col):
+    """Parse date_col and return df sorted by it (stable, missing dates last, fresh index)."""
+    df = df.copy()
+    df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+    return df.sort_values(date_col, kind='stable', na_position='last').reset_index(drop=True)
 
-    print_green("After assign_total_hours, sample rows for total_hours columns:")
-    print_cyan(str(merged_df[[f"total_hours_{y}" for y in range(2017,2026)]].head(10)))
-    return merged_df
 
+def derive_project_no(merged_df):
+    """
+    Vectorized Project No for timesheet rows: first 7 characters of jobcode_2,
+    or of jobcode_3 when jobcode_2 starts with '1928'.
+    """
+    jc2 = merged_df['jobcode_2'].astype(str).str.strip()
+    jc3 = merged_df['jobcode_3'].astype(str).str.strip()
+    return jc2.str[:7].str.strip().where(~jc2.str.startswith('1928'), jc3.str[:7].str.strip())
 
-# ==============================
-# PROJECTS FILE & BACKUP
-# ==============================
 
+def build_yearly_rollup(merged_df):
+    """
+    Aggregate hours and day_cost per (Project No, Employee, year).
+    Built once per refresh; callbacks query it instead of the row-level frame.
+    """
+    df = pd.DataFrame({
+        'Project No': merged_df['Project No'] if 'Project No' in merged_df.columns else derive_project_no(merged_df),
+        'Employee': merged_df['Employee'],
+        'year': pd.to_datetime(merged_df['local_date'], errors='coerce').dt.year.astype('Int64'),
+        'hours': merged_df['hours'],
+        'day_cost': merged_df['day_cost'],
+    })
+    rollup = df.groupby(['Project No', 'Employee', 'year'], as_index=False, dropna=False)[['hours', 'day_cost']].sum()
 
+    print_green(f"Built yearly rollup: {len(rollup)} rows, years {sorted(rollup['year'].dropna().unique().tolist())}")
+    return rollup
 
-# ==============================
-# TIMESHEET FILE LOADING
-# ==============================
+
+def build_invoice_ledger(raw_invoices):
+    """
+    Deduplicated invoice ledger: the latest version (by Invoice Date) of each
+    (Project No, Invoice No), with Actual parsed to float (missing -> 0) and a
+    running 'Cumulative Invoiced' total per project. Indexed by (standardized
+    Project No, Invoice Date), in date order within each project.
+    Every invoice total (ER table, project tables, client summary) reads it.
+    """
+    ledger = raw_invoices.copy()
+    ledger['Project No'] = normalize_series(ledger['Project No'].astype(str), categorical=False)
+    actual = ledger['Actual']
+    ledger['Actual'] = parse_money_series(actual).where(actual.notna(), 0)
+    if 'Invoice Date' in ledger.columns:
+        ledger['Invoice Date'] = pd.to_datetime(ledger['Invoice Date'], errors='coerce')
+        ledger = ledger.sort_values('Invoice Date', kind='stable')
+    else:
+        ledger['Invoice Date'] = pd.NaT
+    if 'Invoice No' in ledger.columns:
+        # Later versions of an invoice number replace the earlier ones
+        ledger = ledger.groupby(['Project No', 'Invoice No'], sort=False).last().reset_index()
+    ledger = ledger.sort_values(['Project No', 'Invoice Date'], kind='stable')
+    ledger['Cumulative Invoiced'] = ledger.groupby('Project No')['Actual'].cumsum()
+
+    print_green(f"Built invoice ledger: {len(ledger)} invoices (from {len(raw_invoices)} rows)")
+    return ledger.set_index(['Project No', 'Invoice Date'])
+
+
+def ledger_totals(ledger):
+    """Invoiced total per standardized Project No: the last Cumulative Invoiced of each project."""
+    project_no = ledger.index.get_level_values('Project No') if 'Project No' in ledger.index.names else ledger['Project No']
+    return ledger['Cumulative Invoiced'].groupby(np.asarray(project_no)).last()
+
+
+def build_client_cube(merged_df, df_projects):
+    """
+    Aggregate hours and day_cost per (Clients, year, month, staff_type).
+    Timesheet rows are matched to a client through the project log's Project No;
+    rows without a client keep a missing Clients value so the cube totals match
+    the timesheet. Client-level charts read this instead of the row-level frame.
+    """
+    project_clients = df_projects.drop_duplicates('Project No').set_index('Project No')['Clients']
+    project_no = merged_df['Project No'] if 'Project No' in merged_df.columns else derive_project_no(merged_df)
+    dates = pd.to_datetime(merged_df['local_date'], errors='coerce')
+    df = pd.DataFrame({
+        'Clients': project_no.astype(str).map(project_clients),
+        'year': dates.dt.year.astype('Int64'),
+        'month': dates.dt.month.astype('Int64'),
+        'staff_type': merged_df['staff_type'],
+        'hours': merged_df['hours'],
+        'day_cost': merged_df['day_cost'],
+    })
+    cube = df.groupby(['Clients', 'year', 'month', 'staff_type'], as_index=False, dropna=False)[['hours', 'day_cost']].sum()
+
+    print_green(f"Built client cube: {len(cube)} rows, {cube['Clients'].nunique()} clients")
+    return cube
 
 
 def truncate_at_total(df):
@@ -1169,7 +1500,9 @@ def main():
     """
     # 1) Load rates
     rates_file_path = r"\\192.168.39.20\Confidential\12 Invoicing\Contracted Projects\00_Project Log\RATES.xlsx"
-    df_trm_vals, df_actual_rates, loaded_c, loaded_rates = load_rates_from_single_sheet(rates_file_path)
+    # Each workbook is read from the share once; its sheets are parsed from memory
+    rates_workbook = open_workbook(rates_file_path)
+    df_trm_vals, df_actual_rates, loaded_c, loaded_rates = load_rates_from_single_sheet(rates_workbook)
 
     
     # 2) Replace '*' with unique int IDs
@@ -1182,6 +1515,8 @@ def main():
     print_orange(f"DEBUG: # of '*' before assignment: {(df_actual_rates['ID#'] == '*').sum()}")
     print_green(f"DEBUG: Unique IDs in df_actual_rates now: {df_actual_rates['ID#'].unique()}")
 
+    rate_periods = build_rate_periods(df_actual_rates)
+
     # 3) Build a mapping from Employee -> ID#
     mapping = df_actual_rates.set_index('Employee')['ID#'].to_dict()
     print_orange(f"DEBUG: # of '*' after assignment: {(df_actual_rates['ID#'] == '*').sum()}")
@@ -1190,7 +1525,7 @@ def main():
     ###sub
     ###load decon llc or decon colombia
         
-    df_sub_col = pd.read_excel(rates_file_path, sheet_name='STAFF', header=0, nrows=100)
+    df_sub_col = pd.read_excel(rates_workbook, sheet_name='STAFF', header=0, nrows=100)
 
 
 
@@ -1207,7 +1542,7 @@ def main():
     if df_new.empty:
         print_red("ERROR: No timesheet data found. Please check the folder path:")
         print_red(timesheet_folder)
-        return None, None, None, None, pd.to_datetime('today').strftime('%Y-%m-%d')
+        return None, None, None, None, pd.to_datetime('today').strftime('%Y-%m-%d'), "Unknown", None, None, None
     
     # Check if required columns exist
     required_columns = ['number', 'fname', 'lname']
@@ -1215,7 +1550,7 @@ def main():
     if missing_columns:
         print_red(f"ERROR: Required columns {missing_columns} not found in timesheet data")
         print_cyan(f"Available columns: {df_new.columns.tolist()}")
-        return None, None, None, None, pd.to_datetime('today').strftime('%Y-%m-%d')
+        return None, None, None, None, pd.to_datetime('today').strftime('%Y-%m-%d'), "Unknown", None, None, None
         
     # Convert 'number' to numeric
     df_new['number'] = pd.to_numeric(df_new['number'], errors='coerce').fillna(0).astype(int)
@@ -1247,9 +1582,9 @@ def main():
 
     print_green("DEBUG: Head of df_new after filling zero IDs:\n" + str(df_new.head(10)))
 
-    # 5) Merge timesheet + rates => merged_df
+    # 5) Merge timesheet + employee IDs => merged_df (rates stay in rate_periods)
     merged_df = pd.merge(
-        df_actual_rates, df_new,
+        df_actual_rates[['ID#', 'Employee']], df_new,
         left_on='ID#', right_on='correct_number',
         how='inner'
     )
@@ -1260,6 +1595,9 @@ def main():
         left_on='full_name', right_on='Personel',
         how='left'
     )
+    merged_df = merged_df[[col for col in MERGED_DF_COLUMNS if col in merged_df.columns]]
+    # Canonical Project No (1928 jobcodes map to jobcode_3), used by the dashboard and reports
+    merged_df['Project No'] = derive_project_no(merged_df)
     
     print_green("DEBUG: Merged df shape -> " + str(merged_df.shape))
     print_green("DEBUG: Sample rows from merged_df:\n" + str(merged_df.head(10)))
@@ -1267,40 +1605,23 @@ def main():
 
     # 6) Load Project data
     project_log_path = r"\\192.168.39.20\Confidential\12 Invoicing\Contracted Projects\00_Project Log\2025 Projects Log.xlsx"
-    df_projects = load_third_file_dynamic(project_log_path)
+    project_log = open_workbook(project_log_path)
+    df_projects = load_third_file_dynamic(project_log)
+    # Contracted Amount -> float64 before duplicates are merged (their amounts are summed)
+    coerce_money_columns(df_projects, ['Contracted Amount'])
     df_projects = handle_duplicate_projects(df_projects)
 
     # 7) Load Invoices data
-    df_invoices_2022 = pd.read_excel(project_log_path, sheet_name='5_Invoice-2022', header=0, dtype={'Actual': str, 'Project No': str})
-    df_invoices_2022['Actual'] = (
-        df_invoices_2022['Actual'].astype(str)
-        .str.replace('$','', regex=False)
-        .str.replace(',','', regex=False)
-    )
-    
-
-    
-    
-    df_invoices_2022['Actual'] = pd.to_numeric(df_invoices_2022['Actual'], errors='coerce')
+    df_invoices_2022 = pd.read_excel(project_log, sheet_name='5_Invoice-2022', header=0, dtype={'Actual': str, 'Project No': str})
     df_invoices_2022['Invoice_Year'] = 2022  # Add explicit year column based on sheet name
 
-    df_invoices_2023 = pd.read_excel(project_log_path, sheet_name='5_Invoice-2023', header=0, dtype={'Actual': str, 'Project No': str})
-    df_invoices_2023['Actual'] = (
-        df_invoices_2023['Actual'].astype(str)
-        .str.replace('$','', regex=False)
-        .str.replace(',','', regex=False)
-    )
-    
-
-    
-    
-    df_invoices_2023['Actual'] = pd.to_numeric(df_invoices_2023['Actual'], errors='coerce')
+    df_invoices_2023 = pd.read_excel(project_log, sheet_name='5_Invoice-2023', header=0, dtype={'Actual': str, 'Project No': str})
     df_invoices_2023['Invoice_Year'] = 2023  # Add explicit year column based on sheet name
 
-    df_invoices_2024 = pd.read_excel(project_log_path, sheet_name='5_Invoice-2024', header=0, dtype={'Project No': str}).copy()
+    df_invoices_2024 = pd.read_excel(project_log, sheet_name='5_Invoice-2024', header=0, dtype={'Project No': str}).copy()
     df_invoices_2024['Invoice_Year'] = 2024  # Add explicit year column based on sheet name
 
-    df_invoices_2025 = pd.read_excel(project_log_path, sheet_name='5_Invoice-2025', header=0, dtype={'Project No': str}).copy()
+    df_invoices_2025 = pd.read_excel(project_log, sheet_name='5_Invoice-2025', header=0, dtype={'Project No': str}).copy()
     df_invoices_2025['Invoice_Year'] = 2025  # Add explicit year column based on sheet name
 
     # Possibly truncate each at 'TOTAL'
@@ -1314,13 +1635,8 @@ def main():
     for df in [df_invoices_2022, df_invoices_2023, df_invoices_2024, df_invoices_2025]:
         if 'Project No' in df.columns:
             df['Project No'] = df['Project No'].astype(str)
-        if 'Actual' in df.columns:
-            df['Actual'] = (
-                df['Actual'].astype(str)
-                .str.replace('$','', regex=False)
-                .str.replace(',','', regex=False)
-            )
-            df['Actual'] = pd.to_numeric(df['Actual'], errors='coerce')
+        # Actual / Projected / accumulative amounts -> float64 once, here
+        coerce_money_columns(df)
     
     
 
@@ -1380,8 +1696,12 @@ def main():
     global_invoices = df_invoices_sum.copy()
 
     # 8) Now do cost calculations
-    merged_df = calculate_day_cost(merged_df)
-    merged_df = assign_total_hours(merged_df)
+    merged_df = calculate_day_cost(merged_df, rate_periods)
+    yearly_rollup = build_yearly_rollup(merged_df)
+    # Stored in date order so the dashboard resolves date ranges by binary search
+    merged_df = sort_by_date(merged_df, 'local_date')
+    raw_invoices = sort_by_date(raw_invoices, 'Invoice Date')
+    invoice_ledger = build_invoice_ledger(raw_invoices)
 
     # ============ DEBUG BLOCK: find rows with hours > 0 but day_cost=0 ============
     debug_missing_cost = merged_df[(merged_df['hours'] > 0) & (merged_df['day_cost'] == 0)]
@@ -1412,7 +1732,7 @@ def main():
     last_update = pd.to_datetime('today').strftime('%Y-%m-%d')
     last_data_update = most_recent_date.strftime('%Y-%m-%d') if most_recent_date else "Unknown"
     print_orange(">>> Finished main() and returning data now.")
-    return merged_df, df_projects, global_invoices, raw_invoices, last_update, last_data_update
+    return merged_df, df_projects, global_invoices, raw_invoices, last_update, last_data_update, rate_periods, yearly_rollup, invoice_ledger
 
 
 last_update = pd.to_datetime('today').strftime('%Y-%m-%d')
@@ -1423,33 +1743,44 @@ last_update = pd.to_datetime('today').strftime('%Y-%m-%d')
 def precompute_and_save():
     """
     Runs the main data processing pipeline and saves the resulting DataFrames
-    as pickle files for faster future loading.
+    to the columnar store (data_store) for faster future loading.
     """
-    global_merged_df, global_projects_df, global_invoices, global_raw_invoices, last_update, last_data_update = main()
-
-    if global_merged_df is None:
-        print_red("ERROR: Merged DF is None; cannot save pickles.")
-        return
-
-    if not os.path.exists(PICKLE_OUTPUT_DIR):
-        os.makedirs(PICKLE_OUTPUT_DIR)
-
-    # Save pickle files (original functionality)
-    global_merged_df.to_pickle(os.path.join(PICKLE_OUTPUT_DIR, "global_merged_df.pkl"))
-    global_projects_df.to_pickle(os.path.join(PICKLE_OUTPUT_DIR, "global_projects_df.pkl"))
-    global_invoices.to_pickle(os.path.join(PICKLE_OUTPUT_DIR, "global_invoices.pkl"))
-    global_raw_invoices.to_pickle(os.path.join(PICKLE_OUTPUT_DIR, "global_raw_invoices.pkl"))
-    
-    # Add forecast invoicing data
-    forecast_df = import_forecast_invoicing()
-    forecast_df.to_pickle(os.path.join(PICKLE_OUTPUT_DIR, "forecast_invoicing.pkl"))
+    try:
+        global_merged_df, global_projects_df, global_invoices, global_raw_invoices, last_update, last_data_update, global_rate_periods, global_yearly_rollup, global_invoice_ledger = main()
+
+        if global_merged_df is None:
+            print_red("ERROR: Merged DF is None; cannot save pickles.")
+            return
+
+        if not os.path.exists(PICKLE_OUTPUT_DIR):
+            os.makedirs(PICKLE_OUTPUT_DIR)
+
+        # Save typed columnar tables (see data_store.TABLE_SCHEMAS)
+        write_table(global_merged_df, "global_merged_df", PICKLE_OUTPUT_DIR)
+        write_table(global_projects_df, "global_projects_df", PICKLE_OUTPUT_DIR)
+        write_table(global_invoices, "global_invoices", PICKLE_OUTPUT_DIR)
+        write_table(global_raw_invoices, "global_raw_invoices", PICKLE_OUTPUT_DIR)
+        write_table(global_rate_periods, "global_rate_periods", PICKLE_OUTPUT_DIR)
+        write_table(global_yearly_rollup, "global_yearly_rollup", PICKLE_OUTPUT_DIR)
+        write_table(global_invoice_ledger.reset_index(), "global_invoice_ledger", PICKLE_OUTPUT_DIR)
+        write_table(build_client_cube(global_merged_df, global_projects_df), "global_client_cube", PICKLE_OUTPUT_DIR)
+        # Per-project KPIs (costs, invoice totals, every ER ratio), one row per standardized Project No
+        project_kpis = compute_er_table(global_projects_df, global_merged_df, global_raw_invoices, global_invoice_ledger)
+        write_table(project_kpis.reset_index(), "global_project_kpis", PICKLE_OUTPUT_DIR)
+
+        # Add forecast invoicing data
+        forecast_df = import_forecast_invoicing()
+    finally:
+        # Every sheet of this refresh is parsed (or the refresh failed); free the workbook bytes
+        release_workbooks()
+
+    replace_atomically(forecast_df.to_pickle, os.path.join(PICKLE_OUTPUT_DIR, "forecast_invoicing.pkl"))
     print_green("Added forecast invoicing data to pickles")
 
-    with open(os.path.join(PICKLE_OUTPUT_DIR, "last_update.txt"), "w") as f:
-        f.write(last_update)
     # Save the last data update date to a separate file
-    with open(os.path.join(PICKLE_OUTPUT_DIR, "last_data_update.txt"), "w") as f:
-        f.write(last_data_update)
+    write_text(os.path.join(PICKLE_OUTPUT_DIR, "last_data_update.txt"), last_data_update)
+    # last_update.txt is written last: a running dashboard reloads when it changes
+    write_text(os.path.join(PICKLE_OUTPUT_DIR, "last_update.txt"), last_update)
     print_green("Precomputed pickle files saved successfully.")
 
 
@@ -0,0 +1,180 @@
+# data_store.py
+"""
+Columnar on-disk store for the tables written by precompute_and_save.
+
+Tables are saved as uncompressed Feather (Arrow IPC) files with typed
+schemas, so readers can load only the columns they need. Files are read into
+memory rather than memory-mapped: a mapped file stays open for as long as the
+frame lives, and on Windows os.replace() onto an open file fails, which would
+keep precompute from refreshing the store while the dashboard is running.
+If a table has no .feather file yet, or pyarrow cannot store it, the legacy
+.pkl file is used instead.
+"""
+import os
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from utility_funcs import print_green, print_orange, print_red
+
+FEATHER_EXT = ".feather"
+PICKLE_EXT = ".pkl"
+# A reader briefly holding a table open blocks os.replace on Windows
+REPLACE_RETRIES = 10
+REPLACE_RETRY_SECONDS = 0.5
+
+# Column types per table. Repeated labels and the canonical Project No become
+# categoricals, dates become datetime64, hours are read as numbers. Hours and
+# money columns stay float64: float32 hours show up in sums and exports as
+# values like 743.280029.
+TABLE_SCHEMAS = {
+    "global_merged_df": {
+        "category": ['Employee', 'full_name', 'fname', 'lname', 'Personel',
+                     'jobcode_1', 'jobcode_2', 'jobcode_3', 'Service Item', 'Project No'],
+        "numeric": ['hours'],
+        "datetime": ['local_date'],
+    },
+    "global_projects_df": {
+        "category": ['Project No'],
+    },
+    "global_invoices": {
+        "category": ['Project No'],
+    },
+    "global_raw_invoices": {
+        "category": ['Project No'],
+        "datetime": ['Invoice Date'],
+    },
+    "global_invoice_ledger": {
+        "category": ['Project No'],
+        "datetime": ['Invoice Date'],
+    },
+    "global_yearly_rollup": {
+        "category": ['Project No', 'Employee'],
+    },
+    "global_client_cube": {
+        "category": ['Clients'],
+        "numeric": ['hours'],
+    },
+    "global_rate_periods": {
+        "category": ['period_label'],
+        "datetime": ['period_start', 'period_end'],
+    },
+}
+
+
+def apply_schema(df, name):
+    """Cast the columns listed in TABLE_SCHEMAS[name] to their stored types."""
+    schema = TABLE_SCHEMAS.get(name, {})
+    df = df.copy()
+    for col in schema.get("datetime", []):
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    for col in schema.get("numeric", []):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    for col in schema.get("category", []):
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def upcast_float32(df):
+    """
+    Read float32 columns (hours in stores written before they were kept
+    float64) back as float64, rounded to the 2 decimals the entries have.
+    """
+    for col in df.columns[df.dtypes == 'float32']:
+        df[col] = df[col].astype('float64').round(2)
+    return df
+
+
+def table_path(output_dir, name, ext=FEATHER_EXT):
+    return os.path.join(output_dir, name + ext)
+
+
+def replace_atomically(write, path):
+    """
+    Call write(tmp_path), then move the result over path in one step so readers
+    never see a partial file. On Windows the move fails while another process
+    has path open (e.g. the dashboard loading that table), so it is retried
+    for up to REPLACE_RETRIES attempts.
+    """
+    tmp_path = path + ".tmp"
+    write(tmp_path)
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+            print_orange(f"{path} is in use; retrying the replace")
+            time.sleep(REPLACE_RETRY_SECONDS)
+
+
+def write_text(path, text):
+    def write(tmp_path):
+        with open(tmp_path, "w") as f:
+            f.write(text)
+    replace_atomically(write, path)
+
+
+def write_table(df, name, output_dir):
+    """
+    Save df as <name>.feather in output_dir, typed per TABLE_SCHEMAS.
+    Falls back to <name>.pkl if the frame cannot be converted to Arrow
+    (e.g. object columns mixing numbers and text).
+    """
+    df = apply_schema(df, name)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=None)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        print_orange(f"{name}: not storable as Arrow ({e}); saving pickle instead")
+        replace_atomically(df.to_pickle, table_path(output_dir, name, PICKLE_EXT))
+        if os.path.exists(table_path(output_dir, name)):
+            os.remove(table_path(output_dir, name))
+        return table_path(output_dir, name, PICKLE_EXT)
+
+    replace_atomically(
+        lambda tmp_path: feather.write_feather(table, tmp_path, compression='uncompressed'),
+        table_path(output_dir, name)
+    )
+    print_green(f"Saved {name}: {len(df)} rows x {len(df.columns)} cols")
+    return table_path(output_dir, name)
+
+
+def stored_table_path(name, output_dir):
+    """The file load_table reads for `name`: the Feather file, else the legacy pickle, else None."""
+    for ext in (FEATHER_EXT, PICKLE_EXT):
+        path = table_path(output_dir, name, ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_table(name, output_dir, columns=None):
+    """
+    Load a stored table, reading only `columns` when given (columns missing
+    from the file are skipped). The file is read into memory and closed, so
+    nothing keeps it open after the call (see the module docstring).
+    Falls back to the legacy pickle if there is no Feather file.
+    """
+    path = table_path(output_dir, name)
+    if os.path.exists(path):
+        if columns is not None:
+            with pa.OSFile(path) as source:
+                available = set(pa.ipc.open_file(source).schema.names)
+            columns = [col for col in columns if col in available]
+        table = feather.read_table(path, columns=columns, memory_map=False)
+        return upcast_float32(table.to_pandas())
+
+    pickle_path = table_path(output_dir, name, PICKLE_EXT)
+    if os.path.exists(pickle_path):
+        df = pd.read_pickle(pickle_path)
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+        return df
+
+    print_red(f"ERROR: no stored table found for {name} in {output_dir}")
+    raise FileNotFoundError(path)
@@ -18,6 +18,7 @@ import data_processing
 import config
 from print_utils import print_green, print_cyan, print_orange, print_red
 from data_processing import extract_project_no
+from utility_funcs import standardize_project_no, normalize_series
 from config import TABLE_STYLE, TABLE_CELL_STYLE, TABLE_CELL_CONDITIONAL, RIGHT_TABLE_RED_STYLE
 
 # Load the logo image
@@ -62,22 +63,10 @@ except Exception as e:
         last_update = f.read().strip()
     print(f"Data loaded from pickle files. Last update: {last_update}")
 
-# Standardize Project No format for all dataframes
-def standardize_project_no(x):
-    """Convert a project number to float with 2 decimals, or strip string."""
-    try:
-        # Convert to float and format with 2 decimal places
-        float_val = float(x)
-        # Return as string with exactly 2 decimal places always (keep .00)
-        formatted = f"{float_val:.2f}"
-        return formatted
-    except Exception:
-        return str(x).strip()
-
 # Apply standardization to all dataframes
-global_projects_df['Project No'] = global_projects_df['Project No'].apply(standardize_project_no)
-global_invoices['Project No'] = global_invoices['Project No'].apply(standardize_project_no)
-global_raw_invoices['Project No'] = global_raw_invoices['Project No'].apply(standardize_project_no)
+global_projects_df['Project No'] = normalize_series(global_projects_df['Project No'])
+global_invoices['Project No'] = normalize_series(global_invoices['Project No'])
+global_raw_invoices['Project No'] = normalize_series(global_raw_invoices['Project No'])
 
 
 def register_callbacks(app):
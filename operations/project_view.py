@@ -0,0 +1,80 @@
+# project_view.py
+"""
+Shared per-selection data for the callbacks driven by jobcode-dropdown and
+year-dropdown.
+
+Selecting a project fires the service item table and pies, the time and cost
+pies, the project tables, the invoice table, the award date and the
+description. Each of them asks get_project_view() for the same
+(dataset version, project, years) view. The slicing and grouping are done
+once, the first time any of them needs it.
+"""
+from functools import cached_property
+
+from callback_cache import ResultCache
+from utility_funcs import standardize_project_no
+
+# Most recent selections kept in memory
+PROJECT_VIEW_CACHE_SIZE = 32
+
+PROJECT_VIEWS = ResultCache(PROJECT_VIEW_CACHE_SIZE)
+
+
+class ProjectView:
+    """One project (and optional years) of a DataSnapshot; each part is computed on first use."""
+
+    def __init__(self, snapshot, project_no, years=None):
+        self.snapshot = snapshot
+        self.project_no = str(project_no).strip()
+        self.years = years
+
+    @cached_property
+    def record(self):
+        """The project log row (exact Project No, then standardized, then substring match), or None."""
+        projects = self.snapshot.project_rows('global_projects_df', self.project_no)
+        if projects.empty:
+            projects = self.snapshot.project_rows('global_projects_df', self.project_no, standardized=True)
+        if projects.empty:
+            all_projects = self.snapshot.global_projects_df
+            projects = all_projects[all_projects['Project No'].astype(str).str.contains(self.project_no, regex=False)]
+        return None if projects.empty else projects.iloc[0]
+
+    @cached_property
+    def kpis(self):
+        """The project's row of the per-project KPI table, or None."""
+        kpis = self.snapshot.global_project_kpis
+        key = standardize_project_no(self.project_no)
+        return kpis.loc[key] if key in kpis.index else None
+
+    @cached_property
+    def invoices(self):
+        """Invoice ledger rows of the project (latest version of each invoice, in date order)."""
+        return self.snapshot.project_rows('global_invoice_ledger', self.project_no, standardized=True)
+
+    @cached_property
+    def timesheet(self):
+        """Timesheet rows of the project in the selected years."""
+        df = self.snapshot.project_rows('global_merged_df', self.project_no)
+        if self.years:
+            df = df[df['local_date'].dt.year.isin(self.years)]
+        return df
+
+    @cached_property
+    def service_items(self):
+        """hours and day_cost per Service Item."""
+        return self.timesheet.groupby('Service Item', as_index=False, observed=True)[['hours', 'day_cost']].sum()
+
+    @cached_property
+    def employee_totals(self):
+        """hours and day_cost per Employee, from the yearly rollup."""
+        df = self.snapshot.project_rows('global_yearly_rollup', self.project_no)
+        if self.years:
+            df = df[df['year'].isin(self.years)]
+        return df.groupby('Employee', as_index=False, observed=True)[['hours', 'day_cost']].sum()
+
+
+def get_project_view(snapshot, project_no, selected_years=None):
+    """Return the shared ProjectView for (snapshot version, project, years), keeping the most recent ones."""
+    years = tuple(sorted({int(y) for y in selected_years})) if selected_years else None
+    key = (snapshot.version, str(project_no).strip(), years)
+    return PROJECT_VIEWS.get_or_compute(key, lambda: ProjectView(snapshot, project_no, years))
@@ -0,0 +1,72 @@
+# table_formats.py
+"""
+Number formats for the Dash DataTables.
+
+Callbacks send numeric columns as raw numbers and the browser formats them
+with the column's Format (money, hours / ratios, percentages), so numeric
+conditional styles and sorting work on the values themselves. format_cell()
+renders the same text in Python for the PDF exports, which receive the table
+data as stored in the DataTable.
+"""
+import math
+
+import numpy as np
+from dash.dash_table.Format import Format, Group, Scheme, Symbol
+
+
+def money_format(nully=''):
+    """$1,234.56; missing values show `nully`."""
+    return Format(precision=2, scheme=Scheme.fixed, group=Group.yes, symbol=Symbol.yes, symbol_prefix='$', nully=nully)
+
+
+def number_format(precision=2, nully=''):
+    """1234.56 (hours, ER ratios); missing values show `nully`."""
+    return Format(precision=precision, scheme=Scheme.fixed, nully=nully)
+
+
+def percent_format(precision=1, nully=''):
+    """12.3% for values already expressed in percent (0-100); missing values show `nully`."""
+    return Format(precision=precision, scheme=Scheme.fixed, symbol=Symbol.yes, symbol_suffix='%', nully=nully)
+
+
+def numeric_column(name, column_format, column_id=None):
+    """DataTable column definition for a numeric column shown with column_format."""
+    return {'name': name, 'id': column_id or name, 'type': 'numeric', 'format': column_format}
+
+
+def table_records(df, decimals=2):
+    """
+    df as DataTable records: floats (also in mixed columns such as a numeric
+    column with a text totals row) rounded to `decimals` as Python floats, NaN
+    sent as None (shown as the column's nully text).
+    """
+    df = df.astype(object).where(df.notna(), None)
+    return [{key: round(float(value), decimals) if isinstance(value, (float, np.floating)) else value
+             for key, value in row.items()}
+            for row in df.to_dict('records')]
+
+
+def format_cell(value, column):
+    """The text the DataTable shows for `value` in `column` (a column definition, as built or as sent back by Dash)."""
+    column_format = column.get('format')
+    if column.get('type') != 'numeric' or column_format is None:
+        return value
+    spec = column_format.to_plotly_json() if isinstance(column_format, Format) else column_format
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return spec.get('nully', '')
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    specifier = spec.get('specifier', '')
+    prefix, suffix = '', ''
+    if specifier.startswith('$'):
+        prefix, suffix = (spec.get('locale') or {}).get('symbol', ['$', ''])
+        specifier = specifier[1:]
+    sign = '-' if value < 0 else ''
+    return f"{sign}{prefix}{format(abs(value), specifier)}{suffix}"
+
+
+def format_records(records, columns):
+    """records with every numeric column rendered by format_cell (for HTML/PDF exports)."""
+    by_id = {column['id']: column for column in columns or []}
+    return [{key: format_cell(value, by_id[key]) if key in by_id else value for key, value in row.items()}
+            for row in records]
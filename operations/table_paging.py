@@ -0,0 +1,149 @@
+# table_paging.py
+"""
+Server-side paging, sorting and filtering for the large DataTables.
+
+The client projects, invoice and weekly report tables run with
+page_action / sort_action / filter_action='custom'. The callback building a
+table keeps its full rows in a PagedTable (cached per selection with the
+other callback results), and a paging callback answers each page, sort or
+filter request from that frame, so only the visible page is serialized.
+"""
+import math
+import threading
+
+import pandas as pd
+
+from table_formats import table_records
+
+# Rows per page unless the table sets page_size
+TABLE_PAGE_SIZE = 25
+
+# Operators of the DataTable filter syntax, as (query operator, alternative spellings)
+FILTER_OPERATORS = [
+    ('ge', '>='), ('le', '<='), ('lt', '<'), ('gt', '>'), ('ne', '!='), ('eq', '='),
+    ('contains',), ('datestartswith',),
+]
+# Prefixes an operator may carry: 'i' compares text case-insensitively, 's' case-sensitively
+# (unprefixed, contains ignores case and the comparisons respect it)
+CASE_PREFIXES = ('', 'i', 's')
+COMPARISONS = {
+    'ge': lambda s, v: s >= v, 'le': lambda s, v: s <= v, 'lt': lambda s, v: s < v,
+    'gt': lambda s, v: s > v, 'ne': lambda s, v: s != v, 'eq': lambda s, v: s == v,
+}
+
+
+def split_filter_part(filter_part):
+    """
+    '{Total Cost} > 1000' -> ('Total Cost', 'gt', '1000', ''), '{Client} icontains acme' ->
+    ('Client', 'contains', 'acme', 'i'); (None, None, None, None) if it cannot be read.
+    """
+    start, end = filter_part.find('{'), filter_part.find('}')
+    if start < 0 or end < start:
+        return None, None, None, None
+    name = filter_part[start + 1:end]
+    rest = filter_part[end + 1:].strip()
+    for operator in FILTER_OPERATORS:
+        for spelling in operator:
+            for case in CASE_PREFIXES:
+                token = case + spelling
+                if rest.startswith(token) and (spelling[0] in '<>!=' or rest[len(token):len(token) + 1] in ('', ' ')):
+                    value = rest[len(token):].strip()
+                    if not value:
+                        return None, None, None, None
+                    quote = value[0]
+                    if quote == value[-1] and quote in ("'", '"', '`') and len(value) > 1:
+                        value = value[1:-1].replace('\\' + quote, quote)
+                    return name, operator[0], value, case
+    return None, None, None, None
+
+
+def filter_frame(df, filter_query):
+    """
+    Rows of df matching a DataTable filter_query ('{col} op value && ...').
+    Numeric columns compare as numbers, the rest as text; unreadable parts are ignored.
+    """
+    if not filter_query:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for part in filter_query.split(' && '):
+        name, operator, value, case = split_filter_part(part)
+        if name not in df.columns:
+            continue
+        values = df[name]
+        if operator == 'contains':
+            mask &= values.astype(str).str.contains(value, case=case == 's', regex=False) & values.notna()
+        elif operator == 'datestartswith':
+            mask &= values.astype(str).str.startswith(value) & values.notna()
+        elif pd.api.types.is_numeric_dtype(values):
+            number = pd.to_numeric(value, errors='coerce')
+            if pd.notna(number):
+                mask &= COMPARISONS[operator](values, number).fillna(False)
+        else:
+            text = values.astype(str)
+            if case == 'i':
+                text, value = text.str.lower(), value.lower()
+            mask &= COMPARISONS[operator](text, value) & values.notna()
+    return df[mask]
+
+
+def sort_frame(df, sort_by):
+    """df ordered by a DataTable sort_by list (missing values last; text compared as text)."""
+    sort_by = [s for s in sort_by or [] if s.get('column_id') in df.columns]
+    if not sort_by:
+        return df
+
+    def sort_key(values):
+        if pd.api.types.is_numeric_dtype(values):
+            return values
+        return values.where(values.isna(), values.astype(str).str.lower())
+
+    return df.sort_values(
+        [s['column_id'] for s in sort_by],
+        ascending=[s.get('direction') != 'desc' for s in sort_by],
+        na_position='last', kind='stable', key=sort_key)
+
+
+class PagedTable:
+    """
+    Full rows of one DataTable (a DataFrame with raw values), its column
+    definitions and an optional totals row. The totals row is kept out of
+    sorting and shown at the end of the last page; it is left out while a
+    filter is active because it sums the whole table.
+    """
+
+    def __init__(self, frame, columns, totals=None):
+        self.frame = frame.reset_index(drop=True)
+        self.columns = columns
+        self.totals = table_records(pd.DataFrame([totals]))[0] if totals is not None else None
+        self._view_key = None
+        self._view = self.frame
+        self._lock = threading.Lock()
+
+    def view(self, sort_by=None, filter_query=None):
+        """The filtered and sorted rows; the last (sort, filter) view is kept for the following pages."""
+        key = (repr(sort_by or []), filter_query or '')
+        with self._lock:
+            if key == self._view_key:
+                return self._view
+        view = sort_frame(filter_frame(self.frame, filter_query), sort_by)
+        with self._lock:
+            self._view_key, self._view = key, view
+        return view
+
+    def page(self, page_current, page_size, sort_by=None, filter_query=None):
+        """(records of the requested page, page_count); pages past the end show the last page."""
+        page_size = page_size or TABLE_PAGE_SIZE
+        view = self.view(sort_by, filter_query)
+        page_count = max(1, math.ceil(len(view) / page_size))
+        page_current = min(page_current or 0, page_count - 1)
+        records = table_records(view.iloc[page_current * page_size:(page_current + 1) * page_size])
+        if self.totals is not None and not filter_query and page_current == page_count - 1:
+            records.append(self.totals)
+        return records, page_count
+
+    def records(self):
+        """Every row (plus the totals row) in the original order, for the exports."""
+        records = table_records(self.frame)
+        if self.totals is not None:
+            records.append(self.totals)
+        return records
@@ -8,6 +8,7 @@ import pandas as pd
 import numpy as np
 import pickle
 import os
+import functools
 import plotly.graph_objects as go
 import traceback
 import base64
@@ -61,4 +62,36 @@ def standardize_project_no(x):
     try:
         return f"{float(x):.2f}"
     except Exception:
-        return str(x).strip()
\ No newline at end of file
+        return str(x).strip()
+
+# Distinct raw values remembered per normalizer (least recently used values are dropped first)
+NORMALIZE_MEMO_SIZE = 100000
+
+
+@functools.lru_cache(maxsize=None)
+def memoized_normalizer(normalize):
+    """normalize with its results kept in an LRU cache of NORMALIZE_MEMO_SIZE values (one cache per normalizer)."""
+    return functools.lru_cache(maxsize=NORMALIZE_MEMO_SIZE)(normalize)
+
+
+def normalize_series(values, normalize=standardize_project_no, categorical=True):
+    """
+    Vectorized normalize() over a Series (standardize_project_no by default).
+    Each distinct value is normalized once and remembered across calls, so the
+    same few thousand project numbers are not re-parsed for every row.
+    Returns a categorical Series (same index) unless categorical=False.
+    """
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values)
+    memoized = memoized_normalizer(normalize)
+    canonical = np.empty(len(uniques) + 1, dtype=object)
+    canonical[:len(uniques)] = [memoized(raw) for raw in uniques]
+    result = canonical[codes]
+    # Missing values (None / NaN) are not factorized; normalize them as they are
+    missing = np.flatnonzero(codes < 0)
+    result[missing] = [normalize(raw) for raw in values.iloc[missing]]
+    if not categorical:
+        return pd.Series(result, index=values.index, name=values.name)
+    # Sorted categories, so ordering and grouping match the plain strings
+    result_codes, categories = pd.factorize(result, sort=True)
+    return pd.Series(pd.Categorical.from_codes(result_codes, categories), index=values.index, name=values.name)
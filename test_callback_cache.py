@@ -0,0 +1,80 @@
+# test_callback_cache.py
+
+import os
+import tempfile
+from operations.callback_cache import ResultCache, cached_callback, file_stamp
+from operations.data_processing import print_green
+
+def test_result_cache_is_lru():
+    """The least recently used entry is dropped once the cache is full"""
+    cache = ResultCache(max_entries=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: -1)  # hit, "a" becomes the most recent
+    cache.get_or_compute("c", lambda: 3)   # evicts "b"
+
+    assert list(cache.entries) == ["a", "c"], f"Got {list(cache.entries)}"
+    assert cache.get_or_compute("a", lambda: -1) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 3, 2), f"Got {stats}"
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    print_green("ResultCache evicts the least recently used entry")
+
+def test_cached_callback_keys():
+    """Results are keyed on the arguments (lists included) and the dataset version"""
+    cache = ResultCache()
+    version = ["v1"]
+    calls = []
+
+    @cached_callback(cache, lambda: version[0])
+    def project_summary(project_no, years=None):
+        calls.append((project_no, years))
+        return f"{project_no} {years}"
+
+    assert project_summary("1001.00", years=[2024, 2025]) == "1001.00 [2024, 2025]"
+    project_summary("1001.00", years=[2024, 2025])
+    assert len(calls) == 1, "The same arguments should be served from the cache"
+
+    project_summary("1002.00", years=[2024, 2025])
+    version[0] = "v2"
+    project_summary("1001.00", years=[2024, 2025])
+    assert len(calls) == 3, "A new project or dataset version should be recomputed"
+    print_green("cached_callback keys on arguments and version")
+
+def test_cached_callback_does_not_cache_exceptions():
+    """A callback that raises (e.g. PreventUpdate) runs again on the next call"""
+    cache = ResultCache()
+    calls = []
+
+    @cached_callback(cache, lambda: "v1")
+    def failing(value):
+        calls.append(value)
+        raise ValueError(value)
+
+    for _ in range(2):
+        try:
+            failing(1)
+        except ValueError:
+            pass
+    assert len(calls) == 2 and cache.stats()["entries"] == 0
+    print_green("Exceptions are not cached")
+
+def test_file_stamp():
+    """The mtime stamp that keys results on source workbooks"""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "log.xlsx")
+        assert file_stamp(path) is None, "A missing file has no stamp"
+        with open(path, "w") as f:
+            f.write("x")
+        stamp = file_stamp(path)
+        os.utime(path, ns=(stamp + 10**9, stamp + 10**9))
+        assert file_stamp(path) == stamp + 10**9, "The stamp should follow the file's mtime"
+    print_green("file_stamp follows the file")
+
+if __name__ == "__main__":
+    test_result_cache_is_lru()
+    test_cached_callback_keys()
+    test_cached_callback_does_not_cache_exceptions()
+    test_file_stamp()
@@ -0,0 +1,142 @@
+# test_data_access.py
+
+import os
+import tempfile
+import flask
+import numpy as np
+import pandas as pd
+from operations.data_access import DataSnapshot, DataSource, StaleSnapshotError
+from operations.data_store import write_table, write_text, load_table
+from operations.data_processing import sort_by_date, print_green
+
+def make_invoices():
+    rng = np.random.default_rng(7)
+    invoices = pd.DataFrame({
+        "Project No": rng.choice(["1001.00", "1002.00", "1003.00"], 200),
+        "Invoice Date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, 200), unit="D"),
+        "Actual": rng.uniform(0, 1000, 200),
+    })
+    invoices.loc[::17, "Invoice Date"] = pd.NaT
+    return invoices
+
+def expected_rows(invoices, start_date, end_date):
+    dates = invoices["Invoice Date"]
+    return invoices[(dates >= start_date) & (dates <= end_date)]
+
+def check_date_ranges(invoices):
+    with tempfile.TemporaryDirectory() as output_dir:
+        write_table(invoices, "global_raw_invoices", output_dir)
+        snapshot = DataSnapshot(output_dir)
+        stored = snapshot.global_raw_invoices
+
+        for start_date, end_date in [("2024-03-01", "2024-03-31"), ("2024-02-29", "2024-02-29"),
+                                     ("2023-01-01", "2023-12-31"), ("2024-06-15", "2025-06-15")]:
+            result = snapshot.date_range("global_raw_invoices", "Invoice Date", start_date, end_date)
+            expected = expected_rows(stored, pd.Timestamp(start_date), pd.Timestamp(end_date))
+            key = ["Invoice Date", "Project No", "Actual"]
+            pd.testing.assert_frame_equal(
+                result.sort_values(key).reset_index(drop=True), expected.sort_values(key).reset_index(drop=True),
+                check_categorical=False)
+            assert result["Invoice Date"].is_monotonic_increasing, "The range should come back in date order"
+
+        assert snapshot.date_range("global_raw_invoices", "Invoice Date", None, "2024-03-31") is stored, \
+            "A missing bound returns the whole table"
+
+def test_date_range_on_sorted_store():
+    """Stores written in date order are sliced by binary search (inclusive bounds, missing dates left out)"""
+    check_date_ranges(sort_by_date(make_invoices(), "Invoice Date"))
+    print_green("date_range matches the boolean filter on a sorted store")
+
+def test_date_range_on_unsorted_store():
+    """Older stores that are not in date order give the same rows"""
+    check_date_ranges(make_invoices())
+    print_green("date_range matches the boolean filter on an unsorted store")
+
+def write_refresh(output_dir, label, version_text=None):
+    """Rewrite the projects and invoices tables (and last_update.txt unless version_text is None)"""
+    write_table(pd.DataFrame({"Project No": [label], "Clients": [label]}), "global_projects_df", output_dir)
+    write_table(pd.DataFrame({"Project No": [label], "Actual": [1.0]}), "global_invoices", output_dir)
+    if version_text is not None:
+        write_text(os.path.join(output_dir, "last_update.txt"), version_text)
+
+def bump_mtime(output_dir, name):
+    """Make a rewritten table visibly newer (coarse filesystem timestamps)"""
+    path = os.path.join(output_dir, name + ".feather")
+    stamp = os.stat(path).st_mtime_ns + 10**9
+    os.utime(path, ns=(stamp, stamp))
+
+def test_snapshot_returns_same_data_after_rewrite():
+    """A table rewritten between two get() calls on the same snapshot comes back unchanged"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        write_refresh(output_dir, "1001.00", "2025-06-01 08:00")
+        snapshot = DataSnapshot(output_dir)
+        first = snapshot.get("global_projects_df")
+
+        write_refresh(output_dir, "2002.00", "2025-06-02 08:00")
+        second = snapshot.get("global_projects_df")
+
+        assert second is first and second["Project No"].tolist() == ["1001.00"]
+        assert snapshot.last_update == "2025-06-01 08:00"
+    print_green("Snapshot tables do not change under a refresh")
+
+def test_snapshot_never_mixes_refreshes():
+    """A table rewritten by a refresh in progress is not loaded into the older snapshot"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        write_refresh(output_dir, "1001.00", "2025-06-01 08:00")
+        source = DataSource(output_dir)
+        snapshot = source.current
+        snapshot.get("global_projects_df")
+
+        # The refresh has rewritten the tables but not last_update.txt yet
+        write_refresh(output_dir, "2002.00")
+        bump_mtime(output_dir, "global_invoices")
+        try:
+            snapshot.get("global_invoices")
+            assert False, "The rewritten table should not be loaded into the old snapshot"
+        except StaleSnapshotError:
+            pass
+        assert snapshot.stale and source.current is snapshot, "No new dataset to swap in yet"
+
+        # The refresh completes: the next access serves the new dataset
+        write_text(os.path.join(output_dir, "last_update.txt"), "2025-06-02 08:00")
+        refreshed = source.current
+        assert refreshed is not snapshot and refreshed.last_update == "2025-06-02 08:00"
+        assert refreshed.get("global_projects_df")["Project No"].tolist() == ["2002.00"]
+        assert refreshed.get("global_invoices")["Project No"].tolist() == ["2002.00"]
+    print_green("Snapshots never mix two refreshes")
+
+def test_request_keeps_its_snapshot():
+    """Callbacks of one request see one snapshot even if a refresh is swapped in meanwhile"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        write_refresh(output_dir, "1001.00", "2025-06-01 08:00")
+        source = DataSource(output_dir)
+        with flask.Flask(__name__).test_request_context():
+            before = source.global_projects_df
+            write_refresh(output_dir, "2002.00", "2025-06-02 08:00")
+            assert source.reload_if_changed()
+            after = source.global_projects_df
+            assert after is before and after["Project No"].tolist() == ["1001.00"]
+        assert source.global_projects_df["Project No"].tolist() == ["2002.00"]
+    print_green("Requests stay on their snapshot")
+
+def test_hours_stay_float64():
+    """Stored hours read back exactly, also from older stores that kept them as float32"""
+    merged = pd.DataFrame({"Employee": ["A", "B", "A"], "hours": [743.28, 7.75, "0.1"]})
+    with tempfile.TemporaryDirectory() as output_dir:
+        write_table(merged, "global_merged_df", output_dir)
+        hours = load_table("global_merged_df", output_dir)["hours"]
+        assert hours.dtype == "float64" and hours.tolist() == [743.28, 7.75, 0.1], f"Got {hours.tolist()}"
+
+        legacy = pd.DataFrame({"hours": np.array([743.28, 7.75], dtype="float32")})
+        legacy.to_feather(os.path.join(output_dir, "global_client_cube.feather"))
+        hours = load_table("global_client_cube", output_dir)["hours"]
+        assert hours.dtype == "float64" and hours.tolist() == [743.28, 7.75], f"Got {hours.tolist()}"
+    print_green("Hours are stored and read as float64")
+
+if __name__ == "__main__":
+    test_date_range_on_sorted_store()
+    test_date_range_on_unsorted_store()
+    test_snapshot_returns_same_data_after_rewrite()
+    test_snapshot_never_mixes_refreshes()
+    test_request_keeps_its_snapshot()
+    test_hours_stay_float64()
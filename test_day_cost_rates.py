@@ -0,0 +1,88 @@
+# test_day_cost_rates.py
+
+import numpy as np
+import pandas as pd
+from operations.data_processing import build_rate_periods, calculate_day_cost, print_green
+
+RATES = pd.DataFrame({
+    "ID#": [1, 2],
+    "Employee": ["E1", "E2"],
+    "2022Whole_Year": [10.0, 20.0],
+    "2022JUL (1-15)": [11.0, 21.0],
+    "2022JUL (15-31)": [12.0, 22.0],
+    "2023Whole_Year": [13.0, np.nan],  # E2 has no 2023 rate
+    "2024JAN": [14.0, 24.0],
+    "2024JUL (1-15)": [15.0, 25.0],
+    "2024JUL (15-31)": [16.0, 26.0],
+})
+
+DATES = ["2019-05-01", "2022-07-15", "2022-07-16", "2022-08-01", "2023-03-03",
+         "2024-01-31", "2024-02-10", "2024-07-15", "2024-07-16", None]
+
+def old_rate_column(dt):
+    """Rates column the row-wise calculate_day_cost read for a date (before the rate-period table)"""
+    if dt.year < 2022:
+        return "2022Whole_Year"
+    if dt.year == 2023:
+        return "2023Whole_Year"
+    if dt.month == 7:
+        return f"{dt.year}JUL (1-15)" if dt.day <= 15 else f"{dt.year}JUL (15-31)"
+    if dt.year == 2022:
+        return "2022Whole_Year"
+    return f"{dt.year}{dt.strftime('%b').upper()}"
+
+def old_day_cost(row):
+    if pd.isnull(row["local_date"]):
+        return 0
+    return row.get(old_rate_column(row["local_date"]), 0) * row["hours"]
+
+def make_timesheet():
+    rows = [{"ID#": employee, "local_date": date, "hours": hours}
+            for employee in (1, 2, 3) for date in DATES for hours in (8.0, np.nan)]
+    timesheet = pd.DataFrame(rows)
+    timesheet["local_date"] = pd.to_datetime(timesheet["local_date"])
+    timesheet["Employee"] = "E" + timesheet["ID#"].astype(str)
+    timesheet["full_name"] = timesheet["Employee"]
+    timesheet["jobcode_2"] = "1001.00 Test"
+    return timesheet.merge(RATES.drop(columns=["Employee"]), on="ID#", how="left")
+
+def test_day_cost_matches_row_wise_lookup():
+    """
+    The merge_asof lookup over the rate periods gives the same day_cost as the old
+    row-wise apply: dates before 2022, split July, NaN rates, missing periods, no date,
+    and an ID# (3) that is not in the rates sheet
+    """
+    merged = make_timesheet()
+    expected = merged.apply(old_day_cost, axis=1).astype(float)
+    result = calculate_day_cost(merged.copy(), build_rate_periods(RATES))["day_cost"]
+
+    assert np.allclose(result, expected, equal_nan=True), \
+        f"day_cost differs:\n{pd.DataFrame({'expected': expected, 'result': result})}"
+    assert (result.isna() == expected.isna()).all(), "NaN day_cost rows differ"
+    print_green("calculate_day_cost matches the row-wise lookup")
+
+def test_day_cost_periods():
+    """Spot checks of the rate each period uses (8 hours)"""
+    merged = make_timesheet()
+    result = calculate_day_cost(merged.copy(), build_rate_periods(RATES))
+    e1 = result[(result["ID#"] == 1) & result["hours"].notna()]
+    costs = e1.set_index(e1["local_date"].dt.strftime("%Y-%m-%d").fillna("none"))["day_cost"]
+
+    assert costs["2019-05-01"] == 80.0, "Dates before 2022 use 2022Whole_Year"
+    assert costs["2022-07-15"] == 88.0 and costs["2022-07-16"] == 96.0, "July 2022 is split on the 15th"
+    assert costs["2022-08-01"] == 80.0, "2022 outside July uses 2022Whole_Year"
+    assert costs["2024-02-10"] == 0.0, "A month without a rates column costs 0"
+    assert costs["none"] == 0.0, "Rows without a date cost 0"
+
+    e2 = result[(result["ID#"] == 2) & result["hours"].notna()]
+    assert e2.loc[e2["local_date"] == "2023-03-03", "day_cost"].isna().all(), "A missing rate gives NaN, as before"
+
+    e3 = result[(result["ID#"] == 3) & result["hours"].notna()]
+    e3_costs = e3.set_index(e3["local_date"].dt.strftime("%Y-%m-%d").fillna("none"))["day_cost"]
+    assert e3_costs.drop(["2024-02-10", "none"]).isna().all(), "An ID# without rates gives NaN, not 0"
+    assert e3_costs["2024-02-10"] == 0.0 and e3_costs["none"] == 0.0
+    print_green("Rate periods resolve as expected")
+
+if __name__ == "__main__":
+    test_day_cost_matches_row_wise_lookup()
+    test_day_cost_periods()
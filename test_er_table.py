@@ -0,0 +1,86 @@
+# test_er_table.py
+
+import numpy as np
+import pandas as pd
+from operations.data_processing import compute_er_table, print_green
+
+PROJECTS = pd.DataFrame({
+    "Project No": ["1001", "1002.00", "1003.00", "1004.00", "1005.00", "1007.00"],
+    "Contracted Amount": ["$1,000.00", 500.0, 800.0, 1000.0, 1000.0, 0.0],
+    "Invoiced %": ["30%", "100%", "0%", "100%", "20%", "0.0 %"],
+})
+
+# staff_type 1 = DECON LLC (US), 2 = DECON Colombia
+COSTS = pd.DataFrame({
+    "jobcode_2": ["1001.00 A", "1001.00 A", "1003.00 C", "1004.00 D", "1005.00 E", "1007.00 G"],
+    "jobcode_3": "",
+    "staff_type": [1, 2, 1, 2, 2, 1],
+    "day_cost": [100.0, 50.0, 200.0, 100.0, 100.0, 40.0],
+    "hours": [8.0, 8.0, 8.0, 8.0, 8.0, 4.0],
+})
+
+INVOICES = pd.DataFrame({
+    "Project No": ["1001.00", "1002", "1004.00", "1005.00", "1006.00"],
+    "Invoice No": ["A-1", "B-1", "D-1", "E-1", "F-1"],
+    "Invoice Date": pd.to_datetime(["2025-01-10"] * 5),
+    "Actual": ["$300.00", 500.0, 1000.0, 200.0, 50.0],
+})
+
+def er_table():
+    costs = COSTS.copy()
+    costs["Project No"] = costs["jobcode_2"].str[:7]
+    return compute_er_table(PROJECTS, costs, INVOICES)
+
+def test_er_ratios():
+    """ER Contract / Invoiced use the total cost; the DECON LLC ratios leave Colombian cost out of the denominator"""
+    table = er_table()
+    row = table.loc["1001.00"]
+    assert np.isclose(row["ER Contract"], 1000 / 150), f"Got {row['ER Contract']}"
+    assert np.isclose(row["ER Invoiced"], 300 / 150), f"Got {row['ER Invoiced']}"
+    assert np.isclose(row["ER DECON LLC"], (1000 - 50) / 100), f"Got {row['ER DECON LLC']}"
+    assert np.isclose(row["DECON LLC Invoiced"], (300 - 50) / 100), f"Got {row['DECON LLC Invoiced']}"
+    assert row["ER DECON LLC Display"] == "9.50" and row["DECON LLC Invoiced Display"] == "2.50"
+    assert row["Invoiced %"] == "30.0%" and np.isclose(row["Remaining to Invoice"], 700.0)
+    print_green("ER ratios computed")
+
+def test_er_not_available_rules():
+    """Ratios that cannot be computed are NaN and show N/A or 0.00"""
+    table = er_table()
+
+    # No worked hours: no ratio, N/A
+    no_hours = table.loc["1002.00"]
+    assert np.isnan(no_hours["ER Contract"]) and np.isnan(no_hours["ER Invoiced"])
+    assert no_hours["ER DECON LLC Display"] == "N/A" and no_hours["DECON LLC Invoiced Display"] == "N/A"
+
+    # Only Colombian cost and fully invoiced: no DECON LLC ratio, N/A (never 0.00)
+    fully_invoiced = table.loc["1004.00"]
+    assert np.isnan(fully_invoiced["ER DECON LLC"])
+    assert fully_invoiced["ER DECON LLC Display"] == "N/A" and fully_invoiced["DECON LLC Invoiced Display"] == "N/A"
+
+    # Only Colombian cost, partly invoiced: 0.00
+    partly_invoiced = table.loc["1005.00"]
+    assert np.isnan(partly_invoiced["DECON LLC Invoiced"])
+    assert partly_invoiced["ER DECON LLC Display"] == "0.00"
+
+    # No contract: ER Contract is not computed
+    assert np.isnan(table.at["1007.00", "ER Contract"])
+
+    # Invoices without a project log entry: Invoiced % N/A (-1)
+    invoice_only = table.loc["1006.00"]
+    assert invoice_only["Invoiced %"] == "N/A" and invoice_only["Invoiced %_num"] == -1
+    print_green("N/A rules hold")
+
+def test_er_zero_invoiced_rule():
+    """Projects marked 0% invoiced in the project log get 0 for both DECON LLC ratios"""
+    table = er_table()
+    for project_no in ["1003.00", "1007.00"]:
+        row = table.loc[project_no]
+        assert row["ER DECON LLC"] == 0 and row["DECON LLC Invoiced"] == 0, f"{project_no}: {row.to_dict()}"
+        assert row["ER DECON LLC Display"] == "0.00" and row["DECON LLC Invoiced Display"] == "0.00"
+    assert table.at["1003.00", "Invoiced %"] == "0.0%"
+    print_green("Zero invoiced rule holds")
+
+if __name__ == "__main__":
+    test_er_ratios()
+    test_er_not_available_rules()
+    test_er_zero_invoiced_rule()
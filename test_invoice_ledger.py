@@ -0,0 +1,43 @@
+# test_invoice_ledger.py
+
+import pandas as pd
+from operations.data_processing import build_invoice_ledger, ledger_totals, print_green
+
+RAW_INVOICES = pd.DataFrame({
+    "Project No": ["1001", "1001.00", "1001.0", "1002.00", "1002.00", "1003.00"],
+    "Invoice No": ["INV-1", "INV-1", "INV-2", "INV-1", "INV-3", None],
+    "Invoice Date": pd.to_datetime(["2025-01-10", "2025-02-10", "2025-01-20", "2025-03-01", "2025-01-05", "2025-01-01"]),
+    # INV-1 of 1001.00 was re-issued on 02-10 with a corrected amount
+    "Actual": ["$1,000.00", "1,200.00", 300.0, None, 400.0, 50.0],
+})
+
+def test_ledger_keeps_latest_version_of_each_invoice():
+    """Re-issued invoices replace their earlier versions instead of adding to them"""
+    ledger = build_invoice_ledger(RAW_INVOICES)
+    project = ledger.loc["1001.00"]
+
+    assert len(project) == 2, f"Expected INV-1 and INV-2 once each, got {len(project)} rows"
+    assert sorted(project["Actual"].tolist()) == [300.0, 1200.0], f"Got {project['Actual'].tolist()}"
+    assert project["Cumulative Invoiced"].tolist() == [300.0, 1500.0], "Running total should follow the invoice dates"
+    print_green("Ledger deduplicated")
+
+def test_ledger_totals():
+    """Totals per standardized Project No count each invoice once; missing amounts count as 0"""
+    totals = ledger_totals(build_invoice_ledger(RAW_INVOICES))
+
+    assert totals["1001.00"] == 1500.0, f"Got {totals['1001.00']}"
+    assert totals["1002.00"] == 400.0, f"Got {totals['1002.00']}"
+    # Rows without an Invoice No cannot be matched to an invoice and are left out, as before
+    assert "1003.00" not in totals.index
+    print_green("Ledger totals match")
+
+def test_ledger_totals_from_stored_table():
+    """The ledger read back from the store (index reset to columns) gives the same totals"""
+    ledger = build_invoice_ledger(RAW_INVOICES)
+    pd.testing.assert_series_equal(ledger_totals(ledger.reset_index()), ledger_totals(ledger))
+    print_green("Stored ledger totals match")
+
+if __name__ == "__main__":
+    test_ledger_keeps_latest_version_of_each_invoice()
+    test_ledger_totals()
+    test_ledger_totals_from_stored_table()
@@ -0,0 +1,42 @@
+# test_normalize_series.py
+
+import numpy as np
+import pandas as pd
+from operations.utility_funcs import normalize_series, memoized_normalizer, standardize_project_no, NORMALIZE_MEMO_SIZE, print_green
+
+VALUES = pd.Series(["1237", "1237.0", " 1002.5", "abc ", None, np.nan, "1237", "0042"], index=list("abcdefgh"), name="Project No")
+
+def test_normalize_series_matches_row_wise():
+    """Same values as mapping standardize_project_no over every row, index and name kept"""
+    expected = VALUES.map(standardize_project_no)
+    result = normalize_series(VALUES, categorical=False)
+
+    assert result.tolist() == expected.tolist(), f"{result.tolist()} != {expected.tolist()}"
+    assert result.index.equals(VALUES.index) and result.name == "Project No"
+    print_green("normalize_series matches standardize_project_no")
+
+def test_normalize_series_categorical():
+    """The categorical result has sorted categories, so grouping and ordering match the strings"""
+    result = normalize_series(VALUES)
+
+    assert isinstance(result.dtype, pd.CategoricalDtype)
+    assert list(result.cat.categories) == sorted(set(VALUES.map(standardize_project_no)))
+    assert result.astype(str).tolist() == normalize_series(VALUES, categorical=False).tolist()
+    print_green("Categorical Project No is consistent")
+
+def test_normalize_memo_is_bounded():
+    """Each normalizer gets one LRU memo limited to NORMALIZE_MEMO_SIZE values"""
+    memoized = memoized_normalizer(standardize_project_no)
+    assert memoized is memoized_normalizer(standardize_project_no), "The memo should be shared between calls"
+    assert memoized.cache_info().maxsize == NORMALIZE_MEMO_SIZE
+
+    normalize_series(VALUES)
+    hits = memoized.cache_info().hits
+    normalize_series(VALUES)
+    assert memoized.cache_info().hits > hits, "Repeated values should come from the memo"
+    print_green("Normalization memo is bounded and reused")
+
+if __name__ == "__main__":
+    test_normalize_series_matches_row_wise()
+    test_normalize_series_categorical()
+    test_normalize_memo_is_bounded()
@@ -0,0 +1,51 @@
+# test_project_number_mapping.py
+
+import pandas as pd
+from operations.data_processing import derive_project_no, compute_er_table, print_green
+
+def make_costs():
+    """Timesheet rows: one regular jobcode and one 1928 jobcode booked to project 1300.01 through jobcode_3"""
+    costs = pd.DataFrame({
+        "jobcode_2": ["1237.00 Bridge Inspection", "1928.00 Field Support", "1237.00 Bridge Inspection"],
+        "jobcode_3": ["Design", "1300.01 Pier Survey", "Field"],
+        "staff_type": [1, 1, 2],
+        "day_cost": [100.0, 50.0, 25.0],
+        "hours": [8.0, 4.0, 2.0],
+    })
+    costs["Project No"] = derive_project_no(costs)
+    return costs
+
+def test_derive_project_no():
+    """
+    Project No is the first 7 characters of jobcode_2, or of jobcode_3 when jobcode_2 starts with 1928
+    """
+    costs = make_costs()
+    assert costs["Project No"].tolist() == ["1237.00", "1300.01", "1237.00"], \
+        f"Unexpected Project No values: {costs['Project No'].tolist()}"
+    print_green("derive_project_no maps 1928 jobcodes to jobcode_3")
+
+def test_report_total_cost_uses_canonical_project_no():
+    """
+    The monthly report reads Total Cost from the KPI table, which sums day_cost by the
+    canonical Project No: 1928 rows count toward the jobcode_3 project, not toward 1928.00
+    (the report used to match extract_project_number(jobcode_2) instead).
+    """
+    projects = pd.DataFrame({
+        "Project No": ["1237.00", "1300.01", "1928.00"],
+        "Contracted Amount": [1000.0, 500.0, 0.0],
+    })
+    table = compute_er_table(projects, make_costs())
+
+    assert table.at["1237.00", "Total Cost"] == 125.0, f"Got {table.at['1237.00', 'Total Cost']}"
+    assert table.at["1300.01", "Total Cost"] == 50.0, f"Got {table.at['1300.01', 'Total Cost']}"
+    assert table.at["1928.00", "Total Cost"] == 0.0, f"Got {table.at['1928.00', 'Total Cost']}"
+    assert table.at["1300.01", "ER Contract"] == 10.0, f"Got {table.at['1300.01', 'ER Contract']}"
+
+    # The DECON LLC type 1 / type 2 costs still follow the jobcode_2 prefix
+    assert table.at["1928.00", "Type1 Cost"] == 50.0, f"Got {table.at['1928.00', 'Type1 Cost']}"
+    assert table.at["1237.00", "Type2 Cost"] == 25.0, f"Got {table.at['1237.00', 'Type2 Cost']}"
+    print_green("Total Cost follows the canonical Project No")
+
+if __name__ == "__main__":
+    test_derive_project_no()
+    test_report_total_cost_uses_canonical_project_no()
@@ -0,0 +1,74 @@
+# test_table_paging.py
+
+import pandas as pd
+from operations.table_paging import split_filter_part, filter_frame, PagedTable
+from operations.data_processing import print_green
+
+FRAME = pd.DataFrame({
+    "Project No": ["1001.00", "1002.00", "2400.01", "2400.02", "3000.00"],
+    "Clients": ["Acme", "ACME Corp", "Beta", "beta", None],
+    "Total Cost": [100.0, 2500.5, None, 240.0, 1000.0],
+})
+
+def test_split_filter_part():
+    """The DataTable filter syntax, with word and symbol operators, case prefixes and quoted values"""
+    cases = {
+        "{Total Cost} > 1000": ("Total Cost", "gt", "1000", ""),
+        "{Total Cost} ge 240": ("Total Cost", "ge", "240", ""),
+        "{Clients} != Beta": ("Clients", "ne", "Beta", ""),
+        "{Clients} contains acme": ("Clients", "contains", "acme", ""),
+        "{Clients} icontains acme": ("Clients", "contains", "acme", "i"),
+        "{Clients} scontains ACME": ("Clients", "contains", "ACME", "s"),
+        "{Clients} ieq beta": ("Clients", "eq", "beta", "i"),
+        "{Clients} s= Beta": ("Clients", "eq", "Beta", "s"),
+        "{Clients} i!= beta": ("Clients", "ne", "beta", "i"),
+        '{Clients} = "ACME Corp"': ("Clients", "eq", "ACME Corp", ""),
+        "{Project No} datestartswith 2400": ("Project No", "datestartswith", "2400", ""),
+        "{Clients} is Beta": (None, None, None, None),
+        "{Clients} eq": (None, None, None, None),
+        "Clients = Beta": (None, None, None, None),
+    }
+    for filter_part, expected in cases.items():
+        assert split_filter_part(filter_part) == expected, f"{filter_part!r}: {split_filter_part(filter_part)}"
+    print_green("Filter parts read correctly")
+
+def test_filter_frame():
+    """Numeric columns compare as numbers, text as text; unreadable parts are ignored"""
+    def projects(filter_query):
+        return filter_frame(FRAME, filter_query)["Project No"].tolist()
+
+    assert projects("{Total Cost} > 240") == ["1002.00", "3000.00"], "Numbers compare as numbers"
+    assert projects("{Total Cost} >= 240 && {Total Cost} < 2000") == ["2400.02", "3000.00"]
+    assert projects("{Project No} contains 2400") == ["2400.01", "2400.02"], "Numbers in contains are matched as text"
+    assert projects("{Clients} contains acme") == ["1001.00", "1002.00"], "contains ignores case"
+    assert projects("{Clients} scontains ACME") == ["1002.00"]
+    assert projects("{Clients} eq beta") == ["2400.02"], "eq respects case"
+    assert projects("{Clients} ieq beta") == ["2400.01", "2400.02"]
+    assert projects("{Clients} ne beta") == ["1001.00", "1002.00", "2400.01"], "Missing values never match"
+    assert projects("{Total Cost} > abc") == FRAME["Project No"].tolist(), "A non-numeric value is ignored"
+    assert projects("{Missing} = 1 && {Clients} = Beta") == ["2400.01"], "Unknown columns are ignored"
+    print_green("Filters applied correctly")
+
+def test_paged_table():
+    """Pages clamp to the last page, which carries the totals row unless a filter is active"""
+    table = PagedTable(FRAME, [], totals={"Project No": "TOTAL", "Total Cost": 3840.5})
+
+    records, page_count = table.page(0, 2)
+    assert page_count == 3 and [r["Project No"] for r in records] == ["1001.00", "1002.00"]
+
+    records, page_count = table.page(9, 2)
+    assert [r["Project No"] for r in records] == ["3000.00", "TOTAL"], "Pages past the end show the last page"
+
+    records, _ = table.page(0, 10, [{"column_id": "Total Cost", "direction": "desc"}])
+    assert [r["Project No"] for r in records] == ["1002.00", "3000.00", "2400.02", "1001.00", "2400.01", "TOTAL"]
+
+    records, page_count = table.page(0, 10, None, "{Total Cost} > 500")
+    assert page_count == 1 and [r["Project No"] for r in records] == ["1002.00", "3000.00"]
+
+    assert len(table.records()) == len(FRAME) + 1 and table.records()[2]["Total Cost"] is None
+    print_green("Paging works")
+
+if __name__ == "__main__":
+    test_split_filter_part()
+    test_filter_frame()
+    test_paged_table()
@@ -0,0 +1,83 @@
+# test_timesheet_exports.py
+
+import os
+import tempfile
+from datetime import datetime
+import pandas as pd
+from operations.data_processing import reconcile_timesheet_exports, load_timesheet_folder, timesheet_entry_keys, print_green
+
+# One entry per user and working day of June 2025
+ENTRIES = pd.DataFrame({
+    "username": ["ana", "luis"] * 12,
+    "local_date": [f"2025-06-{day:02d}" for day in range(2, 14) for _ in range(2)],
+    "jobcode_2": ["1001.00 Test"] * 24,
+    "local_start_time": "08:00",
+    "local_end_time": "16:00",
+    "hours": 8.0,
+}).set_index("username")
+
+# Cumulative exports, each starting on 06-01 and containing every entry up to its end date
+EXPORT_ENDS = ["2025-06-04", "2025-06-11", "2025-06-18"]
+
+def export_rows(end_date):
+    return ENTRIES[ENTRIES["local_date"] <= end_date].copy()
+
+def test_overlapping_exports_are_not_double_counted():
+    """Every entry is kept once, from the newest export that covers its date"""
+    exports = [(export_rows(end), datetime(2025, 6, 1), datetime.strptime(end, "%Y-%m-%d")) for end in EXPORT_ENDS]
+    # The newest export carries a corrected entry for a day the older exports also have
+    exports[2][0].iloc[0, exports[2][0].columns.get_loc("hours")] = 6.0
+
+    reconciled, dropped = reconcile_timesheet_exports(exports)
+    merged = pd.concat(reconciled)
+
+    assert dropped == sum(len(df) for df, _, _ in exports[:2]), f"Unexpected dropped count {dropped}"
+    assert len(merged) == len(ENTRIES), f"Expected {len(ENTRIES)} rows, got {len(merged)}"
+    assert merged["hours"].sum() == ENTRIES["hours"].sum() - 2.0, f"Hours double counted: {merged['hours'].sum()}"
+    assert len(reconciled[0]) == 0 and len(reconciled[1]) == 0, "Older exports should be fully superseded"
+    print_green("Overlapping exports reconciled without double counting")
+
+def test_disjoint_exports_are_kept():
+    """Exports covering different days are all kept; an entry repeated across them is kept once"""
+    first = ENTRIES[ENTRIES["local_date"] <= "2025-06-06"]
+    second = ENTRIES[ENTRIES["local_date"] > "2025-06-06"]
+    repeated = pd.concat([second, first.iloc[:1]])
+    exports = [(first, datetime(2025, 6, 1), datetime(2025, 6, 6)), (repeated, datetime(2025, 6, 7), datetime(2025, 6, 13))]
+
+    reconciled, dropped = reconcile_timesheet_exports(exports)
+
+    assert dropped == 1, f"Only the repeated entry should be dropped, got {dropped}"
+    assert len(pd.concat(reconciled)) == len(ENTRIES), "Disjoint exports lost rows"
+    print_green("Disjoint exports kept")
+
+def test_timesheet_folder_reconciles_exports():
+    """load_timesheet_folder gives the same reconciled rows from the CSVs and from the per-file cache"""
+    with tempfile.TemporaryDirectory() as folder:
+        for end in EXPORT_ENDS:
+            export_rows(end).to_csv(os.path.join(folder, f"timesheet_report_2025-06-01_thru_{end}.csv"))
+        cache_dir = os.path.join(folder, "cache")
+
+        parsed, most_recent = load_timesheet_folder(folder, cache_dir)
+        cached, _ = load_timesheet_folder(folder, cache_dir)
+
+    assert most_recent == datetime(2025, 6, 18), f"Unexpected most recent date {most_recent}"
+    assert len(parsed) == len(ENTRIES), f"Expected {len(ENTRIES)} rows, got {len(parsed)}"
+    assert parsed["hours"].sum() == ENTRIES["hours"].sum(), "June hours counted more than once"
+    assert parsed.equals(cached), "Cached exports reconciled differently"
+    print_green("Timesheet folder reconciled")
+
+def test_missing_key_column_is_an_error():
+    """An export without one of the entry key columns is rejected rather than hashed with NaN"""
+    assert len(timesheet_entry_keys(ENTRIES)) == len(ENTRIES), "username is read from the index"
+    try:
+        timesheet_entry_keys(ENTRIES.drop(columns=["local_start_time"]))
+        assert False, "A missing key column should raise"
+    except ValueError as e:
+        assert "local_start_time" in str(e), str(e)
+    print_green("Missing key columns are reported")
+
+if __name__ == "__main__":
+    test_overlapping_exports_are_not_double_counted()
+    test_disjoint_exports_are_kept()
+    test_timesheet_folder_reconciles_exports()
+    test_missing_key_column_is_an_error()